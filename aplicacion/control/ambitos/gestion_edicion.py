@@ -1,7 +1,6 @@
-import csv
+import contextlib
 from aplicacion.interfaz import comunes
-from aplicacion.documentos import diagrama
-from pathlib import Path
+from aplicacion.documentos import tablas
 
 
 class GestionEdicion:
@@ -10,38 +9,56 @@ class GestionEdicion:
 
     :param gestor: Gestiona la comunicación entre los módulos y la interacción con las tablas.
     :type gestor: Gestor 
-    :param proposiciones: Ruta a la tabla de proposiciones.
-    :type proposiciones: Path
-    :param nodos: Ruta a la tabla de nodos.
-    :type nodos: Path
-    :param vertices: Ruta a la tabla de vértices.
-    :type vertices: Path
-    :param prop_nodos: Ruta a la tabla con las propiedades de los nodos.
-    :type prop_nodos: Path
-    :param prop_vertices: Ruta a la tabla con las propiedades de los vértices.
-    :type prop_vertices: Path
+    :param tablas: El contenido en memoria de las tablas, compartido por los ámbitos de gestión.
+    :type tablas: Tablas
     """
 
-    def __init__(
-        self,
-        gestor,
-        proposiciones: Path,
-        nodos: Path,
-        vertices: Path,
-        prop_nodos: Path,
-        prop_vertices: Path
-    ):
+    def __init__(self, gestor, tablas: tablas.Tablas):
         self._edicion = None
         self._gestor = gestor
-        self._csv_proposiciones: Path = proposiciones
-        self._csv_nodos: Path = nodos
-        self._csv_vertices: Path = vertices
-        self._csv_prop_nodos: Path = prop_nodos
-        self._csv_prop_vertices: Path = prop_vertices
+        self._tablas = tablas
+        # Datos derivados de las tablas, junto con la versión de las tablas
+        # a partir de la cual se calcularon
+        self._cache_etiquetas: dict[str, tuple[int, dict[str, str]]] = {}
+        self._cache_relaciones: tuple[
+            tuple[int, ...], dict[int, list[tuple[str, str]]]
+        ] | None = None
+
+    def aplicar_lote(
+        self, arg_operaciones: tuple[list[tuple[str, tuple]]]
+    ) -> None:
+        """
+        Aplica un conjunto de ediciones como una sola operación: mientras
+        se aplican, ninguna otra tarea accede a las tablas, que se escriben
+        una única vez al final. Luego genera el gráfico y actualiza la vista
+        una sola vez. Cada operación es un par (nombre, argumentos), donde
+        el nombre es "elemento", "grafo", "registros" o "relacion", y los
+        argumentos son los que reciben modificar_elemento, modificar_grafo,
+        modificar_registros y borrar_relacion respectivamente. Las
+        relaciones se identifican por su posición al momento de aplicar
+        cada operación.
+
+        :param arg_operaciones: Las ediciones a aplicar, en orden.
+        :type arg_operaciones: tuple[list[tuple[str, tuple]]]
+        """
+        operaciones: list[tuple[str, tuple]] = arg_operaciones[0]
+        areas: str = ""
+        # Una operación aislada conserva la escritura incremental
+        lote: contextlib.AbstractContextManager = contextlib.nullcontext()
+        if len(operaciones) > 1:
+            lote = self._tablas.lote()
+        with lote:
+            for nombre, argumentos in operaciones:
+                area: str = self._aplicar_edicion(nombre, argumentos)
+                if area not in areas:
+                    areas += area
+        self._gestor.graficar(f"edición_{areas}")
 
     def atributos_de_elemento(self, tipo: str, id_elem: str) -> tuple[str, dict[str, str]]:
         """
-        Retorna los atributos del nodo o vértice cuyo id recibe como argumento.
+        Retorna los atributos del nodo o vértice cuyo id recibe como argumento,
+        tal como están registrados. Los atributos vacíos toman el valor por
+        defecto del grafo.
         
         :param tipo: El tipo de elemento (nodo o vértice).
         :type tipo: str
@@ -52,29 +69,10 @@ class GestionEdicion:
         """
         res_fila: dict[str, str] = {}       
         if tipo == "nodo":
-            with open(
-                self._csv_prop_nodos, "r", newline="",  encoding="utf-8"
-            ) as propiedades:
-                registros = csv.DictReader(propiedades, delimiter="§")
-                for fila in registros:
-                    if fila["id"] == id_elem:
-                        res_fila = fila
-                        break
+            res_fila = self._tablas.fila("propiedades_n", id_elem)
         else:
-            with open(
-                self._csv_prop_vertices, "r", newline="", encoding="utf-8"
-            ) as propiedades:
-                registros = csv.DictReader(propiedades, delimiter="§")
-                for fila in registros:
-                    if fila["id"] == id_elem:
-                        res_fila = fila
-                        break
-            with open(
-                self._csv_proposiciones, "r", newline="", encoding="utf-8"
-            ) as proposiciones:
-                registros = csv.DictReader(proposiciones, delimiter="§")
-                filas = list(registros)
-            for fila in filas:
+            res_fila = self._tablas.fila("propiedades_v", id_elem)
+            for fila in self._tablas.registros("proposiciones"):
                 if fila["rel"] == id_elem:
                     res_fila["peso"] = fila["peso"]
                     break
@@ -89,13 +87,7 @@ class GestionEdicion:
         :param arg_id: El id de la proposición a eliminar.
         :type arg_id: tuple[str]
         """
-        id_rel: str = arg_id[0]
-        ids_a_borrar: list[str] = self._borrar_fila_proposicion(id_rel)        
-        self._borrar_elementos_aislados(ids_a_borrar)       
-        diagramador = diagrama.Diagramador()
-        self._gestor.ruta_png = diagramador.crear_grafo()
-        self._gestor.cola_avisos.put(("img", "edición_r", ""))
-        self._gestor.actualizar.set()      
+        self.aplicar_lote(([("relacion", arg_id)],))
                 
     def enlazar_area(self, edicion) -> None:
         """
@@ -144,40 +136,21 @@ class GestionEdicion:
         :type elem: str
         """        
         if elem == "vértice":
-            res:list = self._obtener_ids(self._csv_vertices)
+            res:list = self._obtener_ids("vertices")
         else:
-            res = self._obtener_ids(self._csv_nodos)
+            res = self._obtener_ids("nodos")
         return res
 
     def modificar_grafo(self, arg_cambios: tuple[list[dict[str, str]]]) -> None:
         """
-        Escribe las modificaciones en la tabla y aplica los cambios al
-        diccionario de estilos para que los nuevos ingresos tengan los
-        atributos definidos.
+        Aplica los cambios a los diccionarios de estilo, que definen los
+        atributos por defecto de todos los nodos y vértices. Los atributos
+        propios de cada elemento se conservan.
 
         :param arg_cambios: Los cambios en los atributos del grafo.
         :type arg_cambios: tuple[dict[str, str]]
         """
-        cambios: list[dict[str, str]] = arg_cambios[0]
-        if cambios[0]:
-            self._actualizar_propiedades(
-                self._csv_prop_nodos, cambios[0]
-            )            
-            for clave in cambios[0]:
-                comunes.atrb_nodos[clave] = cambios[0][clave]
-        if cambios[1]:
-            self._actualizar_propiedades(
-                self._csv_prop_vertices, cambios[1]
-            )
-            for clave in cambios[1]:
-                comunes.atrb_vertices[clave] = cambios[1][clave]
-        if cambios[2]:
-            self._actualizar_atributos_grafo(cambios[2])
-        # Obtengo la ruta al grafo generado
-        diagramador = diagrama.Diagramador()
-        self._gestor.ruta_png = diagramador.crear_grafo()
-        self._gestor.cola_avisos.put(("img", "edición_g", ""))
-        self._gestor.actualizar.set()
+        self.aplicar_lote(([("grafo", arg_cambios)],))
 
     def modificar_elemento(
         self, arg_elem: tuple[str, str, dict[str, str]]
@@ -189,21 +162,7 @@ class GestionEdicion:
         :param arg_elem: Los cambios en el elemento.
         :type arg_elem: tuple[str, str, dict[str, str]]
         """
-        tipo: str = arg_elem[0]
-        id_elem: str = arg_elem[1]
-        cambios: dict[str, str] = arg_elem[2]
-        if tipo == "nodo":
-            self._actualizar_fila(
-                self._csv_prop_nodos, id_elem, cambios
-            )
-        else:
-            self._actualizar_fila(
-                self._csv_prop_vertices, id_elem, cambios
-            )
-        diagramador = diagrama.Diagramador()
-        self._gestor.ruta_png = diagramador.crear_grafo()
-        self._gestor.cola_avisos.put(("img", "edición_v", ""))
-        self._gestor.actualizar.set()  
+        self.aplicar_lote(([("elemento", arg_elem)],))
 
     def modificar_registros(
         self, arg_cambios: tuple[dict[str, tuple[str, str]]]
@@ -217,21 +176,7 @@ class GestionEdicion:
         :param arg_cambios: Los cambios en el elemento.
         :type arg_cambios: tuple[dict[str, tuple[str, str]]]        
         """
-        cambios: dict[str, tuple[str, str]] = arg_cambios[0]
-        # Proceso las cadenas ingresadas
-        if not cambios["ent2"]:
-            del cambios["ent2"]
-        valores: list[str] = [cambios[c][1] for c in cambios.keys()]
-        valores = [self._gestor.eliminar_simbolo(v) for v in valores]
-        valores = [self._gestor.acotar_cadena(v) for v in valores]
-        valores = self._gestionar_justificado(valores)
-        # Actualizo las tablas correspondientes
-        self._escribir_en_tablas(valores, cambios)
-        # Actualizo la vista
-        diagramador = diagrama.Diagramador()
-        self._gestor.ruta_png = diagramador.crear_grafo()
-        self._gestor.cola_avisos.put(("img", "edición_r", ""))
-        self._gestor.actualizar.set()  
+        self.aplicar_lote(([("registros", arg_cambios)],))
 
     def nodos_registrados(self) -> dict[str, str | None]:
         """
@@ -241,10 +186,8 @@ class GestionEdicion:
         :rtype: dict[str, str | None]
         """
         res: dict[str, str | None] = {}
-        with open(self._csv_nodos, "r", newline="", encoding="utf-8") as nodos:
-            registros = csv.DictReader(nodos, delimiter="§")
-            for registro in registros:
-                res[registro["id"]] = registro["nodo"]
+        for registro in self._tablas.registros("nodos"):
+            res[registro["id"]] = registro["nodo"]
         return res
 
     def relaciones_registradas(self) -> dict[int, list[tuple[str, str]]]:
@@ -255,29 +198,28 @@ class GestionEdicion:
         :return: Las proposiciones registradas.
         :rtype: dict[int, list[tuple[str, str]]]
         """
+        # Si las tablas no cambiaron, retorno el último listado
+        versiones: tuple[int, ...] = tuple(
+            self._tablas.version(t) for t in ("proposiciones", "nodos", "vertices")
+        )
+        if self._cache_relaciones and self._cache_relaciones[0] == versiones:
+            return {k: list(v) for k, v in self._cache_relaciones[1].items()}
+        nodos: dict[str, str] = self._etiquetas("nodos")
+        vertices: dict[str, str] = self._etiquetas("vertices")
         res: dict[int, list[tuple[str, str]]] = {} 
-        with open(
-            self._csv_proposiciones, "r", newline="", encoding="utf-8"
-        ) as proposiciones:
-            registros = csv.DictReader(proposiciones, delimiter="§")
-            id_prop: int = 1
-            for fila in registros:
-                l_aux: list = []
-                id_ent1, id_rel, id_ent2 = (
-                    fila["ent1"], fila["rel"], fila["ent2"]
-                )               
-                val_ent1: str = self._valor_entidad(self._csv_nodos, id_ent1)
-                val_rel: str = self._valor_entidad(self._csv_vertices, id_rel)
-                val_ent2: str = self._valor_entidad(self._csv_nodos, id_ent2)
-                t_ent1: tuple[str, str] = (id_ent1, val_ent1)
-                t_rel: tuple[str, str] = (id_rel, val_rel)
-                t_ent2: tuple[str, str] = (id_ent2, val_ent2)
-                l_aux.append(t_ent1)
-                l_aux.append(t_rel)
-                l_aux.append(t_ent2)
-                res[id_prop] = l_aux
-                id_prop += 1
-        return res
+        id_prop: int = 1
+        for fila in self._tablas.registros("proposiciones"):
+            id_ent1, id_rel, id_ent2 = (
+                fila["ent1"], fila["rel"], fila["ent2"]
+            )               
+            res[id_prop] = [
+                (id_ent1, nodos.get(id_ent1, "")),
+                (id_rel, vertices.get(id_rel, "")),
+                (id_ent2, nodos.get(id_ent2, ""))
+            ]
+            id_prop += 1
+        self._cache_relaciones = (versiones, res)
+        return {k: list(v) for k, v in res.items()}
 
     def vertices_registrados(self) -> dict[str, list[list[str | None]]]:
         """
@@ -287,33 +229,20 @@ class GestionEdicion:
         :return: Los vértices registrados.
         :rtype: dict[str, list[list[str | None]]]
         """
+        # Agrupo las proposiciones por vértice en una sola pasada
+        por_vertice: dict[str, list[dict[str, str]]] = {}
+        for fila in self._tablas.registros("proposiciones"):
+            por_vertice.setdefault(fila["rel"], []).append(fila)
+        nodos: dict[str, str] = self._etiquetas("nodos")
         # creo el diccionadior de ids de vertices con listas vacias como valores
         ids_vertices: dict[str, list[list[str | None]]] = {}
-        with open(
-            self._csv_vertices, "r", newline="", encoding="utf-8"
-        ) as vertices:
-            registros = csv.DictReader(vertices, delimiter="§")
-            for registro in registros:
-                id_actual:str = registro["id"]
-                ids_vertices[id_actual] = []
-                with open(
-                    self._csv_proposiciones, "r", newline="", encoding="utf-8"
-                ) as proposiciones:
-                    filas = csv.DictReader(proposiciones, delimiter="§")
-                    for fila in filas:
-                        if fila["rel"] == id_actual:
-                            ent1: str = self._valor_entidad(
-                                self._csv_nodos, fila["ent1"]
-                            )
-                            ent2: str = self._valor_entidad(
-                                self._csv_nodos, fila["ent2"]
-                            )
-                            c_aux: str = self._gestor.eliminar_justificado(
-                                registro["vertice"]
-                            )                                
-                            ids_vertices[id_actual].append(
-                                [ent1, c_aux, ent2]
-                            )
+        for registro in self._tablas.registros("vertices"):
+            id_actual:str = registro["id"]
+            c_aux: str = self._gestor.eliminar_justificado(registro["vertice"])
+            ids_vertices[id_actual] = [
+                [nodos.get(fila["ent1"], ""), c_aux, nodos.get(fila["ent2"], "")]
+                for fila in por_vertice.get(id_actual, [])
+            ]
         return ids_vertices
 
     def _actualizar_atributos_grafo(self, cambios_grafo: dict[str, str]) -> None:
@@ -365,47 +294,30 @@ class GestionEdicion:
                 pass
 
     def _actualizar_fila(
-        self, tabla:Path, id_elem: str, cambios: dict[str, str]
+        self, tabla: str, id_elem: str, cambios: dict[str, str]
     ) -> None:
         """
         Reemplaza en la tabla correspondiente, la fila del elemento cuyo id
         recibe como argumento, con los cambios contenidos en el diccionario.
+        Los cambios son sólo los atributos que se eligieron para el elemento
+        y se registran aunque coincidan con los valores por defecto del
+        grafo, para que no cambien si éstos se modifican luego.
 
-        :param tabla: La ruta a la tabla.
-        :type tabla: Path
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
         :param id_elem: El id del elemento a modificar.
         :type id_elem: str
         :param cambios: Los nuevos valores.
         :type cambios: dict[str. str]
         """
         peso: str = ""
-        if str(tabla).endswith("v.csv"):
+        if tabla == "propiedades_v":
             try:
                 peso = cambios["peso"]
                 del cambios["peso"]
             except:
                 pass
-        with open(tabla, "r", newline="", encoding="utf-8") as propiedades:
-            registros = csv.DictReader(propiedades, delimiter="§")
-            filas: list[dict[str, str]] = list(registros)                
-        encabezado:list[str] = list(filas[0].keys())
-        indice_fila_editada:int  = -1
-        for dicc_fila in filas:
-            indice_fila_editada += 1
-            if dicc_fila["id"] == id_elem:
-                break
-        # Actualizo los valores
-        for atributo in cambios.keys():
-            filas[indice_fila_editada][atributo] = cambios[atributo]
-        # Preparo las filas y luego las escribo              
-        filas_actualizadas:list[list[str]] = [
-            list(fila.values()) for fila in filas
-        ]
-        with open(tabla, "w", newline="", encoding="utf-8") as propiedades:
-            escritor = csv.writer(propiedades, delimiter="§")
-            escritor.writerow(encabezado)
-            for fila in filas_actualizadas:
-                escritor.writerow(fila)
+        self._tablas.editar(tabla, id_elem, cambios)
         # Actualizo los pesos
         if peso:
             self._actualizar_peso(id_elem, peso)          
@@ -421,57 +333,36 @@ class GestionEdicion:
         :param peso: El nuevo peso de la relación.
         :type peso: str
         """
-        with open(
-            self._csv_proposiciones, "r", newline="", encoding="utf-8"
-        ) as proposiciones:
-            registros = csv.DictReader(proposiciones, delimiter="§")
-            filas: list[dict[str, str]] = list(registros)                
-        encabezado:list[str] = list(filas[0].keys())
-        for dicc_fila in filas:
-            if dicc_fila["rel"] == id_vertice:
-                dicc_fila["peso"] = str(peso)
-        filas_actualizadas:list[list[str]] = [
-            list(fila.values()) for fila in filas
-        ]
-        with open(
-            self._csv_proposiciones, "w", newline="", encoding="utf-8"
-        ) as proposiciones:
-            escritor = csv.writer(proposiciones, delimiter="§")
-            escritor.writerow(encabezado)
-            for fila in filas_actualizadas:
-                escritor.writerow(fila)  
-
-    def _actualizar_propiedades(
-        self, tabla: Path, cambios: dict[str, str]
-    ) -> None:
+        self._tablas.editar_donde(
+            "proposiciones", "rel", id_vertice, {"peso": str(peso)}
+        )
+
+    def _aplicar_edicion(self, nombre: str, argumentos: tuple) -> str:
         """
-        Actualiza todos los registros de la tabla que recibe como argumento,
-        con los cambios almacenados en el diccionario.
+        Aplica a las tablas y los diccionarios de estilo una de las ediciones
+        de un lote, sin actualizar la vista.
 
-        :param tabla: La ruta a la tabla de propiedades a modificar.
-        :type tabla: Path
-        :param cambios: Los nuevos valores.
-        :type cambios: dict[str, str]
-        """
-        filas: list[dict[str, str]] = [{}]
-        with open(tabla, "r", newline="", encoding="utf-8") as propiedades:
-            registros = csv.DictReader(propiedades, delimiter="§")
-            filas = list(registros)
-        # Actulizo los valores
-        for clave in cambios.keys():
-            for dicc_fila in filas:
-                dicc_fila[clave] = cambios[clave]
-        # Preparo los datos para escribirlos
-        encabezado:list[str] = list(filas[0].keys())
-        filas_actualizadas:list[list[str]] = [
-            list(fila.values()) for fila in filas
-        ]
-        # Escribo los cambios en la tabla
-        with open(tabla, "w", newline="", encoding="utf-8") as propiedades:
-            escritor = csv.writer(propiedades, delimiter="§")
-            escritor.writerow(encabezado)
-            for fila in filas_actualizadas:
-                escritor.writerow(fila)
+        :param nombre: El tipo de edición.
+        :type nombre: str
+        :param argumentos: Los argumentos de la edición.
+        :type argumentos: tuple
+        :return: La letra que identifica las secciones cuya vista se actualiza.
+        :rtype: str
+        """
+        if nombre == "elemento":
+            self._cambiar_elemento(argumentos)
+            return "v"
+        elif nombre == "grafo":
+            self._cambiar_grafo(argumentos)
+            return "g"
+        elif nombre == "registros":
+            self._cambiar_registros(argumentos)
+            return "r"
+        elif nombre == "relacion":
+            self._quitar_relacion(argumentos)
+            return "r"
+        else:
+            raise ValueError(f"Edición desconocida: {nombre}")
 
     def _borrar_elementos_aislados(self, ids_a_borrar: list[str]) -> None:
         """
@@ -481,39 +372,23 @@ class GestionEdicion:
         :param ids_a_borrar: Los candidatos a ser borrados.
         :type ids_a_borrar: list[str]
         """
-        borrar_ent1: bool = True
-        borrar_rel: bool = True
-        borrar_ent2: bool = True
-        seguir_buscando: bool = borrar_ent1 or borrar_rel or borrar_ent2
         ent1: str = ids_a_borrar[0]
         rel: str = ids_a_borrar[1]
         ent2: str = ids_a_borrar[2]
-        with open(
-            self._csv_proposiciones, "r", newline="", encoding="utf-8"
-        ) as proposiciones:
-            registros = csv.DictReader(proposiciones, delimiter="§")
-            for registro in registros:
-                if not seguir_buscando:
-                    break
-                if borrar_ent1:
-                    if registro["ent1"] == ent1 or registro["ent2"] == ent1:
-                        borrar_ent1 = False
-                if borrar_ent2:
-                    if registro["ent1"] == ent2 or registro["ent2"] == ent2:
-                        borrar_ent2 = False                
-                if borrar_rel:
-                    if registro["rel"] == rel:
-                        borrar_rel = False
+        # Los elementos sin referencias quedaron aislados
+        borrar_ent1: bool = self._tablas.referencias("nodos", ent1) == 0
+        borrar_rel: bool = self._tablas.referencias("vertices", rel) == 0
+        borrar_ent2: bool = self._tablas.referencias("nodos", ent2) == 0
         if borrar_ent1:
-            self._gestor.borrar_de_tabla(self._csv_nodos, ent1)
-            self._gestor.borrar_de_tabla(self._csv_prop_nodos, ent1)
+            self._gestor.borrar_de_tabla("nodos", ent1)
+            self._gestor.borrar_de_tabla("propiedades_n", ent1)
         if borrar_rel:
-            self._gestor.borrar_de_tabla(self._csv_vertices, rel)
-            self._gestor.borrar_de_tabla(self._csv_prop_vertices, rel)
+            self._gestor.borrar_de_tabla("vertices", rel)
+            self._gestor.borrar_de_tabla("propiedades_v", rel)
         if borrar_ent2:
             if ent2 != ent1:
-                self._gestor.borrar_de_tabla(self._csv_nodos, ent2)
-                self._gestor.borrar_de_tabla(self._csv_prop_nodos, ent2)
+                self._gestor.borrar_de_tabla("nodos", ent2)
+                self._gestor.borrar_de_tabla("propiedades_n", ent2)
                     
 
     def _borrar_fila_proposicion(self, indice: str) -> list[str]:
@@ -524,30 +399,84 @@ class GestionEdicion:
         :param indice: El índice de la fila a borrar.
         :type indice: str
         """
-        with open(
-            self._csv_proposiciones, "r", newline="", encoding="utf-8"
-        ) as proposiciones:
-            registros = proposiciones.readlines()
-        indice_fila:int = int(indice)
-        ids_a_borrar:list[str] = registros[indice_fila].split(chr(167))
-        del ids_a_borrar[3] # Elimino el campo de peso
-        del registros[indice_fila] # Elimino la fila
-        with open(
-            self._csv_proposiciones, "w", newline="", encoding="utf-8"
-        ) as archivo:
-            archivo.writelines(registros)
+        # El índice cuenta al encabezado como la fila cero
+        indice_fila:int = int(indice) - 1
+        fila: dict[str, str] = self._tablas.borrar_fila(
+            "proposiciones", indice_fila
+        )
+        ids_a_borrar:list[str] = [fila["ent1"], fila["rel"], fila["ent2"]]
         return ids_a_borrar
 
 
+    def _cambiar_elemento(
+        self, arg_elem: tuple[str, str, dict[str, str]]
+    ) -> None:
+        """
+        Actualiza en la tabla de propiedades los atributos del nodo o vértice.
+
+        :param arg_elem: El tipo de elemento, su id y los cambios.
+        :type arg_elem: tuple[str, str, dict[str, str]]
+        """
+        tipo: str = arg_elem[0]
+        id_elem: str = arg_elem[1]
+        # Copio los cambios, que pueden compartirse entre varios elementos
+        cambios: dict[str, str] = dict(arg_elem[2])
+        if tipo == "nodo":
+            self._actualizar_fila(
+                "propiedades_n", id_elem, cambios
+            )
+        else:
+            self._actualizar_fila(
+                "propiedades_v", id_elem, cambios
+            )
+
+    def _cambiar_grafo(self, arg_cambios: tuple[list[dict[str, str]]]) -> None:
+        """
+        Actualiza los diccionarios de estilo de nodos, vértices y grafo.
+
+        :param arg_cambios: Los cambios en los atributos del grafo.
+        :type arg_cambios: tuple[list[dict[str, str]]]
+        """
+        cambios: list[dict[str, str]] = arg_cambios[0]
+        if cambios[0]:
+            for clave in cambios[0]:
+                comunes.atrb_nodos[clave] = cambios[0][clave]
+        if cambios[1]:
+            for clave in cambios[1]:
+                comunes.atrb_vertices[clave] = cambios[1][clave]
+        if cambios[2]:
+            self._actualizar_atributos_grafo(cambios[2])
+
+    def _cambiar_registros(
+        self, arg_cambios: tuple[dict[str, tuple[str, str]]]
+    ) -> None:
+        """
+        Procesa los nuevos valores de los elementos de una proposición y los
+        escribe en las tablas.
+
+        :param arg_cambios: Los cambios en los elementos.
+        :type arg_cambios: tuple[dict[str, tuple[str, str]]]
+        """
+        cambios: dict[str, tuple[str, str]] = arg_cambios[0]
+        # Proceso las cadenas ingresadas
+        if not cambios["ent2"]:
+            del cambios["ent2"]
+        valores: list[str] = [cambios[c][1] for c in cambios.keys()]
+        valores = [self._gestor.eliminar_simbolo(v) for v in valores]
+        valores = [self._gestor.acotar_cadena(v) for v in valores]
+        valores = self._gestionar_justificado(valores)
+        # Actualizo las tablas correspondientes
+        self._escribir_en_tablas(valores, cambios)
+
     def _editar_campo(
-        self, tabla: Path, campo: str, id_elem: str, valor: str
+        self, tabla: str, campo: str, id_elem: str, valor: str
     ) -> None:
         """
         Modifica el campo de la tabla con el valor recibido, del elemento
         cuyo id también recibe como argumento.
 
-        :param tabla: La ruta a la tabla a modificar.
-        :type tabla: Path
+        :param tabla: El nombre de la tabla a modificar.
+        :type tabla: str
         :param campo: El campo que se debe modificar.
         :type campo: str
         :param id_elem: El id del elemento.
@@ -555,43 +484,22 @@ class GestionEdicion:
         :param valor: El nuevo valor.
         :type valor: str
         """
-        indice: int = self._obtener_indice_registro(tabla, id_elem)
-        indice -= 1
-        with open(tabla, "r", newline="", encoding="utf-8") as archivo:
-            registros = csv.DictReader(archivo, delimiter="§")
-            filas: list[dict[str, str]] = list(registros)
-        encabezado:str = chr(167).join(filas[0].keys())
-        encabezado = encabezado + "\r\n"
-        # Modifico el campo deseado
-        filas[indice][campo] = valor
-        nuevos_registros = []
-        nuevos_registros.append(encabezado)
-        for fila in filas:
-            c_aux:str = chr(167).join([fila[c] for c in fila.keys()])
-            c_aux = c_aux + "\r\n"
-            nuevos_registros.append(c_aux)
-        with open(tabla, "w", newline="",encoding="utf-8") as archivo:
-            archivo.writelines(nuevos_registros)  
+        self._tablas.editar(tabla, id_elem, {campo: valor})
 
                     
-    def _editar_registro(self, tabla: Path, id_elem: str, valor: str) -> None:
+    def _editar_registro(self, tabla: str, id_elem: str, valor: str) -> None:
         """
         Modifica un registro de la tabla de nodos o vértices.
 
-        :param tabla: La ruta a la tabla a modificar.
-        :type tabla: Path
+        :param tabla: El nombre de la tabla a modificar.
+        :type tabla: str
         :param id_elem: El id del elemento.
         :type id_elem: str
         :param valor: El nuevo valor.
         :type valor: str
         """
-        indice: int = self._obtener_indice_registro(tabla, id_elem)
-        with open(tabla, "r", newline="", encoding="utf-8") as archivo:
-            registros = archivo.readlines()
-        nueva_fila: str = id_elem + chr(167) + valor + "\r\n"
-        registros[indice] = nueva_fila
-        with open(tabla, "w", newline="",encoding="utf-8") as archivo:
-            archivo.writelines(registros) 
+        columna: str = "nodo" if tabla == "nodos" else "vertice"
+        self._tablas.editar(tabla, id_elem, {columna: valor})
 
 
     def _escribir_en_tablas(
@@ -609,25 +517,51 @@ class GestionEdicion:
         # Entidad1
         id_ent1: str = cambios["ent1"][0]
         val_ent1: str = valores[0]
-        self._editar_registro(self._csv_nodos, id_ent1, val_ent1)
-        self._editar_campo(self._csv_prop_nodos, "label", id_ent1, val_ent1)
+        self._editar_registro("nodos", id_ent1, val_ent1)
+        self._editar_campo("propiedades_n", "label", id_ent1, val_ent1)
         # Relacion
         id_rel: str = cambios["rel"][0]
         val_rel: str = valores[1]
-        self._editar_registro(self._csv_vertices, id_rel, val_rel)
-        self._editar_campo(self._csv_prop_vertices, "label", id_rel, val_rel)
+        self._editar_registro("vertices", id_rel, val_rel)
+        self._editar_campo("propiedades_v", "label", id_rel, val_rel)
         # Entidad2
         try:
             if cambios["ent2"]:
                 id_ent2: str = cambios["ent2"][0]
                 val_ent2: str = valores[2]
-                self._editar_registro(self._csv_nodos, id_ent2, val_ent2)
+                self._editar_registro("nodos", id_ent2, val_ent2)
                 self._editar_campo(
-                    self._csv_prop_nodos, "label", id_ent2, val_ent2
+                    "propiedades_n", "label", id_ent2, val_ent2
                 )
         except:
             pass
 
+    def _etiquetas(self, tabla: str) -> dict[str, str]:
+        """
+        Retorna el valor de texto, sin el justificado, de cada elemento de
+        la tabla de nodos o vértices indexado por su id. Se recalcula sólo
+        si la tabla cambió desde la última consulta.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: Los valores de los elementos.
+        :rtype: dict[str, str]
+        """
+        version: int = self._tablas.version(tabla)
+        if tabla in self._cache_etiquetas:
+            if self._cache_etiquetas[tabla][0] == version:
+                return self._cache_etiquetas[tabla][1]
+        columna: str = "nodo" if tabla == "nodos" else "vertice"
+        res: dict[str, str] = {}
+        for registro in self._tablas.registros(tabla):
+            # Si el id está repetido, vale el primer registro
+            if registro["id"] not in res:
+                res[registro["id"]] = self._gestor.eliminar_justificado(
+                    registro[columna]
+                )
+        self._cache_etiquetas[tabla] = (version, res)
+        return res
+
     def _gestionar_justificado(self, valores: list[str]) -> list[str]:
         """
         Alinea la modificación ingresada según los valores establecidos.
@@ -653,159 +587,66 @@ class GestionEdicion:
         
                     
 
+    def _justificar(self, valor: str) -> str:
+        """
+        Aplica el justificado existente al texto de un nodo o vértice.
+
+        :param valor: El texto a justificar.
+        :type valor: str
+        :return: El texto acotado y con el justificado actual.
+        :rtype: str
+        """
+        # Remuevo justificados anteriores
+        c_aux: str = self._gestor.eliminar_justificado(valor)
+        c_aux = self._gestor.acotar_cadena(c_aux)
+        if self._gestor.justificado != "n":
+            c_aux = c_aux + f"\\{self._gestor.justificado}"
+        return c_aux
+
     def _normalizar_tablas(self) -> None:
         """
         Envía cada una de las tablas a un método que les aplica el criterio
         existente.
         """
-        self._ordenar(self._csv_nodos, "nodo")
-        self._ordenar(self._csv_vertices, "vertice")
-        self._ordenar(self._csv_prop_nodos, "label")
-        self._ordenar(self._csv_prop_vertices, "label")
+        self._ordenar("nodos", "nodo")
+        self._ordenar("vertices", "vertice")
+        self._ordenar("propiedades_n", "label")
+        self._ordenar("propiedades_v", "label")
 
-    def _obtener_ids(self, tabla: Path) -> list[str]:
+    def _obtener_ids(self, tabla: str) -> list[str]:
         """
         Retorna una lista con los ids de la tabla de nodos o vértices.
         
-        :param tabla: La ruta a la tabla.
-        :type tabla: Path
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
         :return: La lista de ids.
         :rtype: list[str]
         """
         res:list[str] = []
-        with open(tabla, "r", newline="", encoding="utf-8") as archivo:
-            registros = csv.DictReader(archivo, delimiter="§")
-            for registro in registros:
-                res.append(registro["id"])
+        for registro in self._tablas.registros(tabla):
+            res.append(registro["id"])
         return res
 
-    def _obtener_indice_registro(self, tabla: Path, id_elem: str) -> int:
-        """
-        Retorna el índice de la fila de la tabla que coincide con el id
-        recibido como argumento.
-        
-        :param tabla: La ruta a la tabla donde buscar.
-        :type tabla: Path
-        :param id_elem: El id del elemento.
-        :type id_elem: str
-        :return: El índice de la fila.
-        :rtype: int
-        """
-        with open(tabla, "r", newline="", encoding="utf-8") as archivo:
-            registros = archivo.readlines()
-        indice: int = 1
-        for registro in registros[1:]:
-            l_aux = registro.split(chr(167))
-            if l_aux[0] == id_elem:
-                break
-            indice += 1
-        return indice
-
-    def _ordenar(self, tabla: Path, columna: str) -> None:
+    def _ordenar(self, tabla: str, columna: str) -> None:
         """
         Aplica el justificado existente a los campos de texto de cada fila
         de la tabla recibida.
 
-        :param tabla: La ruta a la tabla a ordenar.
-        :type tabla: Path
-        :param columna: Un indicador que permite aplicar un proceso diferente según la estructura de la tabla.
+        :param tabla: El nombre de la tabla a ordenar.
+        :type tabla: str
+        :param columna: La columna con el texto de nodos o vértices.
         :type columna: str
         """
-        if columna == "nodo" or columna == "vertice":
-            registros_aux: list[str] = []
-            with open(tabla, "r", newline="", encoding="utf-8") as archivo:
-                registros = archivo.readlines()
-            registros_aux.append(registros[0])            
-            agregar_justificado: bool = False
-            if self._gestor.justificado != "n":
-                agregar_justificado = True
-            for registro in registros[1:]:                
-                l_aux: list[str] = registro.split(chr(167))
-                c_aux: str = l_aux[1]
-                # Remuevo justificados anteriores
-                c_aux = self._gestor.eliminar_justificado(c_aux)
-                c_aux = self._gestor.acotar_cadena(c_aux)
-                if agregar_justificado:
-                    c_aux = (
-                        l_aux[0] + chr(167) + c_aux +
-                        f"\\{self._gestor.justificado}" + "\r\n"
-                    )
-                else:
-                    c_aux = l_aux[0] + chr(167) + c_aux + "\r\n"
-                registros_aux.append(c_aux)
-            with open(tabla, "w", newline="", encoding="utf-8") as archivo:
-                archivo.writelines(registros_aux)
-        # Tablas de propiedades, mismo procedimiento, otra estructura
-        else:
-            registros_aux = []
-            with open(tabla, "r", newline="", encoding="utf-8") as archivo:
-                registros = archivo.readlines()
-            registros_aux.append(registros[0])
-            agregar_justificado = False
-            if self._gestor.justificado != "n":
-                agregar_justificado = True
-            for registro in registros[1:]:
-                l_aux = registro.split(chr(167))
-                c_aux = l_aux[10]
-                c_aux = self._gestor.eliminar_justificado(c_aux)
-                c_aux = self._gestor.acotar_cadena(c_aux)
-                # Obtengo las columnas anteriores a "label"
-                anteriores:str = chr(167).join([col for col in l_aux[:10]])
-                if agregar_justificado:
-                    # Tabla propiedades vértices
-                    if str(tabla).endswith("v.csv"):
-                        siguiente: str = l_aux[11]
-                        c_aux = (
-                            anteriores + chr(167) + c_aux +
-                            f"\\{self._gestor.justificado}" + chr(167) + siguiente
-                        )
-                    # Tabla propiedades nodos
-                    else:
-                        c_aux = (
-                            anteriores + chr(167) + c_aux +
-                            f"\\{self._gestor.justificado}" + "\r\n"
-                        )
-                else:
-                    if str(tabla).endswith("v.csv"):
-                        siguiente = l_aux[11]
-                        c_aux = (
-                            anteriores + chr(167) + c_aux + chr(167) + siguiente
-                        )
-                    else:
-                        c_aux = anteriores + chr(167) + c_aux + "\r\n"                    
-                registros_aux.append(c_aux)
-            with open(tabla, "w", newline="", encoding="utf-8") as archivo:
-                archivo.writelines(registros_aux)
-
-    def _valor_entidad(self, tabla: Path, id_entidad: str) -> str:
-        """
-        Retorna el valor de texto del elemento cuyo id recibe como argumento,
-        sin el justificado. Esto permite comparar realmente los cambios
-        ingresados con los valores existentes.
-
-        :param tabla: La tabla en la cual buscar.
-        :type tabla: Path
-        :param id_entidad: El id del elemento.
-        :type id_entidad: str
-        :return: El valor de texto del elemento.
-        :rtype: str
-        """        
-        res: str = ""
-        # obtengo en la tabla su valor le quito el justificado y lo retorno
-        with open(tabla, "r", newline="", encoding="utf-8") as archivo:
-            registros = csv.DictReader(archivo, delimiter="§")
-            for registro in registros:
-                if registro["id"] == id_entidad:
-                    if str(tabla).endswith("nodos.csv"):
-                        res = self._gestor.eliminar_justificado(
-                            registro["nodo"]
-                        )
-                        break
-                    else:
-                        res = self._gestor.eliminar_justificado(
-                            registro["vertice"]
-                        )
-                        break
-        return res
+        self._tablas.editar_columna(tabla, columna, self._justificar)
 
+    def _quitar_relacion(self, arg_id: tuple[str]) -> None:
+        """
+        Elimina la proposición indicada y los elementos que quedaron sin
+        relación.
 
+        :param arg_id: El id de la proposición a eliminar.
+        :type arg_id: tuple[str]
+        """
+        id_rel: str = arg_id[0]
+        ids_a_borrar: list[str] = self._borrar_fila_proposicion(id_rel)        
+        self._borrar_elementos_aislados(ids_a_borrar)       
@@ -4,7 +4,7 @@ import os
 import shutil
 from pathlib import Path
 from aplicacion.interfaz import comunes
-from aplicacion.documentos import diagrama
+from aplicacion.documentos import diagrama, tablas
 
 
 
@@ -14,6 +14,8 @@ class GestionProyecto:
 
     :param gestor: Gestiona la comunicación entre los módulos y la interacción con las tablas.
     :type gestor: Gestor 
+    :param tablas: El contenido en memoria de las tablas, compartido por los ámbitos de gestión.
+    :type tablas: Tablas
     :param proposiciones: Ruta a la tabla de proposiciones.
     :type proposiciones: Path
     :param nodos: Ruta a la tabla de nodos.
@@ -29,6 +31,7 @@ class GestionProyecto:
     def __init__(
         self,
         gestor,
+        tablas: tablas.Tablas,
         proposiciones: Path,
         nodos: Path,
         vertices: Path,
@@ -36,6 +39,7 @@ class GestionProyecto:
         prop_vertices: Path
     ):
         self._gestor = gestor
+        self._tablas = tablas
         self._csv_proposiciones: Path = proposiciones
         self._csv_nodos: Path = nodos
         self._csv_vertices : Path= vertices
@@ -61,13 +65,20 @@ class GestionProyecto:
         :type origen: str
         """
         directorio_path: Path = Path(directorio)
-        necesarios: list[str] = comunes.necesarios.copy()
-        cant_necesaria: int = len(necesarios)
-        conteo: int = 0
         lista_archivos: list[str] = os.listdir(directorio)
         lista_archivos = [  # Excluyo los archivos ocultos
             a for a in lista_archivos if not a.startswith(".")
         ]
+        necesarios: list[str] = comunes.necesarios.copy()
+        # Los proyectos guardados con el motor SQLite tienen la base de
+        # datos en lugar de las tablas .csv
+        if comunes.base_de_datos in lista_archivos:
+            necesarios = [n for n in necesarios if not n.endswith(".csv")]
+            necesarios.append(comunes.base_de_datos)
+        cant_necesaria: int = len(necesarios)
+        conteo: int = 0
+        # Libero la base de datos antes de que pueda ser reemplazada
+        self._tablas.cerrar()
         for archivo in lista_archivos:
             if archivo in necesarios:
                 recurso: str = str((directorio_path / archivo).resolve())
@@ -80,12 +91,15 @@ class GestionProyecto:
                 aviso = aviso + "ajenos al proyecto"
                 self._proyecto.mostrar_aviso(aviso)
                 raise Exception("Archivos ajenos al proyecto")
+        # Las tablas copiadas reemplazan al contenido en memoria
+        self._tablas.cargar()
         if origen == "guardado":  
             if conteo == cant_necesaria:
                 # Cargo los atributos del diagrama
                 # y elimino los archivos temporales
                 self._cargar_estado_grafo(self._ruta_estado_grafo)
                 self._cargar_estado_nodos_vertices(self._ruta_estado_n_v)
+                self._omitir_valores_por_defecto()
                 os.remove(self._ruta_estado_grafo)
                 os.remove(self._ruta_estado_n_v)
                 self._grafico.actualizar_cuadro()                          
@@ -94,9 +108,10 @@ class GestionProyecto:
                 self._proyecto.mostrar_aviso(aviso) 
                 raise Exception("Faltan archivos necesarios")            
         try:  # Genero el diagrama
-            diagramador = diagrama.Diagramador()
-            self._gestor.ruta_png = diagramador.crear_grafo()
-            self._grafico.cargar_imagen(self._gestor.ruta_png)
+            diagramador = diagrama.Diagramador(self._tablas)
+            resultado: str | bytes | dict = diagramador.generar()
+            self._gestor.registrar_diagrama(resultado)
+            self._grafico.cargar_imagen(resultado)
             self._edicion.volver_a_cargar_nodos()
             self._edicion.volver_a_cargar_vertices()
             self._edicion.volver_a_cargar_relaciones()
@@ -118,11 +133,24 @@ class GestionProyecto:
         """
         Carga el proyecto anterior, luego de que la operación de abrir uno
         existente no haya sido existosa o al reiniciar por cambio de tema.
-        Args captura la tupla vacía que recibe cuando es llamado por el
-        gestor para que se ejecute en segundo plano.
+        Como las tablas de propiedades sólo registran los atributos propios
+        de cada elemento, recupera también los estilos del diagrama, que el
+        intento fallido pudo haber reemplazado. Args captura la tupla vacía
+        que recibe cuando es llamado por el gestor para que se ejecute en
+        segundo plano.
         """
-        self.cargar_proyecto_guardado(self._ruta_respaldo, "respaldo") 
+        estado_grafo: str = str(
+            (self._ruta_respaldo / "estado_grafo.txt").resolve()
+        )
+        estado_n_v: str = str(
+            (self._ruta_respaldo / "estado_n_v.txt").resolve()
+        )
+        self._cargar_estado_grafo(estado_grafo)
+        self._cargar_estado_nodos_vertices(estado_n_v)
+        self._grafico.actualizar_cuadro()
+        self.cargar_proyecto_guardado(self._ruta_respaldo, "respaldo")
         self.eliminar_respaldo_temporal()
+        self.eliminar_estados_temporales()
         
     def crear_respaldo_temporal(self) -> None:
         """
@@ -133,7 +161,8 @@ class GestionProyecto:
         """
         if not os.path.exists(self._ruta_respaldo):
             os.mkdir(self._ruta_respaldo)
-        necesarios: list[str] = comunes.necesarios
+        self._tablas.sincronizar()
+        necesarios: list[str] = comunes.necesarios + [comunes.base_de_datos]
         lista_archivos: list[str] = os.listdir(self._ruta_recursos)
         lista_archivos = [a for a in lista_archivos if not a.startswith(".")]
         for archivo in lista_archivos:
@@ -201,7 +230,7 @@ class GestionProyecto:
         if diagrama_no_vacio:
             formato: str = args_exportar[0]
             directorio: str = args_exportar[1]
-            diagramador = diagrama.Diagramador()
+            diagramador = diagrama.Diagramador(self._tablas)
             diagramador.crear_grafo(formato, directorio)
             aviso: str = "El diagrama se exportó correctamente" 
             self._gestor.cola_avisos.put(("img","proyecto", aviso))
@@ -227,7 +256,14 @@ class GestionProyecto:
         # Creo los txt con el estado actual del grafo
         self._guardar_estado_grafo(self._ruta_estado_grafo)
         self._guardar_estado_nodos_vertices(self._ruta_estado_n_v)
+        self._tablas.sincronizar()
         for archivo in os.listdir(self._ruta_recursos):
+            # Los auxiliares de SQLite y la bitácora quedan vacíos al
+            # sincronizar y no forman parte del proyecto
+            if archivo.endswith(("-wal", "-shm")):
+                continue
+            if archivo.startswith(comunes.bitacora):
+                continue
             recurso: str = str((self._ruta_recursos / archivo).resolve())
             if os.path.isfile(recurso):
                 shutil.copy(recurso, salida)
@@ -347,4 +383,25 @@ class GestionProyecto:
         atrb_vertices: str = str(comunes.atrb_vertices)
         with open(archivo, "w", newline="", encoding="utf-8") as estado:
             estado.write(atrb_nodos + "\n")
-            estado.write(atrb_vertices + "\n")      
+            estado.write(atrb_vertices + "\n")
+
+    def _omitir_valores_por_defecto(self) -> None:
+        """
+        Vacía en las tablas de propiedades los atributos que coinciden con
+        los valores por defecto del grafo. Los proyectos guardados por
+        versiones anteriores registran todos los atributos de cada elemento.
+        """
+        for tabla, por_defecto in (
+            ("propiedades_n", comunes.atrb_nodos),
+            ("propiedades_v", comunes.atrb_vertices)
+        ):
+            registros: list[dict[str, str]] = self._tablas.registros(tabla)
+            for clave, valor in por_defecto.items():
+                if clave in ("id", "label"):
+                    continue
+                if any(fila.get(clave) == str(valor) for fila in registros):
+                    self._tablas.editar_columna(
+                        tabla,
+                        clave,
+                        lambda actual, defecto=str(valor): "" if actual == defecto else actual
+                    )
@@ -1,8 +1,6 @@
-import csv
 import tkinter as tk
 from aplicacion.interfaz import comunes
-from aplicacion.documentos import contenido, diagrama
-from pathlib import Path
+from aplicacion.documentos import contenido, importacion, tablas
 
 
 class GestionTexto:
@@ -11,33 +9,13 @@ class GestionTexto:
 
     :param gestor: Gestiona la comunicación entre los módulos y la interacción con las tablas.
     :type gestor: Gestor 
-    :param proposiciones: Ruta a la tabla de proposiciones.
-    :type proposiciones: Path
-    :param nodos: Ruta a la tabla de nodos.
-    :type nodos: Path
-    :param vertices: Ruta a la tabla de vértices.
-    :type vertices: Path
-    :param prop_nodos: Ruta a la tabla con las propiedades de los nodos.
-    :type prop_nodos: Path
-    :param prop_vertices: Ruta a la tabla con las propiedades de los vértices.
-    :type prop_vertices: Path
+    :param tablas: El contenido en memoria de las tablas, compartido por los ámbitos de gestión.
+    :type tablas: Tablas
     """
 
-    def __init__(
-        self,
-        gestor,
-        proposiciones: Path,
-        nodos: Path,
-        vertices: Path,
-        prop_nodos: Path,
-        prop_vertices: Path
-    ):
+    def __init__(self, gestor, tablas: tablas.Tablas):
         self._gestor = gestor
-        self._csv_proposiciones: Path = proposiciones
-        self._csv_nodos: Path = nodos
-        self._csv_vertices: Path = vertices
-        self._csv_prop_nodos: Path = prop_nodos
-        self._csv_prop_vertices: Path = prop_vertices
+        self._tablas = tablas
         self._ultimo_id_nodo:int = 0
         self._ultimo_id_vertice:int = 0
         # Datos para resolver el registro de la proposición
@@ -67,24 +45,80 @@ class GestionTexto:
 
     def extraer(self, arg_ruta: tuple[str]) -> None:
         """
-        Instancia al Extractor de contenido, obtiene y retorna el texto
-        del documento (.txt, .pdf) que recibe como argumento.
+        Instancia al Extractor de contenido y envía al área de texto el
+        contenido del documento (.txt, .pdf) que recibe como argumento, a
+        medida que se extrae, para que se pueda leer desde la primera página.
 
         :param arg_ruta: La ruta al archivo.
         :type arg_ruta: str
-        :return: El texto del documento o "-1". 
-        :rtype: str
         """
-        res:str = ""
         ruta: str = arg_ruta[0]
         if not isinstance(ruta, tuple):
             extractor = contenido.Extractor()
-            texto:str = extractor.extraer_contenido(ruta)
-            if texto != "-1":
-                res = texto
-            else:
-                res = "No se seleccionó un archivo válido."
-            self._gestor.cola_avisos.put(("txt", res))
+            # La primera parte reemplaza al aviso de carga, el resto se agrega
+            agregar: bool = False
+            try:
+                for parte in extractor.extraer_paginas(ruta):
+                    self._gestor.cola_avisos.put(("txt", parte, agregar, False))
+                    self._gestor.actualizar.set()
+                    agregar = True
+            except Exception as e:
+                print(e)
+                if not agregar:
+                    res: str = "No se seleccionó un archivo válido."
+                    self._gestor.cola_avisos.put(("txt", res, False, True))
+                else:
+                    # Las páginas ya enviadas quedan en el área de texto,
+                    # pero el texto está incompleto y no se guardó
+                    self._gestor.cola_avisos.put(("txt", "", True, True))
+                    aviso_error: str = "La extracción se interrumpió: el texto está incompleto"
+                    self._gestor.cola_avisos.put(("img", "texto", aviso_error))
+                self._gestor.actualizar.set()
+                return
+            # Indico que terminó la extracción y si se reutilizó el texto
+            self._gestor.cola_avisos.put(("txt", "", agregar, True))
+            if ruta.endswith(".pdf"):
+                aviso: str = "Texto recuperado de la cache"
+                if not extractor.recuperado:
+                    aviso = "Texto extraído y guardado en la cache"
+                self._gestor.cola_avisos.put(("img", "texto", aviso))
+            self._gestor.actualizar.set()
+
+    def importar(self, arg_ruta: tuple[str]) -> None:
+        """
+        Registra en bloque las proposiciones del archivo (.csv, .tsv, .json)
+        que recibe como argumento. Cada una pasa por el mismo proceso que
+        las ingresadas en el área de texto, pero las tablas se escriben y el
+        gráfico se genera una sola vez, al final.
+
+        :param arg_ruta: La ruta al archivo.
+        :type arg_ruta: tuple[str]
+        """
+        ruta: str = arg_ruta[0]
+        importador = importacion.Importador()
+        try:
+            proposiciones, descartadas = importador.leer_proposiciones(ruta)
+        except (OSError, ValueError) as e:
+            print(e)
+            aviso: str = "No se pudo leer el archivo seleccionado"
+            self._gestor.cola_avisos.put(("img", "proyecto", aviso))
+            self._gestor.actualizar.set()
+            return
+        agregadas: int = 0
+        with self._tablas.lote():
+            for proposicion in proposiciones:
+                if self._registrar_proposicion(proposicion):
+                    agregadas += 1
+        aviso = f"Proposiciones importadas: {agregadas}"
+        repetidas: int = len(proposiciones) - agregadas
+        if repetidas:
+            aviso = aviso + f", repetidas: {repetidas}"
+        if descartadas:
+            aviso = aviso + f", inválidas: {descartadas}"
+        if agregadas:
+            self._gestor.graficar("proyecto_i", aviso)
+        else:
+            self._gestor.cola_avisos.put(("img", "proyecto", aviso))
             self._gestor.actualizar.set()
 
 
@@ -96,76 +130,23 @@ class GestionTexto:
         :param arg_proposicion: La proposición ingresada.
         :type arg_proposicion: tuple[list[str]]
         """
-        # Proceso la proposición
         proposicion: list[str] = arg_proposicion[0]
-        proposicion = [self._gestor.eliminar_simbolo(e) for e in proposicion]
-        proposicion = [self._gestor.acotar_cadena(e) for e in proposicion]
-        proposicion = self._gestionar_justificado(proposicion)
-        # Registro nodos y vértices
-        self._registrar_nodos(proposicion)
-        registrar_proposicion: bool = self._registrar_vertices(proposicion)         
-        if registrar_proposicion:
-            proposicion_ids: list[int | str] = [
-                self._id_ent1, self._id_rel, self._id_ent2, proposicion[3]
-            ]
-            with open(
-                self._csv_proposiciones, "a", newline="", encoding="utf-8"
-            ) as proposiciones:
-                escritor = csv.writer(proposiciones, delimiter="§")
-                escritor.writerow(proposicion_ids)
-        else:
-            # Si ya existe, restablezco los valores e interrumpo
+        if not self._registrar_proposicion(proposicion):
+            # Si ya existe, aviso e interrumpo
             aux_aviso:str = "Proposición repetida"
             self._gestor.cola_avisos.put(("img","texto", aux_aviso))
             self._gestor.actualizar.set()            
-            self._id_ent1 = -1
-            self._ent1_defecto = True
-            self._id_ent2 = -1
-            self._ent2_defecto = True
-            self._id_rel = -1
-            self._rel_defecto = True            
             return
-        # Registro los atributos de nodos y vértices
-        self._registrar_propiedades(proposicion)
-        # Obtengo la ruta al grafo generado y el observador actualiza
-        diagramador = diagrama.Diagramador()
-        self._gestor.ruta_png = diagramador.crear_grafo()
-        self._gestor.cola_avisos.put(("img", "texto", ""))
-        # Restablezco los valores
-        self._id_ent1 = -1
-        self._ent1_defecto = True
-        self._id_ent2 = -1
-        self._ent2_defecto = True
-        self._id_rel = -1
-        self._rel_defecto = True
-        self._gestor.actualizar.set()
+        # Genero el diagrama y el observador actualiza
+        self._gestor.graficar("texto")
         return
 
     def actualizar_ultimos_ids(self) -> None:
         """
         Obtiene los últimos ids de nodos y vértices cuando se carga un proyecto.
         """
-        # Obtengo el último id de los nodos
-        with open(
-            self._csv_nodos, mode="r", newline="", encoding="utf-8"
-        ) as nodos:
-            registros = csv.DictReader(nodos, delimiter="§")
-            filas: list[dict[str, str]] = list(registros)
-        if len(filas) == 0:
-            self._ultimo_id_nodo = 0
-        else:
-            self._ultimo_id_nodo = int(filas[-1]["id"]) + 1
-           
-        # Obtengo el último id de los vertices
-        with open(
-            self._csv_vertices, mode="r", newline="", encoding="utf-8"
-        ) as vertices:
-            registros = csv.DictReader(vertices, delimiter="§")
-            filas = list(registros)
-        if len(filas) == 0:
-            self._ultimo_id_vertice = 0
-        else:
-            self._ultimo_id_vertice = int(filas[-1]["id"]) + 1
+        self._ultimo_id_nodo = self._tablas.siguiente_id("nodos")
+        self._ultimo_id_vertice = self._tablas.siguiente_id("vertices")
 
     def _gestionar_justificado(self, proposicion: list[str]) -> list[str]:
         """
@@ -191,6 +172,40 @@ class GestionTexto:
         proposicion.append(c_aux2)
         return proposicion
     
+    def _registrar_proposicion(self, proposicion: list[str]) -> bool:
+        """
+        Procesa la proposición ingresada y la registra, junto con sus nodos,
+        vértices y propiedades, si no existe. Al final restablece los datos
+        usados para resolver el registro.
+
+        :param proposicion: La proposición ingresada.
+        :type proposicion: list[str]
+        :return: Verdadero si la proposición se registró.
+        :rtype: bool
+        """
+        # Proceso la proposición
+        proposicion = [self._gestor.eliminar_simbolo(e) for e in proposicion]
+        proposicion = [self._gestor.acotar_cadena(e) for e in proposicion]
+        proposicion = self._gestionar_justificado(proposicion)
+        # Registro nodos y vértices
+        self._registrar_nodos(proposicion)
+        registrar_proposicion: bool = self._registrar_vertices(proposicion)         
+        if registrar_proposicion:
+            proposicion_ids: list[int | str] = [
+                self._id_ent1, self._id_rel, self._id_ent2, proposicion[3]
+            ]
+            self._tablas.agregar("proposiciones", proposicion_ids)
+            # Registro los atributos de nodos y vértices
+            self._registrar_propiedades(proposicion)
+        # Restablezco los valores
+        self._id_ent1 = -1
+        self._ent1_defecto = True
+        self._id_ent2 = -1
+        self._ent2_defecto = True
+        self._id_rel = -1
+        self._rel_defecto = True
+        return registrar_proposicion
+
     def _registrar_nodos(self, proposicion:list[str]) -> None:
         """
         Registra las entidades ingresadas en la tabla de nodos.
@@ -198,41 +213,31 @@ class GestionTexto:
         :param proposicion: La proposición ingresada.
         :type proposicion: list[str]
         """
-        # Verifico si ya están registrados
-        with open(self._csv_nodos, "r", newline="", encoding="utf-8") as nodos:
-            registros = csv.DictReader(nodos, delimiter="§")
-            for registro in registros:
-                # Si la entidad1 ya existe, obtengo su id
-                entidad_entrada1:str = self._gestor.eliminar_justificado(proposicion[0])
-                entidad_entrada2:str = self._gestor.eliminar_justificado(proposicion[2])
-                entidad_en_tabla:str = self._gestor.eliminar_justificado(registro["nodo"])
-                if self._id_ent1 == -1 and entidad_en_tabla == entidad_entrada1:
-                    self._id_ent1 = registro["id"]
-                    # No se le asigna propiedades por defecto 
-                    self._ent1_defecto = False                       
-                if self._id_ent2 == -1 and entidad_en_tabla == entidad_entrada2:
-                    self._id_ent2 = registro["id"]
-                    self._ent2_defecto = False
-                # Si ambas tienen id salgo del ciclo
-                if self._id_ent1 != -1 and self._id_ent2 != -1:
-                    break                
+        # Verifico si ya están registrados y obtengo sus ids
+        id_aux: str = self._tablas.buscar("nodos", proposicion[0])
+        if id_aux:
+            self._id_ent1 = id_aux
+            # No se le asigna propiedades por defecto 
+            self._ent1_defecto = False                       
+        id_aux = self._tablas.buscar("nodos", proposicion[2])
+        if id_aux:
+            self._id_ent2 = id_aux
+            self._ent2_defecto = False
         # Si las entidades 1 o 2 no existen las registro en la tabla de nodos        
-        with open(self._csv_nodos,"a",newline="",encoding="utf-8") as nodos:
-            escritor = csv.writer(nodos, delimiter="§")
-            if self._id_ent1 == -1:
-                escritor.writerow([self._ultimo_id_nodo, proposicion[0]])
-                # Obtengo su id
-                self._id_ent1 = self._ultimo_id_nodo
-                # Previene que se registre dos veces la misma entidad
-                # la primera vez que se escribe
-                if proposicion[0] == proposicion[2]:
-                    self._id_ent2 = self._id_ent1
-                # Actualizo ultimo id nodos
-                self._ultimo_id_nodo += 1            
-            if self._id_ent2 == -1:
-                escritor.writerow([self._ultimo_id_nodo, proposicion[2]])
-                self._id_ent2 = self._ultimo_id_nodo
-                self._ultimo_id_nodo += 1
+        if self._id_ent1 == -1:
+            self._tablas.agregar("nodos", [self._ultimo_id_nodo, proposicion[0]])
+            # Obtengo su id
+            self._id_ent1 = self._ultimo_id_nodo
+            # Previene que se registre dos veces la misma entidad
+            # la primera vez que se escribe
+            if proposicion[0] == proposicion[2]:
+                self._id_ent2 = self._id_ent1
+            # Actualizo ultimo id nodos
+            self._ultimo_id_nodo += 1            
+        if self._id_ent2 == -1:
+            self._tablas.agregar("nodos", [self._ultimo_id_nodo, proposicion[2]])
+            self._id_ent2 = self._ultimo_id_nodo
+            self._ultimo_id_nodo += 1
 
     def _registrar_vertices(self, proposicion:list[str]) -> bool:
         """
@@ -245,31 +250,19 @@ class GestionTexto:
         :rtype: bool
         """
         # Verifico si el vértice ya está registrado y obtengo su id
-        with open(
-            self._csv_vertices, "r", newline="", encoding="utf-8"
-        ) as vertices:
-            registros = csv.DictReader(vertices, delimiter="§")
-            for registro in registros:
-                relacion_entrada:str = self._gestor.eliminar_justificado(proposicion[1])
-                rel_tabla:str = self._gestor.eliminar_justificado(registro["vertice"])
-                if rel_tabla == relacion_entrada:
-                    self._id_rel = registro["id"] 
-                    self._rel_defecto = False
-                    break
+        id_aux: str = self._tablas.buscar("vertices", proposicion[1])
+        if id_aux:
+            self._id_rel = id_aux 
+            self._rel_defecto = False
         # Si no existe
         if self._rel_defecto:            
             # Registro el vértice en la tabla y creo un nuevo id 
-            with open(
-                self._csv_vertices, "a", newline="", encoding="utf-8"
-            ) as vertices:
-                escritor = csv.writer(vertices, delimiter="§")
-                # El vértice no existe
-                if self._id_rel == -1:
-                    # Obtengo el últmo id
-                    self._id_rel = self._ultimo_id_vertice
-                    escritor.writerow([self._id_rel, proposicion[1]])
-                    # Actualizo último id vértices
-                    self._ultimo_id_vertice += 1
+            if self._id_rel == -1:
+                # Obtengo el últmo id
+                self._id_rel = self._ultimo_id_vertice
+                self._tablas.agregar("vertices", [self._id_rel, proposicion[1]])
+                # Actualizo último id vértices
+                self._ultimo_id_vertice += 1
         # El vértice ya existía
         else:        
             # Verifico si existe la proposición      
@@ -279,33 +272,26 @@ class GestionTexto:
                 "ent2" : str(self._id_ent2),
                 "peso" : proposicion[3]
             }        
-            with open(
-                self._csv_proposiciones, "r", newline="", encoding="utf-8"
-            ) as proposiciones:
-                registros = csv.DictReader(proposiciones, delimiter="§")
-                for registro in registros:
-                    if registro == prop_aux:                    
-                        # No se agragega porque ya existe
-                        return False
+            if self._tablas.existe_proposicion(prop_aux):
+                # No se agragega porque ya existe
+                return False
         return True
 
     def _agregar_nodo_a_tabla(self, id_nodo: int | str, valor: str) -> None:
         """
-        Antes de escribir, cambia los valores por defecto por los datos ingresados
-        y el id generado.
+        Registra el nodo con el id generado y el dato ingresado. El resto de
+        los atributos queda vacío, para que tome los valores por defecto del
+        grafo.
 
         :param id_nodo: El id del nodo a registrar. 
         :type id_nodo: int | str
         :param valor: El valor del nodo a registrar.
         :type valor: str
         """
-        comunes.atrb_nodos["id"] = id_nodo
-        comunes.atrb_nodos["label"] = valor
-        with open(
-            self._csv_prop_nodos, "a", newline="", encoding="utf-8"
-        ) as proposiciones:
-            escritor = csv.writer(proposiciones, delimiter="§")
-            escritor.writerow(comunes.atrb_nodos.values())
+        fila: dict[str, str] = dict.fromkeys(comunes.atrb_nodos, "")
+        fila["id"] = str(id_nodo)
+        fila["label"] = valor
+        self._tablas.agregar("propiedades_n", fila.values())
 
     def _registrar_propiedades(self, proposicion:list[str]) -> None:
         """
@@ -323,15 +309,7 @@ class GestionTexto:
             self._agregar_nodo_a_tabla(self._id_ent2, proposicion[2])
         # Relación
         if self._rel_defecto == True:
-            comunes.atrb_vertices["id"] = self._id_rel
-            comunes.atrb_vertices["label"] = proposicion[1]
-            with open(
-                self._csv_prop_vertices, "a", newline="", encoding="utf-8"
-            ) as proposiciones:
-                escritor = csv.writer(proposiciones, delimiter="§")    
-                escritor.writerow(comunes.atrb_vertices.values())
-        # Restablezco valores por defecto en los diccionarios de estilos
-        comunes.atrb_nodos["id"] = "-1"
-        comunes.atrb_nodos["label"] = ""
-        comunes.atrb_vertices["id"] = "-1"
-        comunes.atrb_vertices["label"] = ""
+            fila: dict[str, str] = dict.fromkeys(comunes.atrb_vertices, "")
+            fila["id"] = str(self._id_rel)
+            fila["label"] = proposicion[1]
+            self._tablas.agregar("propiedades_v", fila.values())
@@ -1,5 +1,4 @@
 import copy
-import csv
 import os
 import queue
 import sys
@@ -7,9 +6,9 @@ import platform
 import threading
 import tkinter as tk
 from pathlib import Path
-from typing import Callable, Any
+from typing import Callable, Any, Sized
 from aplicacion.interfaz import comunes
-from aplicacion.documentos import diagrama
+from aplicacion.documentos import almacenes, diagrama, tablas
 from aplicacion.control.ambitos import gestion_edicion, gestion_texto, gestion_proyecto
 from aplicacion.interfaz.componentes.areas import edicion, grafico, proyecto, texto
 
@@ -44,29 +43,45 @@ class Gestor:
         self._ruta_csv_vertices: Path = (Path(__file__).parent.parent / "documentos" / "recursos" / "vertices.csv").resolve()
         self._ruta_notas: Path = (Path(__file__).parent.parent / "documentos" / "recursos" / "notas_propias.txt").resolve()
         self._ruta_csv_nodos: Path = (Path(__file__).parent.parent / "documentos" / "recursos" / "nodos.csv").resolve()
+        self._ruta_base_de_datos: Path = (Path(__file__).parent.parent / "documentos" / "recursos" / comunes.base_de_datos).resolve()
+        self._ruta_bitacora: Path = (Path(__file__).parent.parent / "documentos" / "recursos" / comunes.bitacora).resolve()
         self._ruta_resultados: Path = (Path(__file__).parent.parent / "resultados").resolve()
         # Atributos generales del grafo
         self.cota: int = 25  # Long. máx. aprox. de líneas
         self.justificado: str = "n"  # Centrado
+        # Contenido de las tablas, compartido por los ámbitos de gestión
+        rutas_tablas: dict[str, Path] = {
+            "proposiciones": self._ruta_csv_proposiciones,
+            "nodos": self._ruta_csv_nodos,
+            "vertices": self._ruta_csv_vertices,
+            "propiedades_n": self._ruta_csv_propiedades_n,
+            "propiedades_v": self._ruta_csv_propiedades_v
+        }
+        almacen: almacenes.AlmacenSQLite | almacenes.Bitacora
+        if comunes.motor_tablas == "sqlite":
+            almacen = almacenes.AlmacenSQLite(
+                self._ruta_base_de_datos, rutas_tablas, self.eliminar_justificado
+            )
+        else:
+            # Las modificaciones se registran en la bitácora y las tablas
+            # se reescriben sólo al compactarla
+            almacen = almacenes.Bitacora(
+                almacenes.AlmacenCSV(rutas_tablas, self._ruta_base_de_datos),
+                self._ruta_bitacora
+            )
+        self._tablas: tablas.Tablas = tablas.Tablas(
+            almacen, self.eliminar_justificado
+        )
         # Ambitos de gestión
         self._gestion_texto: gestion_texto.GestionTexto = gestion_texto.GestionTexto(
-            self,
-            self._ruta_csv_proposiciones,
-            self._ruta_csv_nodos,
-            self._ruta_csv_vertices,
-            self._ruta_csv_propiedades_n,
-            self._ruta_csv_propiedades_v    
+            self, self._tablas
         )
         self._gestion_edicion: gestion_edicion.GestionEdicion = gestion_edicion.GestionEdicion(
-            self,
-            self._ruta_csv_proposiciones,
-            self._ruta_csv_nodos,
-            self._ruta_csv_vertices,
-            self._ruta_csv_propiedades_n,
-            self._ruta_csv_propiedades_v    
+            self, self._tablas
         )
         self._gestion_proyecto: gestion_proyecto.GestionProyecto  = gestion_proyecto.GestionProyecto(
             self,
+            self._tablas,
             self._ruta_csv_proposiciones,
             self._ruta_csv_nodos,
             self._ruta_csv_vertices,
@@ -81,6 +96,8 @@ class Gestor:
             val_def_nodos, val_def_vertices, val_def_grafo
         ]
         self.ruta_png: str = ""
+        self.imagen_png: bytes = b""  # Con comunes.diagrama_en_memoria
+        self.escena: dict = {}  # Con comunes.diagrama_en_lienzo
         # Colas para almacenar las tareas pendientes
         self._cola_texto: queue.Queue = queue.Queue()
         self._cola_grafico: queue.Queue = queue.Queue()
@@ -91,11 +108,22 @@ class Gestor:
         self._tarea_grafico: list[bool] = [False]
         self._tarea_edicion: list[bool] = [False]
         self._tarea_proyecto: list[bool] = [False]
+        # Vistas a actualizar cuando se genere el diagrama, propias del
+        # hilo que procesa cada cola
+        self._hilos: threading.local = threading.local()
+        # Generación en curso del diagrama: una nueva cancela la anterior
+        self._cerrojo_diagrama: threading.Lock = threading.Lock()
+        self._generacion: int = 0
+        self._diagramador_activo: diagrama.Diagramador | None = None
+        self._cola_diagrama_activo: queue.Queue | None = None
+        self._vistas_relegadas: list[tuple[str, str]] = []
         # Comunicacion entre hilo principal y tareas en segundo plano
         self.actualizar: threading.Event = threading.Event()
         self.cola_avisos: queue.Queue = queue.Queue()
         self._id_tarea_pendiente: str | None = None
         self._id_ocultar_avisos: str | None = None
+        # Mientras se extrae un texto, el observador verifica más seguido
+        self._extrayendo_texto: bool = False
         self._observador()
         self._ocultar_avisos()
 
@@ -126,34 +154,40 @@ class Gestor:
                 res = res+cadena[self.cota:indice]+f"\\{self.justificado}"
                 return res+self.acotar_cadena(cadena[indice:].strip())
             
-    def actualizar_elemento(
-        self, tipo: str, id_elem: str, cambios: dict[str, str]
+    def actualizar_elementos(
+        self, tipo: str, elementos: list[tuple[str, dict[str, str]]]
     ) -> bool: 
         """
-        Delega la operación al ámbito que gestiona las tareas de edición.
+        Delega la operación al ámbito que gestiona las tareas de edición,
+        que aplica los cambios de todos los elementos en un solo lote.
         
         :param tipo: Un indicador del tipo de elemento.
         :type tipo: str
-        :param id_elem: El id del elemento.
-        :type id_elem: str
-        :param cambios: Las modificaciones en los atributos del elemento.
-        :type cambios: dict[str, str]
+        :param elementos: El id de cada elemento y las modificaciones en sus atributos.
+        :type elementos: list[tuple[str, dict[str, str]]]
         :return: La confirmación de que se inició la tarea.
         :rtype: bool
         """
+        ids: str = ", ".join(id_elem for id_elem, _ in elementos)
         if tipo == "nodo":
-            aux_aviso: str = f"Aplicando los cambios al nodo con ID: {id_elem}..."
+            aux_aviso: str = f"Aplicando los cambios al nodo con ID: {ids}..."
+            if len(elementos) > 1:
+                aux_aviso = f"Aplicando los cambios a los nodos con ID: {ids}..."
             self._edicion.mostrar_aviso_nodo(aux_aviso)
         else:
-            aux_aviso = f"Aplicando los cambios al vértice con ID: {id_elem}..."
+            aux_aviso = f"Aplicando los cambios al vértice con ID: {ids}..."
+            if len(elementos) > 1:
+                aux_aviso = f"Aplicando los cambios a los vértices con ID: {ids}..."
             self._edicion.mostrar_aviso_vertice(aux_aviso)
+        operaciones: list[tuple[str, tuple]] = [
+            ("elemento", (tipo, id_elem, cambios))
+            for id_elem, cambios in elementos
+        ]
         self._encolar_tarea(
-            self._gestion_edicion.modificar_elemento,
+            self._gestion_edicion.aplicar_lote,
             self._cola_grafico,
             self._tarea_grafico,
-            tipo,
-            id_elem,
-            cambios
+            operaciones
         )
         return True
     
@@ -178,28 +212,16 @@ class Gestor:
         else:
             return False
 
-    def borrar_de_tabla(self, ruta_tabla: Path, id_elemento: str) -> None:
+    def borrar_de_tabla(self, tabla: str, id_elemento: str) -> None:
         """
         Elimina el elemento indicado de la tabla recibida.
             
-        :param ruta_tabla: La ruta a la tabla.
-        :type ruta_tabla: Path
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
         :param id_elemento: El id del elemento
         :type id_elemento: str         
         """
-        # Obtengo el índice de la fila del registro a borrar
-        with open(ruta_tabla, "r", newline="", encoding="utf-8") as tabla:
-            registros = tabla.readlines()
-            indice_fila: int = 1        
-            for registro in registros[1:]:
-                l_aux: list[str] = registro.split(chr(167))
-                if l_aux[0] == id_elemento:
-                    break
-                indice_fila += 1
-        del registros[indice_fila]
-        # Escribo todas menos la fila eliminada
-        with open(ruta_tabla, "w", newline="", encoding="utf-8") as archivo:
-            archivo.writelines(registros)
+        self._tablas.borrar(tabla, id_elemento)
 
     def borrar_ultimo_ingreso(self) -> None:
         """
@@ -290,19 +312,26 @@ class Gestor:
         res = res.replace("\\r", " ")
         return res
 
-    def eliminar_relacion(self, id_rel: str) -> None:
+    def eliminar_relaciones(self, ids_rel: list[str]) -> None:
         """
-        Delega la operación al ámbito que gestiona las tareas de edición.
+        Delega la operación al ámbito que gestiona las tareas de edición,
+        que elimina todas las relaciones en un solo lote.
 
-        :param id_rel: El índice de la fila a eliminar de la tabla de proposiciones.
-        :type id_rel: str
+        :param ids_rel: Los índices de las filas a eliminar de la tabla de proposiciones.
+        :type ids_rel: list[str]
         """
         self._edicion.mostrar_aviso_relacion("Actualizando relaciones...")
+        # Las relaciones se identifican por su posición: elimino primero
+        # las últimas para no desplazar a las restantes
+        operaciones: list[tuple[str, tuple]] = [
+            ("relacion", (id_rel,))
+            for id_rel in sorted(ids_rel, key=int, reverse=True)
+        ]
         self._encolar_tarea(
-            self._gestion_edicion.borrar_relacion,
+            self._gestion_edicion.aplicar_lote,
             self._cola_edicion,
             self._tarea_edicion,
-            id_rel
+            operaciones
         )
 
     def eliminar_respaldo(self) -> None: 
@@ -409,6 +438,26 @@ class Gestor:
             directorio
         )
 
+    def graficar(self, area: str, aviso: str = "") -> None:
+        """
+        Genera el diagrama y avisa al área indicada para que actualice la
+        vista. Si la tarea que lo solicita se ejecuta en segundo plano y hay
+        otras pendientes en su cola, el diagrama se genera una sola vez,
+        cuando se termina de procesar la última.
+
+        :param area: El área cuya vista se actualiza.
+        :type area: str
+        :param aviso: La notificación que acompaña a la actualización.
+        :type aviso: str
+        """
+        pendientes: list[tuple[str, str]] | None = getattr(
+            self._hilos, "pendientes", None
+        )
+        if pendientes is None:
+            self._generar_diagrama([(area, aviso)])
+        elif (area, aviso) not in pendientes:
+            pendientes.append((area, aviso))
+
     def guardar_notas(self, texto: str) -> None:
         """
         Escribe el contenido de las notas tomadas eun un txt, permitiendo
@@ -448,6 +497,22 @@ class Gestor:
             self._tarea_proyecto,
         )
 
+    def importar_proposiciones(self, ruta: str) -> None:
+        """
+        Registra las proposiciones del archivo seleccionado. Delega la
+        operación al ámbito que gestiona las tareas de texto.
+
+        :param ruta: La ruta al archivo (.csv, .tsv o .json).
+        :type ruta: str
+        """
+        self._proyecto.mostrar_aviso("Importando las proposiciones...")
+        self._encolar_tarea(
+            self._gestion_texto.importar,
+            self._cola_grafico,
+            self._tarea_grafico,
+            ruta
+        )
+
     def lista_ids(self, elem: str) -> list[str]:
         """
         Retorna una lista con los id de los elementos registrados, ayudando
@@ -474,13 +539,11 @@ class Gestor:
         """
         res: list[str] = []
         if tipo == "nodo":
-            tabla = self._ruta_csv_nodos
+            tabla: str = "nodos"
         else:
-            tabla = self._ruta_csv_vertices            
-        with open(tabla, "r", newline="", encoding="utf-8") as archivo:
-            registros = csv.DictReader(archivo, delimiter="§")
-            for registro in registros:
-                res.append(registro[tipo])
+            tabla = "vertices"            
+        for registro in self._tablas.registros(tabla):
+            res.append(registro[tipo])
         return res
 
     def nodos_existentes(self) -> dict[str, str | None]:
@@ -535,10 +598,29 @@ class Gestor:
             ruta
         )
         if ruta:
+            # Adelanto la verificación para mostrar pronto la primera página
+            self._extrayendo_texto = True
+            if not self._id_tarea_pendiente is None:
+                self._raiz.after_cancel(self._id_tarea_pendiente)
+            self._id_tarea_pendiente = self._raiz.after(100, self._observador)
             return "Cargando texto..."
         else:
             return ""
 
+    def registrar_diagrama(self, diagrama: str | bytes | dict) -> None:
+        """
+        Conserva el último diagrama generado, para volver a mostrarlo.
+
+        :param diagrama: La escena, el contenido de la imagen o la ruta al archivo.
+        :type diagrama: str | bytes | dict
+        """
+        if isinstance(diagrama, dict):
+            self.escena = diagrama
+        elif isinstance(diagrama, bytes):
+            self.imagen_png = diagrama
+        else:
+            self.ruta_png = diagrama
+
     def reiniciar(self) -> None:
         """
         Reinicia la aplicación.
@@ -592,37 +674,54 @@ class Gestor:
         """
         with open(self._ruta_notas, "w", newline="", encoding="utf-8") as notas:
             pass
-        with open(
-            self._ruta_csv_proposiciones, "w", newline="", encoding="utf-8"
-        ) as proposiciones:
-            escritor = csv.writer(proposiciones, delimiter="§")
-            escritor.writerow(["ent1", "rel", "ent2", "peso"])    
-        with open(self._ruta_csv_nodos, "w", newline="", encoding="utf-8") as nodos:
-            escritor = csv.writer(nodos, delimiter="§")
-            escritor.writerow(["id", "nodo"])
-        with open(
-            self._ruta_csv_vertices, "w", newline="", encoding="utf-8"
-        ) as vertices:
-            escritor = csv.writer(vertices, delimiter="§")
-            escritor.writerow(["id", "vertice"])
-        with open(
-            self._ruta_csv_propiedades_n, "w", newline="", encoding="utf-8"
-        ) as propiedades_n:
-            escritor = csv.writer(propiedades_n, delimiter="§")
-            encabezado = list(comunes.atrb_nodos.keys())
-            escritor.writerow(encabezado)
-        with open(
-            self._ruta_csv_propiedades_v, "w", newline="", encoding="utf-8"
-        ) as propiedades_v:
-            escritor = csv.writer(propiedades_v, delimiter="§")
-            encabezado = list(comunes.atrb_vertices.keys())
-            escritor.writerow(encabezado)
+        self._tablas.vaciar({
+            "proposiciones": ["ent1", "rel", "ent2", "peso"],
+            "nodos": ["id", "nodo"],
+            "vertices": ["id", "vertice"],
+            "propiedades_n": list(comunes.atrb_nodos.keys()),
+            "propiedades_v": list(comunes.atrb_vertices.keys())
+        })
         for archivo in os.listdir(self._ruta_resultados):
             ruta_archivo = os.path.join(self._ruta_resultados, archivo)
             if os.path.isfile(ruta_archivo):
                 os.remove(ruta_archivo)
         self._gestion_proyecto.eliminar_estados_temporales()
 
+    def separar_ids(self, cadena: str, existentes: Sized) -> list[str]:
+        """
+        Obtiene los ids ingresados en las secciones de edición, que pueden
+        ser varios separados por comas o espacios, o rangos como "3-7". Si
+        algún valor no es válido retorna una lista vacía: también si un
+        rango está invertido o si se ingresan más ids que los elementos
+        existentes, que no podrían existir todos.
+
+        :param cadena: El texto ingresado.
+        :type cadena: str
+        :param existentes: Los elementos registrados de la sección.
+        :type existentes: Sized
+        :return: Los ids, sin repetir y en el orden ingresado.
+        :rtype: list[str]
+        """
+        # Un diccionario conserva el orden y descarta los repetidos
+        res: dict[str, None] = {}
+        for valor in cadena.replace(",", " ").split():
+            inicio, guion, fin = valor.partition("-")
+            if not inicio.isdigit() or (guion and not fin.isdigit()):
+                return []
+            if not guion:
+                fin = inicio
+            if int(fin) < int(inicio):
+                return []
+            # El rango se valida antes de recorrerlo, para no expandir
+            # uno enorme en el hilo de la interfaz
+            if int(fin) - int(inicio) + 1 > len(existentes):
+                return []
+            for i in range(int(inicio), int(fin) + 1):
+                res[str(i)] = None
+            if len(res) > len(existentes):
+                return []
+        return list(res)
+
     def vertices_existentes(self) -> dict[str, list[list[str | None]]]:
         """
         Retorna las proposiciones agrupadas por el vértice que las vincula.
@@ -633,7 +732,9 @@ class Gestor:
         """
         return self._gestion_edicion.vertices_registrados()
         
-    def _actualizar_imagen(self, area:str, aviso:str) -> None:
+    def _actualizar_imagen(
+        self, area:str, aviso:str, imagen: str | bytes | dict = ""
+    ) -> None:
         """
         Actualiza el artefacto que muestra el diagrama y oculta
         los avisos que indicaban el inicio de las operaciones que
@@ -644,39 +745,62 @@ class Gestor:
         :type area: str
         :param aviso: El contenido del aviso.
         :type aviso: str
+        :param imagen: El diagrama generado, si la notificación lo incluye.
+        :type imagen: str | bytes | dict
         """
+        if not imagen:
+            imagen = self._diagrama_actual()
         if area == "texto":
             if aviso:
                 self._texto.mostrar_aviso(aviso)
             else:
                 # Solo se actualiza la imagen cuando el aviso es vacío
-                self._grafico.cargar_imagen(self.ruta_png)
+                self._grafico.cargar_imagen(imagen)
                 self._edicion.volver_a_cargar_nodos()
                 self._edicion.volver_a_cargar_vertices()
                 self._edicion.volver_a_cargar_relaciones()
                 self._texto.ocultar_aviso()
         elif area.startswith("e"):
             self._grafico.actualizar_cuadro()
-            self._grafico.cargar_imagen(self.ruta_png)
-            if area.endswith("g"):
+            self._grafico.cargar_imagen(imagen)
+            # Un lote de ediciones puede afectar a varias secciones
+            secciones: str = area.partition("_")[2]
+            if "g" in secciones:
                 self._edicion.ocultar_aviso_grafo()
-            elif area.endswith("r"):    
+            if "r" in secciones:    
                 self._edicion.volver_a_cargar_relaciones()
                 self._edicion.ocultar_aviso_relacion()
-            elif area.endswith("v"):
+            if "v" in secciones:
                 self._edicion.ocultar_aviso_nodo()
                 self._edicion.ocultar_aviso_vertice()
         elif area.startswith("p"):
+            if area.endswith("i"):  # Proposiciones importadas
+                self._grafico.cargar_imagen(imagen)
+                self._edicion.volver_a_cargar_nodos()
+                self._edicion.volver_a_cargar_vertices()
+                self._edicion.volver_a_cargar_relaciones()
             if aviso:
                 self._proyecto.mostrar_aviso(aviso)
             else:
                 self._proyecto.ocultar_aviso()
 
-    def _actualizar_texto(self, texto: str) -> None:
+    def _actualizar_texto(
+        self, texto: str, agregar: bool = False, final: bool = True
+    ) -> None:
         """
         Ubica el contenido extraído en el artefacto de texto desplazable.
-        """
-        self._texto.cargar_texto_retornado(texto)
+
+        :param texto: La parte del contenido extraída.
+        :type texto: str
+        :param agregar: Si es verdadero, se agrega al final del contenido previo.
+        :type agregar: bool
+        :param final: Si es verdadero, la extracción terminó.
+        :type final: bool
+        """
+        if texto or not agregar:
+            self._texto.cargar_texto_retornado(texto, agregar)
+        if final:
+            self._extrayendo_texto = False
 
     def _borrar_ultima_proposicion(self, *args) -> None:
         """
@@ -685,67 +809,44 @@ class Gestor:
         captura la tupla vacía que recibe cuando es llamado para que se
         ejecute en segundo plano.
         """
+        # Previene que se borre el encabezado
+        if self._tablas.cantidad("proposiciones") == 0:
+            self.cola_avisos.put(("img","texto","No hay más proposiciones"))
+            self.actualizar.set()
+            return
         # Borra la última fila de la tabla de proposiciones       
-        with open(
-            self._ruta_csv_proposiciones, "r", newline="", encoding="utf-8"
-        ) as proposiciones:
-            registros = proposiciones.readlines()
-            # Previene que se borre el encabezado
-            if len(registros) == 1:
-                self.cola_avisos.put(("img","texto","No hay más proposiciones"))
-                self.actualizar.set()
-                return
-        # Escribir todas menos la última
-        with open(
-            self._ruta_csv_proposiciones, "w", newline="", encoding="utf-8"
-        ) as archivo:
-            archivo.writelines(registros[:-1])
-        # Obtengo los ids
-        l_aux: list[str] = registros[-1].split(chr(167))
-        ids: dict={}
-        ids["ent1"] = l_aux[0]
-        ids["rel"] = l_aux[1]      
-        ids["ent2"] = l_aux[2].replace("\r\n", "")            
-        # Identifico los elementos a borrar
-        borrar_ent1: bool = True
-        borrar_rel: bool = True
-        borrar_ent2: bool = True
-        for registro in registros[1:-1]:
-            salir: bool = (
-                not borrar_ent1 and not borrar_rel and not borrar_ent2
-            )
-            if salir:
-                break
-            l_aux = registro.split(chr(167))
-            cond: bool = False
-            if borrar_ent1:
-                cond = (ids["ent1"] in l_aux[0] or ids["ent1"] in l_aux[2])
-                if cond:
-                    borrar_ent1 = False
-            if borrar_rel:
-                cond = ids["rel"] in l_aux[1]
-                if cond:
-                    borrar_rel = False
-            if borrar_ent2:
-                cond = (ids["ent2"] in l_aux[0] or ids["ent2"] in l_aux[2])
-                if cond:
-                    borrar_ent2 = False
+        ids: dict[str, str] = self._tablas.borrar_fila("proposiciones", -1)
+        # Identifico los elementos que quedaron sin referencias
+        borrar_ent1: bool = self._tablas.referencias("nodos", ids["ent1"]) == 0
+        borrar_rel: bool = self._tablas.referencias("vertices", ids["rel"]) == 0
+        borrar_ent2: bool = self._tablas.referencias("nodos", ids["ent2"]) == 0
         # Borro los nodos y/o relaciones aisladas
         if borrar_ent1:
-            self.borrar_de_tabla(self._ruta_csv_nodos, ids["ent1"])
-            self.borrar_de_tabla(self._ruta_csv_propiedades_n, ids["ent1"])
+            self.borrar_de_tabla("nodos", ids["ent1"])
+            self.borrar_de_tabla("propiedades_n", ids["ent1"])
         if borrar_rel:
-            self.borrar_de_tabla(self._ruta_csv_vertices, ids["rel"])
-            self.borrar_de_tabla(self._ruta_csv_propiedades_v, ids["rel"])
+            self.borrar_de_tabla("vertices", ids["rel"])
+            self.borrar_de_tabla("propiedades_v", ids["rel"])
         if borrar_ent2:
             if ids["ent2"] != ids["ent1"]:
-                self.borrar_de_tabla(self._ruta_csv_nodos, ids["ent2"])
-                self.borrar_de_tabla(self._ruta_csv_propiedades_n, ids["ent2"])           
-        # Obtengo la ruta al grafo generado
-        diagramador = diagrama.Diagramador()
-        self.ruta_png = diagramador.crear_grafo()
-        self.cola_avisos.put(("img","texto",""))
-        self.actualizar.set()
+                self.borrar_de_tabla("nodos", ids["ent2"])
+                self.borrar_de_tabla("propiedades_n", ids["ent2"])           
+        self.graficar("texto")
+
+    def _diagrama_actual(self) -> str | bytes | dict:
+        """
+        Obtiene el último diagrama generado: la escena si se dibuja en el
+        lienzo, su contenido si se recibe en memoria o la ruta al archivo
+        en caso contrario.
+
+        :return: El diagrama a mostrar.
+        :rtype: str | bytes | dict
+        """
+        if comunes.diagrama_en_lienzo:
+            return self.escena
+        if comunes.diagrama_en_memoria:
+            return self.imagen_png
+        return self.ruta_png
 
     def _encolar_tarea(
         self,
@@ -767,6 +868,14 @@ class Gestor:
         :param args: Los argumentos de los métodos llamados.
         """
         cola.put((llamada, args))
+        # El diagrama que se está generando para esta cola quedará
+        # desactualizado: se vuelve a generar al terminar la nueva tarea
+        with self._cerrojo_diagrama:
+            if (
+                self._diagramador_activo is not None
+                and self._cola_diagrama_activo is cola
+            ):
+                self._diagramador_activo.cancelar()
         if not var_control[0]:
             var_control[0] = True
             threading.Thread(
@@ -782,14 +891,63 @@ class Gestor:
         :return: El resultado de la verificación.
         :rtype: bool
         """      
-        with open(
-            self._ruta_csv_proposiciones, "r", newline="", encoding="utf-8"
-        ) as proposiciones:
-            registros = proposiciones.readlines()
-            if len(registros) == 1:
-                return False
+        return self._tablas.cantidad("proposiciones") > 0
+
+    def _generar_diagrama(
+        self,
+        vistas: list[tuple[str, str]],
+        cola: queue.Queue | None = None
+    ) -> bool:
+        """
+        Genera el diagrama y notifica a las áreas cuyas vistas deben
+        actualizarse. Cancela la generación que esté en curso, cuyo
+        resultado ya no refleja las tablas. Si a su vez ésta es cancelada
+        por una más reciente, no modifica la ruta del diagrama y deja
+        las notificaciones a cargo de la nueva.
+
+        :param vistas: El área y el aviso de cada notificación.
+        :type vistas: list[tuple[str, str]]
+        :param cola: La cola de tareas que solicita el diagrama, si la hay.
+        :type cola: queue.Queue | None
+        :return: Falso si se canceló porque llegó una tarea a su cola.
+        :rtype: bool
+        """
+        diagramador = diagrama.Diagramador(self._tablas)
+        with self._cerrojo_diagrama:
+            self._generacion += 1
+            generacion: int = self._generacion
+            if self._diagramador_activo is not None:
+                self._diagramador_activo.cancelar()
+            self._diagramador_activo = diagramador
+            self._cola_diagrama_activo = cola
+        try:
+            resultado: str | bytes | dict = diagramador.generar()
+        except Exception:
+            with self._cerrojo_diagrama:
+                if generacion == self._generacion:
+                    self._diagramador_activo = None
+                    self._cola_diagrama_activo = None
+            raise
+        with self._cerrojo_diagrama:
+            if generacion != self._generacion:
+                if self._diagramador_activo is not None:
+                    # La generación más reciente entregará las notificaciones
+                    self._vistas_relegadas.extend(vistas)
+                    return True
+                # La más reciente ya terminó y refleja estos cambios
             else:
-                return True
+                self._diagramador_activo = None
+                self._cola_diagrama_activo = None
+                if not resultado:
+                    return False
+                self.registrar_diagrama(resultado)
+                vistas = self._vistas_relegadas + vistas
+                self._vistas_relegadas = []
+            imagen: str | bytes | dict = self._diagrama_actual()
+        for area, aviso in vistas:
+            self.cola_avisos.put(("img", area, aviso, imagen))
+        self.actualizar.set()
+        return True
 
     def _guardar_en_segundo_plano(self, *args) -> None:
         """
@@ -835,13 +993,14 @@ class Gestor:
                 while True:
                     señal = self.cola_avisos.get_nowait()
                     if señal[0] == "img":
-                        self._actualizar_imagen(señal[1], señal[2])
+                        self._actualizar_imagen(*señal[1:])
                     if señal[0] == "txt":
-                        self._actualizar_texto(señal[1])
+                        self._actualizar_texto(*señal[1:])
             except queue.Empty:
                 self.actualizar.clear()
         # Programo la próxima verificación
-        self._id_tarea_pendiente = self._raiz.after(1000, self._observador)
+        espera: int = 100 if self._extrayendo_texto else 1000
+        self._id_tarea_pendiente = self._raiz.after(espera, self._observador)
                                # reducir a medio segundo
 
     def _ocultar_avisos(self) -> None:
@@ -869,6 +1028,9 @@ class Gestor:
         :param var_control: Una variable de control mutable.
         :type var_control: list[bool]
         """
+        # Las tareas que modifican el diagrama sólo registran qué vistas
+        # actualizar: se genera una vez, cuando no quedan tareas pendientes
+        self._hilos.pendientes = []
         while not cola.empty():
             try:
                 tarea: tuple[Callable, Any] = cola.get()
@@ -878,4 +1040,13 @@ class Gestor:
                 cola.task_done()
             except Exception as e:
                 print(f"Error en la tarea: {e}")
+            if self._hilos.pendientes and cola.empty():
+                vistas: list[tuple[str, str]] = self._hilos.pendientes
+                self._hilos.pendientes = []
+                try:
+                    if not self._generar_diagrama(vistas, cola):
+                        # Se generará al terminar la tarea que lo canceló
+                        self._hilos.pendientes = vistas
+                except Exception as e:
+                    print(f"Error al generar el diagrama: {e}")
         var_control[0] = False
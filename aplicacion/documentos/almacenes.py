@@ -0,0 +1,927 @@
+import bisect
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, TextIO
+
+"""
+Módulo que contiene los motores de almacenamiento de las tablas del
+diagrama. Ambos reciben las mismas operaciones de la clase Tablas, que
+mantiene el contenido en memoria, y se ocupan sólo de persistirlo: uno en
+los archivos .csv delimitados por '§' y el otro en una base de datos SQLite.
+Al abrir un proyecto guardado con el otro motor, migran su contenido.
+La bitácora puede anteponerse a cualquiera de los dos.
+"""
+
+
+class AlmacenCSV:
+    """
+    Clase encargada de persistir las tablas en archivos .csv. En la
+    aplicación se usa siempre detrás de la Bitacora, que registra cada
+    modificación y sólo le pide volcar las tablas completas al compactarse.
+    Las filas agregadas se escriben al final del archivo; cualquier otra
+    modificación lo reescribe.
+
+    :param rutas: La ruta al archivo de cada tabla.
+    :type rutas: dict[str, Path]
+    :param base_de_datos: La ruta a la base de datos de la que migrar las tablas, si existe.
+    :type base_de_datos: Path
+    """
+
+    def __init__(self, rutas: dict[str, Path], base_de_datos: Path):
+        self.nombres: list[str] = list(rutas.keys())
+        self._rutas: dict[str, Path] = rutas
+        self._base_de_datos: Path = base_de_datos
+        self._encabezados: dict[str, list[str]] = {}
+
+    def agregar(self, tabla: str, filas: list[dict[str, str] | None]) -> None:
+        """
+        Escribe al final del archivo la última fila de la tabla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str] | None]
+        """
+        with open(self._rutas[tabla], "a", newline="", encoding="utf-8") as archivo:
+            self._escribir(archivo, tabla, [filas[-1]])
+
+    def cerrar(self) -> None:
+        """
+        No mantiene archivos abiertos entre operaciones.
+        """
+        pass
+
+    def editar(
+        self, tabla: str, posicion: int, filas: list[dict[str, str] | None]
+    ) -> None:
+        """
+        Reescribe el archivo con la fila modificada.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila.
+        :type posicion: int
+        :param filas: Las filas de la tabla, con None en las eliminadas.
+        :type filas: list[dict[str, str] | None]
+        """
+        self.volcar(
+            tabla,
+            self._encabezados[tabla],
+            [fila for fila in filas if fila is not None]
+        )
+
+    def leer(self, tabla: str) -> tuple[list[str], list[dict[str, str]]]:
+        """
+        Lee la tabla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: El encabezado y las filas de la tabla.
+        :rtype: tuple[list[str], list[dict[str, str]]]
+        """
+        if self._base_de_datos.is_file():
+            self._migrar()
+        encabezado, filas = leer_csv(self._rutas[tabla])
+        self._encabezados[tabla] = encabezado
+        return encabezado, filas
+
+    def quitar(
+        self, tabla: str, posicion: int, filas: list[dict[str, str] | None]
+    ) -> None:
+        """
+        Reescribe el archivo sin la fila eliminada.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila eliminada.
+        :type posicion: int
+        :param filas: Las filas de la tabla, con None en las eliminadas.
+        :type filas: list[dict[str, str] | None]
+        """
+        self.volcar(
+            tabla,
+            self._encabezados[tabla],
+            [fila for fila in filas if fila is not None]
+        )
+
+    def sincronizar(self) -> None:
+        """
+        Los archivos están al día luego de cada operación.
+        """
+        pass
+
+    def volcar(
+        self, tabla: str, encabezado: list[str], filas: list[dict[str, str]]
+    ) -> None:
+        """
+        Escribe en el archivo el contenido completo de la tabla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param encabezado: Las columnas de la tabla.
+        :type encabezado: list[str]
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str]]
+        """
+        self._encabezados[tabla] = list(encabezado)
+        # Escribo en un archivo temporal y lo reemplazo, para que una
+        # interrupción no deje la tabla a medio escribir
+        ruta: Path = self._rutas[tabla]
+        temporal: Path = ruta.with_name(ruta.name + ".tmp")
+        with open(temporal, "w", newline="", encoding="utf-8") as archivo:
+            csv.writer(archivo, delimiter="§").writerow(encabezado)
+            self._escribir(archivo, tabla, filas)
+        os.replace(temporal, ruta)
+
+    def _escribir(
+        self, archivo: TextIO, tabla: str, filas: list[dict[str, str] | None]
+    ) -> None:
+        """
+        Escribe las filas en el archivo, en el orden del encabezado.
+
+        :param archivo: El archivo abierto.
+        :type archivo: TextIO
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param filas: Las filas a escribir.
+        :type filas: list[dict[str, str] | None]
+        """
+        encabezado: list[str] = self._encabezados[tabla]
+        csv.writer(archivo, delimiter="§").writerows(
+            [fila.get(c, "") for c in encabezado]
+            for fila in filas if fila is not None
+        )
+
+    def _migrar(self) -> None:
+        """
+        Escribe en los archivos .csv las tablas de la base de datos de un
+        proyecto guardado con el motor SQLite y luego la elimina.
+        """
+        conexion = sqlite3.connect(self._base_de_datos)
+        try:
+            for tabla in self.nombres:
+                encabezado, filas = leer_sqlite(conexion, tabla)
+                self.volcar(tabla, encabezado, filas)
+        finally:
+            conexion.close()
+        eliminar_base_de_datos(self._base_de_datos)
+
+
+class AlmacenSQLite:
+    """
+    Clase encargada de persistir las tablas en una única base de datos
+    SQLite, en modo WAL para que las tareas en segundo plano puedan leerla
+    mientras otra escribe. Cada tabla conserva el orden de sus filas en la
+    columna 'orden' y tiene índices sobre el id, el texto normalizado de
+    nodos y vértices y la terna (ent1, rel, ent2) de las proposiciones.
+
+    :param base_de_datos: La ruta a la base de datos.
+    :type base_de_datos: Path
+    :param rutas: La ruta a los .csv de cada tabla, de los que migrar los proyectos guardados con el otro motor.
+    :type rutas: dict[str, Path]
+    :param normalizar: Quita el justificado del texto de nodos y vértices.
+    :type normalizar: Callable[[str], str]
+    """
+
+    def __init__(
+        self,
+        base_de_datos: Path,
+        rutas: dict[str, Path],
+        normalizar: Callable[[str], str]
+    ):
+        self.nombres: list[str] = list(rutas.keys())
+        self._base_de_datos: Path = base_de_datos
+        self._rutas: dict[str, Path] = rutas
+        self._normalizar: Callable[[str], str] = normalizar
+        self._conexion: sqlite3.Connection | None = None
+        self._encabezados: dict[str, list[str]] = {}
+        # Valor de 'orden' de cada fila, en el orden de la tabla en memoria
+        self._ordenes: dict[str, list[int]] = {}
+        # Columnas de texto que se indexan normalizadas
+        self._columnas_texto: dict[str, str] = {
+            "nodos": "nodo", "vertices": "vertice"
+        }
+
+    def agregar(self, tabla: str, filas: list[dict[str, str] | None]) -> None:
+        """
+        Inserta la última fila de la tabla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str] | None]
+        """
+        conexion: sqlite3.Connection = self._conectar()
+        columnas: list[str] = self._columnas(tabla)
+        with conexion:
+            cursor = conexion.execute(
+                f'INSERT INTO "{tabla}" ({self._lista(columnas)}) '
+                f'VALUES ({", ".join("?" * len(columnas))})',
+                self._valores(tabla, filas[-1])
+            )
+        self._ordenes[tabla].append(int(cursor.lastrowid or 0))
+
+    def cerrar(self) -> None:
+        """
+        Cierra la conexión, por ejemplo antes de reemplazar el archivo de
+        la base de datos al cargar un proyecto.
+        """
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+    def editar(
+        self, tabla: str, posicion: int, filas: list[dict[str, str] | None]
+    ) -> None:
+        """
+        Actualiza la fila modificada.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila.
+        :type posicion: int
+        :param filas: Las filas de la tabla, con None en las eliminadas.
+        :type filas: list[dict[str, str] | None]
+        """
+        conexion: sqlite3.Connection = self._conectar()
+        asignaciones: str = ", ".join(
+            f'"{c}" = ?' for c in self._columnas(tabla)
+        )
+        with conexion:
+            conexion.execute(
+                f'UPDATE "{tabla}" SET {asignaciones} WHERE orden = ?',
+                self._valores(tabla, filas[posicion])
+                + [self._ordenes[tabla][posicion]]
+            )
+
+    def leer(self, tabla: str) -> tuple[list[str], list[dict[str, str]]]:
+        """
+        Lee la tabla. Si encuentra los .csv de un proyecto guardado con el
+        otro motor, primero migra su contenido.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: El encabezado y las filas de la tabla.
+        :rtype: tuple[list[str], list[dict[str, str]]]
+        """
+        if any(ruta.is_file() for ruta in self._rutas.values()):
+            self._migrar()
+        conexion: sqlite3.Connection = self._conectar()
+        if tabla not in self._encabezados:
+            # La base de datos es nueva: la tabla se crea al vaciarla
+            self._ordenes[tabla] = []
+            return [], []
+        encabezado, filas = leer_sqlite(conexion, tabla)
+        self._ordenes[tabla] = self._leer_ordenes(conexion, tabla)
+        return encabezado, filas
+
+    def quitar(
+        self, tabla: str, posicion: int, filas: list[dict[str, str] | None]
+    ) -> None:
+        """
+        Elimina la fila de la posición indicada. Su valor de 'orden' se
+        conserva, como la fila anulada en Tablas, hasta el próximo volcado.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila eliminada.
+        :type posicion: int
+        :param filas: Las filas de la tabla, con None en las eliminadas.
+        :type filas: list[dict[str, str] | None]
+        """
+        conexion: sqlite3.Connection = self._conectar()
+        with conexion:
+            conexion.execute(
+                f'DELETE FROM "{tabla}" WHERE orden = ?',
+                (self._ordenes[tabla][posicion],)
+            )
+
+    def sincronizar(self) -> None:
+        """
+        Traslada el registro WAL a la base de datos, para que el archivo
+        pueda copiarse por sí solo al guardar el proyecto.
+        """
+        if self._conexion is not None:
+            self._conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def volcar(
+        self, tabla: str, encabezado: list[str], filas: list[dict[str, str]]
+    ) -> None:
+        """
+        Reemplaza el contenido completo de la tabla. Si cambiaron las
+        columnas, vuelve a crearla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param encabezado: Las columnas de la tabla.
+        :type encabezado: list[str]
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str]]
+        """
+        conexion: sqlite3.Connection = self._conectar()
+        with conexion:
+            if self._encabezados.get(tabla) != list(encabezado):
+                self._encabezados[tabla] = list(encabezado)
+                self._crear_tabla(conexion, tabla)
+            conexion.execute(f'DELETE FROM "{tabla}"')
+            columnas: list[str] = self._columnas(tabla)
+            conexion.executemany(
+                f'INSERT INTO "{tabla}" ({self._lista(columnas)}) '
+                f'VALUES ({", ".join("?" * len(columnas))})',
+                [self._valores(tabla, fila) for fila in filas]
+            )
+        self._ordenes[tabla] = self._leer_ordenes(conexion, tabla)
+
+    def _columnas(self, tabla: str) -> list[str]:
+        """
+        Retorna las columnas que se escriben en la tabla: las del
+        encabezado y, en nodos y vértices, el texto normalizado.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: Los nombres de las columnas.
+        :rtype: list[str]
+        """
+        columnas: list[str] = list(self._encabezados[tabla])
+        if tabla in self._columnas_texto:
+            columnas.append("normalizado")
+        return columnas
+
+    def _conectar(self) -> sqlite3.Connection:
+        """
+        Retorna la conexión a la base de datos y la abre si es necesario.
+        Las operaciones llegan desde distintos hilos, pero la clase Tablas
+        las serializa.
+
+        :return: La conexión.
+        :rtype: sqlite3.Connection
+        """
+        if self._conexion is None:
+            self._conexion = sqlite3.connect(
+                self._base_de_datos, check_same_thread=False
+            )
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._encabezados = {}
+            for tabla in self.nombres:
+                columnas: list[str] = [
+                    c[1] for c in self._conexion.execute(
+                        f'PRAGMA table_info("{tabla}")'
+                    ) if c[1] not in ("orden", "normalizado")
+                ]
+                if columnas:
+                    self._encabezados[tabla] = columnas
+        return self._conexion
+
+    def _crear_tabla(self, conexion: sqlite3.Connection, tabla: str) -> None:
+        """
+        Crea la tabla y sus índices, reemplazándola si ya existía.
+
+        :param conexion: La conexión a la base de datos.
+        :type conexion: sqlite3.Connection
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        """
+        columnas: list[str] = self._columnas(tabla)
+        definiciones: str = ", ".join(f'"{c}" TEXT' for c in columnas)
+        conexion.execute(f'DROP TABLE IF EXISTS "{tabla}"')
+        conexion.execute(
+            f'CREATE TABLE "{tabla}" (orden INTEGER PRIMARY KEY, {definiciones})'
+        )
+        if "id" in columnas:
+            conexion.execute(
+                f'CREATE INDEX "{tabla}_id" ON "{tabla}" (id)'
+            )
+        if "normalizado" in columnas:
+            conexion.execute(
+                f'CREATE INDEX "{tabla}_normalizado" ON "{tabla}" (normalizado)'
+            )
+        if tabla == "proposiciones":
+            conexion.execute(
+                f'CREATE INDEX "{tabla}_terna" ON "{tabla}" (ent1, rel, ent2)'
+            )
+
+    def _leer_ordenes(
+        self, conexion: sqlite3.Connection, tabla: str
+    ) -> list[int]:
+        """
+        Retorna el valor de 'orden' de las filas de la tabla.
+
+        :param conexion: La conexión a la base de datos.
+        :type conexion: sqlite3.Connection
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: Los valores, en el orden de las filas.
+        :rtype: list[int]
+        """
+        return [
+            int(f[0]) for f in conexion.execute(
+                f'SELECT orden FROM "{tabla}" ORDER BY orden'
+            )
+        ]
+
+    def _lista(self, columnas: list[str]) -> str:
+        """
+        Retorna los nombres de las columnas entre comillas y separados por
+        comas.
+
+        :param columnas: Los nombres de las columnas.
+        :type columnas: list[str]
+        :return: La lista de columnas para la consulta.
+        :rtype: str
+        """
+        return ", ".join(f'"{c}"' for c in columnas)
+
+    def _migrar(self) -> None:
+        """
+        Carga en la base de datos las tablas .csv de un proyecto guardado
+        con el otro motor y luego las elimina.
+        """
+        for tabla, ruta in self._rutas.items():
+            if ruta.is_file():
+                encabezado, filas = leer_csv(ruta)
+                self.volcar(tabla, encabezado, filas)
+        for ruta in self._rutas.values():
+            if ruta.is_file():
+                os.remove(ruta)
+
+    def _valores(self, tabla: str, fila: dict[str, str]) -> list[str]:
+        """
+        Retorna los valores de la fila en el orden de las columnas.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param fila: La fila.
+        :type fila: dict[str, str]
+        :return: Los valores a escribir.
+        :rtype: list[str]
+        """
+        valores: list[str] = [
+            fila.get(c) or "" for c in self._encabezados[tabla]
+        ]
+        if tabla in self._columnas_texto:
+            valores.append(
+                self._normalizar(fila[self._columnas_texto[tabla]])
+            )
+        return valores
+
+
+class Bitacora:
+    """
+    Clase encargada de registrar las modificaciones de las tablas en una
+    bitácora de sólo agregado, delante de otro motor de almacenamiento.
+    Cada operación escribe una línea, sin reescribir la tabla. Las
+    posiciones se registran sin contar las filas que Tablas mantiene
+    anuladas, como si la tabla estuviera compactada. Cuando la
+    bitácora supera el límite, las tablas modificadas se vuelcan en el
+    motor en segundo plano y la bitácora vuelve a empezar. Al leer las
+    tablas se aplican las operaciones pendientes, lo que permite recuperar
+    los cambios tras una interrupción.
+
+    :param almacen: El motor en el que se vuelcan las tablas.
+    :type almacen: AlmacenCSV | AlmacenSQLite
+    :param ruta: La ruta a la bitácora.
+    :type ruta: Path
+    :param limite: El tamaño en bytes a partir del cual se compacta.
+    :type limite: int
+    """
+
+    def __init__(
+        self,
+        almacen: AlmacenCSV | AlmacenSQLite,
+        ruta: Path,
+        limite: int = 256 * 1024
+    ):
+        self.nombres: list[str] = almacen.nombres
+        self._almacen: AlmacenCSV | AlmacenSQLite = almacen
+        self._ruta: Path = ruta
+        # Bitácora que se está volcando en el motor
+        self._segmento: Path = ruta.with_name(ruta.name + ".1")
+        self._limite: int = limite
+        self._archivo: TextIO | None = None
+        self._hilo: threading.Thread | None = None
+        # Referencias a las filas de Tablas, para poder volcarlas
+        self._encabezados: dict[str, list[str]] = {}
+        self._filas: dict[str, list[dict[str, str] | None]] = {}
+        # Posiciones de las filas anuladas en Tablas desde el último volcado
+        self._anuladas: dict[str, list[int]] = {}
+        # Tablas con cambios que todavía no se volcaron
+        self._pendientes: set[str] = set()
+
+    def agregar(self, tabla: str, filas: list[dict[str, str] | None]) -> None:
+        """
+        Registra la fila agregada al final de la tabla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str] | None]
+        """
+        self._filas[tabla] = filas
+        self._registrar(
+            {"tabla": tabla, "operacion": "agregar", "fila": filas[-1]}
+        )
+
+    def cerrar(self) -> None:
+        """
+        Vuelca los cambios pendientes y cierra la bitácora y el motor.
+        """
+        self.sincronizar()
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        self._almacen.cerrar()
+
+    def editar(
+        self, tabla: str, posicion: int, filas: list[dict[str, str] | None]
+    ) -> None:
+        """
+        Registra la fila modificada.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila.
+        :type posicion: int
+        :param filas: Las filas de la tabla, con None en las eliminadas.
+        :type filas: list[dict[str, str] | None]
+        """
+        self._filas[tabla] = filas
+        self._registrar({
+            "tabla": tabla,
+            "operacion": "editar",
+            "posicion": self._sin_anuladas(tabla, posicion),
+            "fila": filas[posicion]
+        })
+
+    def leer(self, tabla: str) -> tuple[list[str], list[dict[str, str]]]:
+        """
+        Lee la tabla del motor y le aplica las operaciones registradas en
+        la bitácora que todavía no se volcaron.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: El encabezado y las filas de la tabla.
+        :rtype: tuple[list[str], list[dict[str, str]]]
+        """
+        self._esperar_compactacion()
+        encabezado, filas = self._almacen.leer(tabla)
+        for operacion in self._operaciones(tabla, encabezado, filas):
+            encabezado, filas = self._aplicar(operacion, encabezado, filas)
+            self._pendientes.add(tabla)
+        self._encabezados[tabla] = encabezado
+        self._filas[tabla] = filas
+        self._anuladas[tabla] = []
+        return encabezado, filas
+
+    def quitar(
+        self, tabla: str, posicion: int, filas: list[dict[str, str] | None]
+    ) -> None:
+        """
+        Registra la eliminación de la fila de la posición indicada.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila eliminada.
+        :type posicion: int
+        :param filas: Las filas de la tabla, con None en las eliminadas.
+        :type filas: list[dict[str, str] | None]
+        """
+        self._filas[tabla] = filas
+        compacta: int = self._sin_anuladas(tabla, posicion)
+        bisect.insort(self._anuladas.setdefault(tabla, []), posicion)
+        self._registrar(
+            {"tabla": tabla, "operacion": "quitar", "posicion": compacta}
+        )
+
+    def sincronizar(self) -> None:
+        """
+        Vuelca en el motor todos los cambios pendientes y vacía la bitácora,
+        antes de guardar el proyecto, crear un respaldo o reemplazar las
+        tablas.
+        """
+        self._esperar_compactacion()
+        if self._pendientes:
+            self._volcar_pendientes()
+        self._almacen.sincronizar()
+
+    def volcar(
+        self, tabla: str, encabezado: list[str], filas: list[dict[str, str]]
+    ) -> None:
+        """
+        Registra el contenido completo de la tabla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param encabezado: Las columnas de la tabla.
+        :type encabezado: list[str]
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str]]
+        """
+        self._encabezados[tabla] = list(encabezado)
+        self._filas[tabla] = filas
+        self._anuladas[tabla] = []
+        self._registrar({
+            "tabla": tabla,
+            "operacion": "volcar",
+            "encabezado": encabezado,
+            "filas": filas
+        })
+
+    def _aplicar(
+        self,
+        operacion: dict,
+        encabezado: list[str],
+        filas: list[dict[str, str]]
+    ) -> tuple[list[str], list[dict[str, str]]]:
+        """
+        Aplica a la tabla una operación leída de la bitácora.
+
+        :param operacion: La operación registrada.
+        :type operacion: dict
+        :param encabezado: Las columnas de la tabla.
+        :type encabezado: list[str]
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str]]
+        :return: El encabezado y las filas luego de aplicar la operación.
+        :rtype: tuple[list[str], list[dict[str, str]]]
+        """
+        if operacion["operacion"] == "agregar":
+            filas.append(operacion["fila"])
+        elif operacion["operacion"] == "editar":
+            filas[operacion["posicion"]] = operacion["fila"]
+        elif operacion["operacion"] == "quitar":
+            del filas[operacion["posicion"]]
+        elif operacion["operacion"] == "volcar":
+            encabezado = operacion["encabezado"]
+            filas = operacion["filas"]
+        return encabezado, filas
+
+    def _anotar_volcado(
+        self,
+        archivo: TextIO,
+        tabla: str,
+        encabezado: list[str],
+        filas: list[dict[str, str]]
+    ) -> None:
+        """
+        Anota la huella del contenido con el que se va a reemplazar la
+        tabla en el motor y se asegura de que llegue al disco antes del
+        reemplazo. Al leer, si la tabla del motor tiene esa huella, las
+        operaciones anteriores a la marca ya están incluidas en ella.
+
+        :param archivo: La bitácora o el segmento en que se anota.
+        :type archivo: TextIO
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param encabezado: Las columnas de la tabla.
+        :type encabezado: list[str]
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str]]
+        """
+        archivo.write(json.dumps({
+            "tabla": tabla,
+            "operacion": "volcado",
+            "huella": self._huella(encabezado, filas)
+        }) + "\n")
+        archivo.flush()
+        os.fsync(archivo.fileno())
+
+    def _compactar(
+        self, instantanea: dict[str, tuple[list[str], list[dict[str, str]]]]
+    ) -> None:
+        """
+        Vuelca en el motor, en segundo plano, las tablas de la instantánea.
+        Antes de reemplazar cada una anota en el segmento la huella de su
+        contenido, para no aplicar de nuevo sus operaciones si se interrumpe
+        luego del reemplazo, y al terminar lo elimina.
+
+        :param instantanea: El encabezado y las filas de cada tabla modificada.
+        :type instantanea: dict[str, tuple[list[str], list[dict[str, str]]]]
+        """
+        with open(self._segmento, "a", encoding="utf-8") as segmento:
+            for tabla, (encabezado, filas) in instantanea.items():
+                self._anotar_volcado(segmento, tabla, encabezado, filas)
+                self._almacen.volcar(tabla, encabezado, filas)
+        os.remove(self._segmento)
+
+    def _esperar_compactacion(self) -> None:
+        """
+        Espera a que termine el volcado en segundo plano, si hay uno.
+        """
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def _huella(
+        self, encabezado: list[str], filas: list[dict[str, str]]
+    ) -> str:
+        """
+        Retorna una huella del contenido de la tabla, que no depende del
+        motor en el que se guardó.
+
+        :param encabezado: Las columnas de la tabla.
+        :type encabezado: list[str]
+        :param filas: Las filas de la tabla.
+        :type filas: list[dict[str, str]]
+        :return: El resumen SHA-256 en hexadecimal.
+        :rtype: str
+        """
+        contenido: list = [
+            encabezado, [[fila.get(c) or "" for c in encabezado] for fila in filas]
+        ]
+        return hashlib.sha256(
+            json.dumps(contenido, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    def _operaciones(
+        self, tabla: str, encabezado: list[str], filas: list[dict[str, str]]
+    ) -> list[dict]:
+        """
+        Retorna las operaciones registradas para la tabla en el segmento y
+        la bitácora que el motor todavía no contiene: las posteriores a la
+        última marca de volcado cuya huella coincide con la tabla leída. Las
+        marcas que no coinciden son de volcados interrumpidos antes de
+        reemplazar la tabla. Descarta una última línea incompleta.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param encabezado: Las columnas de la tabla leída del motor.
+        :type encabezado: list[str]
+        :param filas: Las filas de la tabla leída del motor.
+        :type filas: list[dict[str, str]]
+        :return: Las operaciones en el orden en que se registraron.
+        :rtype: list[dict]
+        """
+        res: list[dict] = []
+        # Sólo se calcula si hay alguna marca de volcado
+        huella: str | None = None
+        for ruta in (self._segmento, self._ruta):
+            if not ruta.is_file():
+                continue
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                for linea in archivo:
+                    try:
+                        operacion: dict = json.loads(linea)
+                    except json.JSONDecodeError:
+                        break
+                    if operacion["tabla"] != tabla:
+                        continue
+                    if operacion["operacion"] == "volcado":
+                        if huella is None:
+                            huella = self._huella(encabezado, filas)
+                        if operacion["huella"] == huella:
+                            res = []
+                    else:
+                        res.append(operacion)
+        return res
+
+    def _registrar(self, operacion: dict) -> None:
+        """
+        Agrega la operación a la bitácora y, si supera el límite, vuelca las
+        tablas modificadas en segundo plano.
+
+        :param operacion: La operación a registrar.
+        :type operacion: dict
+        """
+        if self._archivo is None:
+            self._archivo = open(self._ruta, "a", encoding="utf-8")
+        self._archivo.write(json.dumps(operacion, ensure_ascii=False) + "\n")
+        self._archivo.flush()
+        self._pendientes.add(operacion["tabla"])
+        en_curso: bool = self._hilo is not None and self._hilo.is_alive()
+        if self._archivo.tell() > self._limite and not en_curso:
+            self._esperar_compactacion()
+            if self._segmento.is_file():
+                # Quedó un segmento de una interrupción: vuelco todo aquí
+                self._volcar_pendientes()
+            else:
+                self._hilo = threading.Thread(
+                    target=self._compactar,
+                    args=(self._rotar(),),
+                    daemon=True
+                )
+                self._hilo.start()
+
+    def _rotar(self) -> dict[str, tuple[list[str], list[dict[str, str]]]]:
+        """
+        Toma una copia de las tablas modificadas y pasa la bitácora actual
+        a ser el segmento a volcar, empezando una nueva. Se llama con las
+        tablas bloqueadas, desde alguna de sus operaciones.
+
+        :return: El encabezado y las filas de cada tabla modificada.
+        :rtype: dict[str, tuple[list[str], list[dict[str, str]]]]
+        """
+        instantanea: dict[str, tuple[list[str], list[dict[str, str]]]] = {
+            tabla: (
+                list(self._encabezados[tabla]),
+                [dict(fila) for fila in self._filas[tabla] if fila is not None]
+            )
+            for tabla in self._pendientes
+        }
+        self._pendientes = set()
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        if self._ruta.is_file():
+            os.replace(self._ruta, self._segmento)
+        return instantanea
+
+    def _sin_anuladas(self, tabla: str, posicion: int) -> int:
+        """
+        Convierte la posición de una fila en Tablas en la que tendría si
+        se descartaran las filas anuladas.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila en Tablas.
+        :type posicion: int
+        :return: La posición sin contar las filas anuladas.
+        :rtype: int
+        """
+        return posicion - bisect.bisect_left(
+            self._anuladas.get(tabla, []), posicion
+        )
+
+    def _volcar_pendientes(self) -> None:
+        """
+        Vuelca en el motor, en este hilo, las tablas modificadas, anotando
+        en la bitácora la huella de cada una antes de reemplazarla. Al
+        terminar elimina la bitácora y el segmento que pudiera haber quedado
+        de una interrupción.
+        """
+        if self._archivo is None:
+            self._archivo = open(self._ruta, "a", encoding="utf-8")
+        for tabla in self.nombres:
+            if tabla in self._pendientes:
+                filas: list[dict[str, str]] = [
+                    fila for fila in self._filas[tabla] if fila is not None
+                ]
+                self._anotar_volcado(
+                    self._archivo, tabla, self._encabezados[tabla], filas
+                )
+                self._almacen.volcar(tabla, self._encabezados[tabla], filas)
+        self._pendientes = set()
+        self._archivo.close()
+        self._archivo = None
+        if self._segmento.is_file():
+            os.remove(self._segmento)
+        os.remove(self._ruta)
+
+
+def eliminar_base_de_datos(ruta: Path) -> None:
+    """
+    Elimina la base de datos junto con sus archivos auxiliares.
+
+    :param ruta: La ruta a la base de datos.
+    :type ruta: Path
+    """
+    for sufijo in ("", "-wal", "-shm"):
+        auxiliar: Path = ruta.with_name(ruta.name + sufijo)
+        if auxiliar.is_file():
+            os.remove(auxiliar)
+
+
+def leer_csv(ruta: Path) -> tuple[list[str], list[dict[str, str]]]:
+    """
+    Lee una tabla .csv delimitada por '§'.
+
+    :param ruta: La ruta al archivo.
+    :type ruta: Path
+    :return: El encabezado y las filas de la tabla.
+    :rtype: tuple[list[str], list[dict[str, str]]]
+    """
+    with open(ruta, "r", newline="", encoding="utf-8") as archivo:
+        registros = csv.DictReader(archivo, delimiter="§")
+        filas: list[dict[str, str]] = list(registros)
+        return list(registros.fieldnames or []), filas
+
+
+def leer_sqlite(
+    conexion: sqlite3.Connection, tabla: str
+) -> tuple[list[str], list[dict[str, str]]]:
+    """
+    Lee una tabla de la base de datos, en el orden en que se registraron
+    sus filas.
+
+    :param conexion: La conexión a la base de datos.
+    :type conexion: sqlite3.Connection
+    :param tabla: El nombre de la tabla.
+    :type tabla: str
+    :return: El encabezado y las filas de la tabla.
+    :rtype: tuple[list[str], list[dict[str, str]]]
+    """
+    cursor = conexion.execute(f'SELECT * FROM "{tabla}" ORDER BY orden')
+    columnas: list[str] = [c[0] for c in cursor.description]
+    encabezado: list[str] = [
+        c for c in columnas if c not in ("orden", "normalizado")
+    ]
+    filas: list[dict[str, str]] = []
+    for registro in cursor:
+        fila: dict[str, str] = dict(zip(columnas, registro))
+        filas.append({c: fila[c] for c in encabezado})
+    return encabezado, filas
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+
+class CacheDiagramas:
+    """
+    Clase encargada de conservar los diagramas ya generados, para no volver
+    a ejecutar Graphviz cuando el código fuente del grafo se repite. Cada
+    archivo se identifica por el hash de la fuente, el motor y el formato.
+    Cuando el tamaño total supera el límite, se descartan los archivos
+    usados hace más tiempo. El Extractor la usa, en otra carpeta, para
+    conservar el texto de los pdf.
+
+    :param directorio: La carpeta donde se guardan los diagramas.
+    :type directorio: Path
+    :param limite: El tamaño máximo, en bytes, del conjunto de archivos.
+    :type limite: int
+    """
+
+    _cerrojo: threading.Lock = threading.Lock()
+
+    def __init__(self, directorio: Path, limite: int = 64 * 1024 * 1024):
+        """
+        Constructor de la clase CacheDiagramas.
+        """
+        self._directorio: Path = directorio
+        self._limite: int = limite
+
+    def clave(self, fuente: str, motor: str, formato: str) -> str:
+        """
+        Calcula el identificador de un diagrama.
+
+        :param fuente: El código DOT del grafo.
+        :type fuente: str
+        :param motor: El programa de Graphviz que genera el diagrama.
+        :type motor: str
+        :param formato: La extensión del archivo con el diagrama.
+        :type formato: str
+        :return: El identificador.
+        :rtype: str
+        """
+        contenido: bytes = "\0".join((motor, formato, fuente)).encode("utf-8")
+        return hashlib.sha256(contenido).hexdigest()
+
+    def guardar(
+        self, clave: str, formato: str, origen: str | Path | bytes
+    ) -> Path:
+        """
+        Agrega una copia del diagrama generado y, si hace falta, descarta
+        los más antiguos.
+
+        :param clave: El identificador del diagrama.
+        :type clave: str
+        :param formato: La extensión del archivo con el diagrama.
+        :type formato: str
+        :param origen: La ruta al diagrama generado, o su contenido.
+        :type origen: str | Path | bytes
+        :return: La ruta a la copia.
+        :rtype: Path
+        """
+        destino: Path = self._ruta(clave, formato)
+        with CacheDiagramas._cerrojo:
+            self._directorio.mkdir(parents=True, exist_ok=True)
+            # Copio a un temporal para que una lectura concurrente no
+            # encuentre el archivo a medio escribir
+            temporal: Path = destino.with_name(f"{destino.name}.tmp")
+            if isinstance(origen, bytes):
+                temporal.write_bytes(origen)
+            else:
+                shutil.copyfile(origen, temporal)
+            os.replace(temporal, destino)
+            self._depurar(destino)
+        return destino
+
+    def obtener(self, clave: str, formato: str) -> Path | None:
+        """
+        Busca un diagrama generado previamente y lo marca como el más
+        reciente.
+
+        :param clave: El identificador del diagrama.
+        :type clave: str
+        :param formato: La extensión del archivo con el diagrama.
+        :type formato: str
+        :return: La ruta al diagrama o None si no está guardado.
+        :rtype: Path | None
+        """
+        ruta: Path = self._ruta(clave, formato)
+        with CacheDiagramas._cerrojo:
+            try:
+                os.utime(ruta)
+            except OSError:
+                return None
+        return ruta
+
+    def _depurar(self, conservar: Path) -> None:
+        """
+        Elimina los diagramas usados hace más tiempo hasta que el tamaño
+        total no supere el límite. Nunca elimina el recién agregado.
+
+        :param conservar: La ruta del diagrama recién agregado.
+        :type conservar: Path
+        """
+        archivos: list[tuple[float, int, Path]] = []
+        total: int = 0
+        for ruta in self._directorio.iterdir():
+            try:
+                datos: os.stat_result = ruta.stat()
+            except OSError:
+                continue
+            if not ruta.is_file():
+                continue
+            archivos.append((datos.st_mtime, datos.st_size, ruta))
+            total += datos.st_size
+        archivos.sort()
+        for _, tamaño, ruta in archivos:
+            if total <= self._limite:
+                break
+            if ruta == conservar:
+                continue
+            try:
+                ruta.unlink()
+                total -= tamaño
+            except OSError:
+                pass
+
+    def _ruta(self, clave: str, formato: str) -> Path:
+        """
+        Obtiene la ubicación del archivo correspondiente a un diagrama.
+
+        :param clave: El identificador del diagrama.
+        :type clave: str
+        :param formato: La extensión del archivo con el diagrama.
+        :type formato: str
+        :return: La ruta al archivo.
+        :rtype: Path
+        """
+        return self._directorio / f"{clave}.{formato}"
@@ -1,18 +1,65 @@
 import fitz  # type: ignore
+import hashlib
+import multiprocessing
+import os
 import re
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from aplicacion.documentos import cache
 
 
 class Extractor:
     """
     Clase encargada de obtener el texto contenido en un pdf o un txt.
+    El texto ya ordenado de cada pdf se conserva en resultados/cache_textos,
+    identificado por el contenido del archivo y la versión de la extracción,
+    y se reutiliza cuando se vuelve a abrir el mismo documento.
     """
+
+    # Cambiarla cuando se modifique la forma de extraer u ordenar el texto,
+    # para no reutilizar los textos guardados con la anterior
+    _version: str = "1"
+
+    # Indicador que se agrega al final de cada página extraída
+    _fin_de_pagina: str = "\n\n"+ chr(32)*13 + "----[FIN DE PÁGINA]----\n\n"
+    # Cantidad de líneas de un txt que se entregan juntas
+    _lineas_por_fragmento: int = 2000
+    # Los pdf extensos se extraen por tramos de páginas en varios procesos.
+    # Con páginas de texto denso, el grupo ya iniciado conviene desde unas
+    # 50 páginas y, si hay que iniciarlo, desde unas 200
+    _paginas_por_tramo: int = 25
+    _minimo_paginas_en_paralelo: int = 100
+    # Grupo de procesos compartido por todas las extracciones. Se crea con
+    # el primer pdf extenso, porque iniciar los procesos demora, y se
+    # cierra al salir de la aplicación
+    _grupo: ProcessPoolExecutor | None = None
+    _cerrojo_grupo: threading.Lock = threading.Lock()
     
     def __init__(self):
         """
         Constructor de la clase Extractor.
         """
-        pass
+        self._cache: cache.CacheDiagramas = cache.CacheDiagramas(
+            (Path(__file__).parent.parent / "resultados" / "cache_textos").resolve()
+        )
+        # Indica si la última extracción se obtuvo de la cache
+        self.recuperado: bool = False
     
+    @classmethod
+    def cerrar_procesos(cls) -> None:
+        """
+        Termina el grupo de procesos de extracción, si se creó, y descarta
+        los tramos pendientes. El próximo pdf extenso crea otro.
+        """
+        with cls._cerrojo_grupo:
+            grupo: ProcessPoolExecutor | None = cls._grupo
+            cls._grupo = None
+        if grupo is not None:
+            grupo.shutdown(wait=True, cancel_futures=True)
+
     def extraer_contenido(self, ruta: str) -> str:
         """
         Obtiene el texto completo del archivo que recibe como argumento.
@@ -23,26 +70,67 @@ class Extractor:
         :return: El texto contenido en el archivo o -1. 
         :rtype: str
         """
-        if ruta.endswith(".pdf"):            
-            try:
-                with fitz.open(ruta) as pdf:
-                    contenido:str = chr(12).join(
-                        [pagina.get_text() for pagina in pdf]
-                    ) 
-                    contenido = self.ordenar_contenido(contenido)
-                    return contenido
-            except:
-                return "-1" 
-        elif ruta.endswith(".txt"):
-            try:
-                with open(ruta,"r") as txt:
-                    contenido = "\n".join([linea for linea in txt.readlines()])
-                    return contenido
-            except:
-                return "-1"
-        else:  # Extensión no soportada
+        try:
+            return "".join(self.extraer_paginas(ruta))
+        except:
             return "-1"
 
+    def extraer_paginas(self, ruta: str) -> Iterator[str]:
+        """
+        Obtiene el texto del archivo que recibe como argumento de a partes,
+        a medida que se extrae: una página de un pdf, ya ordenada, o un
+        bloque de líneas de un txt. Así, el principio del documento se puede
+        mostrar antes de terminar de leerlo.
+
+        :param ruta: Ubicación del archivo.
+        :type ruta: str
+        :return: Las partes del texto contenido en el archivo.
+        :rtype: Iterator[str]
+        :raises ValueError: Si la extensión del archivo no está soportada.
+        """
+        self.recuperado = False
+        if ruta.endswith(".pdf"):
+            with open(ruta, "rb") as pdf:
+                huella: str = hashlib.file_digest(pdf, "sha256").hexdigest()
+            clave: str = self._cache.clave(huella, self._version, "txt")
+            guardado: Path | None = self._cache.obtener(clave, "txt")
+            if guardado is not None:
+                try:
+                    texto: str = guardado.read_text(encoding="utf-8")
+                except OSError:  # Se descartó mientras tanto
+                    pass
+                else:
+                    self.recuperado = True
+                    yield texto
+                    return
+            partes: list[str] = []
+            numero: int = 0
+            for pagina in self._extraer_pdf(ruta):
+                # Cada página se ordena por separado, sin el salto
+                # final que quedaba antes del separador de páginas
+                contenido: str = self.ordenar_contenido(pagina.rstrip("\n"))
+                if numero > 0:
+                    contenido = self._fin_de_pagina + contenido
+                numero += 1
+                partes.append(contenido)
+                yield contenido
+            # Sólo se guarda si se terminó de extraer
+            self._cache.guardar(clave, "txt", "".join(partes).encode("utf-8"))
+        elif ruta.endswith(".txt"):
+            with open(ruta,"r") as txt:
+                lineas: list[str] = []
+                primero: bool = True
+                for linea in txt:
+                    lineas.append(linea)
+                    if len(lineas) == self._lineas_por_fragmento:
+                        yield ("" if primero else "\n") + "\n".join(lineas)
+                        lineas = []
+                        primero = False
+                if lineas:
+                    yield ("" if primero else "\n") + "\n".join(lineas)
+        else:
+            raise ValueError(f"Extensión no soportada: {ruta}")
+
     def ordenar_contenido(self, contenido: str) -> str:
         """
         Convierte las líneas extraídas en oraciones.
@@ -90,11 +178,94 @@ class Extractor:
         except:
             pass
         # Agrega un indicador al final de cada paǵina extraída
-        c_aux:str = "\n\n"+ chr(32)*13 + "----[FIN DE PÁGINA]----\n\n"
-        contenido = contenido.replace(chr(12), c_aux)
+        contenido = contenido.replace(chr(12), self._fin_de_pagina)
         # Elimino del texto extraído el caracter reservado
         # para delimitar las tablas
         contenido = contenido.replace(chr(167), "")        
-        return contenido       
-        
+        return contenido
+
+    def _extraer_pdf(self, ruta: str) -> Iterator[str]:
+        """
+        Obtiene el texto sin ordenar de cada página de un pdf, en orden. Si
+        el documento es extenso, el primer tramo se extrae en este hilo,
+        para mostrarlo cuanto antes, y el resto en el grupo de procesos
+        compartido.
 
+        :param ruta: Ubicación del archivo.
+        :type ruta: str
+        :return: El texto de cada página.
+        :rtype: Iterator[str]
+        """
+        with fitz.open(ruta) as pdf:
+            total: int = pdf.page_count
+            procesos: int = min(
+                os.cpu_count() or 1,
+                (total - 1) // self._paginas_por_tramo
+            )
+            if total < self._minimo_paginas_en_paralelo or procesos < 2:
+                for pagina in pdf:
+                    yield pagina.get_text()
+                return
+            tramos: list[Future] = []
+            try:
+                grupo: ProcessPoolExecutor = Extractor._grupo_de_procesos()
+                tramos = [
+                    grupo.submit(
+                        Extractor._extraer_tramo, ruta, inicio,
+                        min(inicio + self._paginas_por_tramo, total)
+                    )
+                    for inicio in range(
+                        self._paginas_por_tramo, total, self._paginas_por_tramo
+                    )
+                ]
+                for numero in range(self._paginas_por_tramo):
+                    yield pdf[numero].get_text()
+                for tramo in tramos:
+                    yield from tramo.result()
+            except BrokenProcessPool:
+                # Un proceso terminó de forma abrupta y el grupo ya no
+                # sirve: el próximo pdf extenso usa uno nuevo
+                Extractor.cerrar_procesos()
+                raise
+            finally:
+                # Si se deja de leer antes de terminar, se descarta el resto
+                for tramo in tramos:
+                    tramo.cancel()
+
+    @staticmethod
+    def _extraer_tramo(ruta: str, inicio: int, fin: int) -> list[str]:
+        """
+        Obtiene el texto sin ordenar de un tramo de páginas de un pdf. Se
+        ejecuta en otro proceso, que abre el documento por su cuenta.
+
+        :param ruta: Ubicación del archivo.
+        :type ruta: str
+        :param inicio: El número de la primera página del tramo.
+        :type inicio: int
+        :param fin: El número de la página siguiente a la última del tramo.
+        :type fin: int
+        :return: El texto de cada página.
+        :rtype: list[str]
+        """
+        with fitz.open(ruta) as pdf:
+            return [pdf[numero].get_text() for numero in range(inicio, fin)]
+
+    @classmethod
+    def _grupo_de_procesos(cls) -> ProcessPoolExecutor:
+        """
+        Obtiene el grupo de procesos compartido, y lo crea si todavía no
+        existe. Los procesos se inician a medida que hacen falta, hasta
+        uno por procesador.
+
+        :return: El grupo de procesos.
+        :rtype: ProcessPoolExecutor
+        """
+        with cls._cerrojo_grupo:
+            if cls._grupo is None:
+                # Los procesos se crean con "spawn" porque la aplicación ya
+                # tiene hilos en ejecución, que no conviene duplicar
+                cls._grupo = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return cls._grupo
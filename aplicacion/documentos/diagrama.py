@@ -1,27 +1,86 @@
-import csv, graphviz  # type: ignore
+import collections
+import functools
+import json
+import os
 import platform
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Callable
 from aplicacion.interfaz import comunes
+from aplicacion.documentos import cache, tablas
 
 
 class Diagramador:
     """
     Clase encargada de generar el diagrama. Su constructor genera 
-    las rutas a los archivos necesarios para construir el diagrama.
+    la ruta de salida del diagrama. Graphviz se ejecuta como un proceso
+    aparte, que puede interrumpirse si el diagrama deja de ser necesario.
+    Los diagramas generados se conservan en resultados/cache, y se reutilizan
+    cuando el código fuente del grafo se repite. Para dibujar el diagrama
+    en el lienzo, sólo se le pide a Graphviz la disposición de los elementos,
+    que no cambia al editar los colores. Por la misma razón, cuando una
+    edición sólo cambia el estilo, la imagen se genera con neato a partir
+    de las posiciones del diagrama anterior, sin calcular otra disposición.
+
+    :param tablas: El contenido en memoria de las tablas del diagrama.
+    :type tablas: Tablas
     """
+
+    # Las instancias comparten los archivos de salida del diagrama, que
+    # se reemplazan juntos con el de la cache
+    _cerrojo_fuente: threading.Lock = threading.Lock()
+    # Atributos que no alteran la disposición del diagrama
+    _estilo: tuple[str, ...] = (
+        "bgcolor", "color", "fillcolor", "fontcolor", "style"
+    )
+    # Últimas disposiciones calculadas, compartidas por las instancias
+    _disposiciones: collections.OrderedDict[str, dict] = collections.OrderedDict()
+    _max_disposiciones: int = 8
+    _cerrojo_disposiciones: threading.Lock = threading.Lock()
+    # Con posiciones fijas, las flechas tampoco alteran la disposición
+    _estilo_fijo: tuple[str, ...] = _estilo + ("arrowhead", "arrowtail", "dir")
+    # Disposición de la última imagen generada u obtenida de la cache, sin
+    # los atributos de estilo
+    _ultima_disposicion: str = ""
+    # Identificadores que el lenguaje DOT admite sin comillas
+    _id_dot: re.Pattern = re.compile(
+        r"([a-zA-Z_][a-zA-Z0-9_]*|-?(\.[0-9]+|[0-9]+(\.[0-9]*)?))$"
+    )
+    _html_dot: re.Pattern = re.compile(r"<.*>$", re.DOTALL)
+    _comillas_dot: re.Pattern = re.compile(r'(?P<barras>(?:\\{2})*)\\?(?P<comilla>")')
+    _palabras_dot: set[str] = {"node", "edge", "graph", "digraph", "subgraph", "strict"}
     
-    def __init__(self):
+    def __init__(self, tablas: tablas.Tablas):
         """
         Constructor de la clase Diagramador. 
         """
         self._ruta_salida: Path = (Path(__file__).parent.parent / "resultados").resolve()
-        self._ruta_csv_proposiciones: Path = (Path(__file__).parent / "recursos" / "proposiciones.csv").resolve()
-        self._ruta_csv_propiedades_n: Path = (Path(__file__).parent / "recursos" / "propiedades_n.csv").resolve()
-        self._ruta_csv_propiedades_v: Path = (Path(__file__).parent / "recursos" / "propiedades_v.csv").resolve()
-        self._ruta_csv_nodos: Path = (Path(__file__).parent / "recursos" / "nodos.csv").resolve()
-        self._ruta_csv_vertices: Path = (Path(__file__).parent / "recursos" / "vertices.csv").resolve()
+        self._tablas: tablas.Tablas = tablas
         self._nombre_png: str = "grafo_proposiciones"    
+        self._motor: str = "dot"
+        self._cache: cache.CacheDiagramas = cache.CacheDiagramas(
+            self._ruta_salida / "cache"
+        )
+        self._cerrojo: threading.Lock = threading.Lock()
+        self._cancelado: bool = False
+        self._proceso: subprocess.Popen | None = None
+
+    def cancelar(self) -> None:
+        """
+        Interrumpe la generación del diagrama. Si Graphviz está en ejecución,
+        termina el proceso y espera a que finalice, para que no escriba el
+        archivo de salida.
+        """
+        with self._cerrojo:
+            self._cancelado = True
+            proceso: subprocess.Popen | None = self._proceso
+        if proceso is not None and proceso.poll() is None:
+            proceso.kill()
+            proceso.wait()
     
     def crear_grafo(
         self, formato: str = "png", directorio: str | Path = ""
@@ -33,73 +92,599 @@ class Diagramador:
         :type formato: str
         :param directorio: La ubicación donde guardar el diagrama.
         :type directorio: str | Path
-        :return: La ruta al archivo con el diagrama generado. 
+        :return: La ruta al archivo con el diagrama generado, o una cadena vacía si se canceló. 
         :rtype: str
         """
         if not directorio:
             directorio = self._ruta_salida
-        grafo = graphviz.Digraph(
-            self._nombre_png, graph_attr=comunes.atrb_grafo
+        exportar: bool = Path(directorio) != self._ruta_salida
+        grafo, geometria = self._construir_grafos(((), Diagramador._estilo_fijo))
+        clave: str = self._cache.clave(grafo, self._motor, formato)
+        clave_geometria: str = self._cache.clave(geometria, self._motor, "posiciones")
+        guardado: Path | None = self._cache.obtener(clave, formato)
+        fuente: Path = Path(directorio) / f"{self._nombre_png}.gv"
+        salida: Path = Path(f"{fuente}.{formato}")
+        if guardado is not None:
+            # Copio el diagrama ya generado: la cache puede descartarlo
+            # mientras se lo muestra
+            with Diagramador._cerrojo_fuente:
+                fuente.parent.mkdir(parents=True, exist_ok=True)
+                if exportar:
+                    fuente.write_text(grafo, encoding="utf-8")
+                self._copiar(guardado, salida)
+            if not exportar:
+                self._recordar_disposicion(clave_geometria)
+            return str(salida.resolve())
+        comando: list[str] = [self._motor, f"-T{formato}"]
+        if not exportar:
+            fijado: str | None = self._fijar_posiciones(clave_geometria)
+            if fijado is not None:
+                grafo, comando = fijado, ["neato", "-n2", f"-T{formato}"]
+            else:
+                # La disposición sale de la misma ejecución, para fijarla
+                # si la próxima edición sólo cambia el estilo
+                comando.append("-Tjson")
+        # Cada generación escribe sus propios archivos, y sólo al terminar
+        # reemplazan a los compartidos: si se cancela o corre a la vez que
+        # otra, no deja en ellos ni en la cache una imagen a medio escribir
+        fuente.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=fuente.parent,
+            prefix=f"{self._nombre_png}.",
+            suffix=".gv",
+            delete=False
+        ) as archivo:
+            archivo.write(grafo)
+        propia: Path = Path(archivo.name)
+        imagen: Path = Path(f"{propia}.{formato}")
+        disposicion: Path = Path(f"{propia}.json")
+        try:
+            if self._ejecutar_graphviz(comando + ["-O", str(propia)]) is None:
+                return ""
+            with Diagramador._cerrojo_fuente:
+                self._cache.guardar(clave, formato, imagen)
+                if "-Tjson" in comando:
+                    self._cache.guardar(clave_geometria, "json", disposicion)
+                os.replace(imagen, salida)
+                os.replace(propia, fuente)
+        finally:
+            for ruta in (propia, imagen, disposicion):
+                ruta.unlink(missing_ok=True)
+        if not exportar:
+            self._recordar_disposicion(clave_geometria)
+        return str(salida.resolve())
+
+    def generar(self) -> str | bytes | dict:
+        """
+        Genera el diagrama del modo indicado en comunes: como escena para
+        el lienzo, como imagen en memoria o como archivo en resultados/.
+
+        :return: La escena, el contenido de la imagen o la ruta al archivo. Vacío si se canceló.
+        :rtype: str | bytes | dict
+        """
+        if comunes.diagrama_en_lienzo:
+            return self.generar_escena()
+        if comunes.diagrama_en_memoria:
+            return self.generar_imagen()
+        return self.crear_grafo()
+
+    def generar_escena(self) -> dict:
+        """
+        Obtiene lo necesario para dibujar el diagrama en el lienzo: las
+        operaciones de dibujo que calcula Graphviz para cada nodo y vértice,
+        y los atributos de estilo vigentes de cada uno. La disposición se
+        calcula sin los atributos de estilo, así que sólo se vuelve a pedir
+        a Graphviz cuando cambia algo que altera la forma del diagrama.
+
+        :return: El tamaño del diagrama en puntos, y los nodos y vértices, o vacío si se canceló.
+        :rtype: dict
+        """
+        fuente: str = self._construir_grafo(Diagramador._estilo)
+        disposicion: dict | None = self._disposicion(fuente)
+        if disposicion is None:
+            return {}
+        por_defecto_n: dict[str, str] = self._por_defecto(comunes.atrb_nodos)
+        por_defecto_v: dict[str, str] = self._por_defecto(comunes.atrb_vertices)
+        propiedades_n: dict[str, dict[str, str]] = self._propiedades(
+            "propiedades_n"
         )
-        # Cargo los nodos
-        with open(
-            self._ruta_csv_nodos, "r", newline="", encoding="utf-8"
-        ) as nodos:
-            registros = csv.DictReader(nodos, delimiter="§")
-            for registro in registros:
-                atributos: list[str | Any] = self._atributos(
-                    registro["id"], self._ruta_csv_propiedades_n
+        propiedades_v: dict[str, dict[str, str]] = self._propiedades(
+            "propiedades_v"
+        )
+        nodos: list[dict] = []
+        for registro in self._tablas.registros("nodos"):
+            atributos: dict[str, str] = {
+                **por_defecto_n, **propiedades_n[registro["id"]]
+            }
+            nodos.append({
+                **disposicion["nodos"].get(registro["id"], {}),
+                "estilo": {c: atributos.get(c, "") for c in Diagramador._estilo}
+            })
+        vertices: list[dict] = []
+        for registro, dibujo in zip(
+            self._tablas.registros("proposiciones"), disposicion["vertices"]
+        ):
+            atributos = {**por_defecto_v, **propiedades_v[registro["rel"]]}
+            vertices.append({
+                **dibujo,
+                "estilo": {c: atributos.get(c, "") for c in Diagramador._estilo}
+            })
+        return {
+            "ancho": disposicion["ancho"],
+            "alto": disposicion["alto"],
+            "nodos": nodos,
+            "vertices": vertices
+        }
+
+    def generar_imagen(self, formato: str = "png") -> bytes:
+        """
+        Genera el diagrama a partir de las tablas sin escribir archivos
+        intermedios: la fuente se envía a Graphviz por la entrada estándar
+        y la imagen se lee de su salida.
+
+        :param formato: La extensión deseada de la imagen.
+        :type formato: str
+        :return: El contenido de la imagen, o vacío si se canceló.
+        :rtype: bytes
+        """
+        grafo, geometria = self._construir_grafos(((), Diagramador._estilo_fijo))
+        clave: str = self._cache.clave(grafo, self._motor, formato)
+        clave_geometria: str = self._cache.clave(geometria, self._motor, "posiciones")
+        guardado: Path | None = self._cache.obtener(clave, formato)
+        datos: bytes | None = None
+        if guardado is not None:
+            try:
+                datos = guardado.read_bytes()
+            except OSError:
+                pass  # Fue descartado mientras tanto
+        if datos is not None:
+            self._recordar_disposicion(clave_geometria)
+            return datos
+        fijado: str | None = self._fijar_posiciones(clave_geometria)
+        if fijado is not None:
+            datos = self._ejecutar_graphviz(
+                ["neato", "-n2", f"-T{formato}"], fijado.encode("utf-8")
+            )
+        else:
+            # La disposición sale de la misma ejecución, a un archivo
+            # aparte, para fijarla si la próxima edición sólo cambia el estilo
+            with tempfile.TemporaryDirectory() as temporal:
+                disposicion: Path = Path(temporal) / "disposicion.json"
+                datos = self._ejecutar_graphviz(
+                    [self._motor, "-Tjson", "-o", str(disposicion), f"-T{formato}"],
+                    grafo.encode("utf-8")
                 )
-                grafo.node(registro["id"], **atributos[0])
-        # Cargo los vertices
-        with open(
-            self._ruta_csv_proposiciones, "r", newline="", encoding="utf-8"
-        ) as proposiciones:
-            registros = csv.DictReader(proposiciones, delimiter="§")
-            for registro in registros:
-                atributos = self._atributos(
-                    registro["rel"], self._ruta_csv_propiedades_v
+                if datos is not None:
+                    self._cache.guardar(clave_geometria, "json", disposicion)
+        if datos is None:
+            return b""
+        self._cache.guardar(clave, formato, datos)
+        self._recordar_disposicion(clave_geometria)
+        return datos
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
+    def _citar(identificador: str) -> str:
+        """
+        Agrega comillas a un identificador o valor del código DOT, si las
+        necesita, con las mismas reglas que graphviz.quoting.quote. Como
+        los mismos valores se repiten en muchos elementos, se recuerdan
+        los últimos resultados.
+
+        :param identificador: El texto a citar.
+        :type identificador: str
+        :return: El texto listo para incluir en el código DOT.
+        :rtype: str
+        """
+        if Diagramador._html_dot.match(identificador):
+            return identificador
+        if (
+            Diagramador._id_dot.match(identificador)
+            and identificador.lower() not in Diagramador._palabras_dot
+        ):
+            return identificador
+        escapado: str = Diagramador._comillas_dot.sub(
+            r'\g<barras>\\\g<comilla>', identificador
+        )
+        return f'"{escapado}"'
+
+    def _citar_extremo(self, identificador: str) -> str:
+        """
+        Cita el extremo de un vértice, que puede indicar un puerto y un
+        punto cardinal separados por dos puntos.
+
+        :param identificador: El id del nodo.
+        :type identificador: str
+        :return: El extremo listo para incluir en el código DOT.
+        :rtype: str
+        """
+        nodo, _, resto = identificador.partition(":")
+        partes: list[str] = [Diagramador._citar(nodo)]
+        if resto:
+            puerto, _, cardinal = resto.partition(":")
+            partes.append(Diagramador._citar(puerto))
+            if cardinal:
+                partes.append(cardinal)
+        return ":".join(partes)
+
+    def _construir_grafo(
+        self, omitir: tuple[str, ...] = (), disposicion: dict | None = None
+    ) -> str:
+        """
+        Escribe el código DOT del grafo a partir de las tablas.
+
+        :param omitir: Los atributos que no se incluyen en el grafo.
+        :type omitir: tuple[str, ...]
+        :param disposicion: Las posiciones a fijar, obtenidas de una disposición previa.
+        :type disposicion: dict | None
+        :return: El código DOT del grafo.
+        :rtype: str
+        """
+        return self._construir_grafos((omitir,), disposicion)[0]
+
+    def _construir_grafos(
+        self,
+        variantes: tuple[tuple[str, ...], ...],
+        disposicion: dict | None = None
+    ) -> list[str]:
+        """
+        Escribe el código DOT del grafo a partir de las tablas, una vez por
+        cada conjunto de atributos a omitir, recorriéndolas una sola vez.
+        Los atributos por defecto se declaran una sola vez, y cada elemento
+        sólo agrega los propios. El resultado es el mismo que arma
+        graphviz.Digraph.
+
+        :param variantes: Los atributos que no se incluyen en cada grafo.
+        :type variantes: tuple[tuple[str, ...], ...]
+        :param disposicion: Las posiciones a fijar, obtenidas de una disposición previa.
+        :type disposicion: dict | None
+        :return: El código DOT de cada grafo, en el orden de las variantes.
+        :rtype: list[str]
+        """
+        citar: Callable[[str], str] = Diagramador._citar
+        posiciones_n: dict[str, dict] = {}
+        posiciones_v: list[dict[str, str]] = []
+        if disposicion is not None:
+            posiciones_n = disposicion["nodos"]
+            posiciones_v = [v["posiciones"] for v in disposicion["vertices"]]
+        grafos: list[list[str]] = []
+        for omitir in variantes:
+            atributos_grafo: dict[str, str] = self._omitir(comunes.atrb_grafo, omitir)
+            if disposicion is not None:
+                atributos_grafo["bb"] = disposicion["bb"]
+            lineas: list[str] = [f"digraph {citar(self._nombre_png)} {{\n"]
+            for tipo, atributos in (
+                ("graph", atributos_grafo),
+                ("node", self._omitir(self._por_defecto(comunes.atrb_nodos), omitir)),
+                ("edge", self._omitir(self._por_defecto(comunes.atrb_vertices), omitir))
+            ):
+                if atributos:
+                    lineas.append(f"\t{tipo} [{self._lista_atributos(atributos)}]\n")
+            grafos.append(lineas)
+        # Cargo los nodos
+        propiedades_n: dict[str, dict[str, str]] = self._propiedades(
+            "propiedades_n"
+        )
+        for registro in self._tablas.registros("nodos"):
+            nodo: str = citar(registro["id"])
+            posiciones: dict[str, str] = posiciones_n.get(
+                registro["id"], {}
+            ).get("posiciones", {})
+            for omitir, lineas in zip(variantes, grafos):
+                atributos = {
+                    **self._omitir(propiedades_n[registro["id"]], omitir),
+                    **posiciones
+                }
+                # Como en graphviz.Digraph, la etiqueta va primero
+                etiqueta_n: str | None = atributos.pop("label", None)
+                lista: str = self._lista_atributos(atributos, etiqueta_n)
+                lineas.append(f"\t{nodo} [{lista}]\n" if lista else f"\t{nodo}\n")
+        # Cargo los vertices. Los de una misma relación comparten sus
+        # atributos: los formateo una sola vez, separados según queden
+        # antes o después del peso, que es propio de cada vértice
+        propiedades_v: dict[str, dict[str, str]] = self._propiedades(
+            "propiedades_v"
+        )
+        formateados: dict[str, list[tuple[str, str]]] = {}
+        # Cada nodo es extremo de varios vértices
+        extremos_citados: dict[str, str] = {}
+        for i, registro in enumerate(self._tablas.registros("proposiciones")):
+            for extremo in (registro["ent1"], registro["ent2"]):
+                if extremo not in extremos_citados:
+                    extremos_citados[extremo] = self._citar_extremo(extremo)
+            extremos: str = (
+                f"\t{extremos_citados[registro['ent1']]}"
+                f" -> {extremos_citados[registro['ent2']]}"
+            )
+            if i < len(posiciones_v):
+                for omitir, lineas in zip(variantes, grafos):
+                    atributos = self._omitir(propiedades_v[registro["rel"]], omitir)
+                    etiqueta: str = atributos.pop("label")
+                    atributos.update(posiciones_v[i], weight=registro["peso"])
+                    lineas.append(
+                        f"{extremos} [{self._lista_atributos(atributos, f' {etiqueta}')}]\n"
+                    )
+                continue
+            if registro["rel"] not in formateados:
+                formateados[registro["rel"]] = []
+                for omitir in variantes:
+                    atributos = self._omitir(propiedades_v[registro["rel"]], omitir)
+                    etiqueta = atributos.pop("label")
+                    antes: str = self._lista_atributos(
+                        {c: v for c, v in atributos.items() if c < "weight"}
+                    )
+                    despues: str = self._lista_atributos(
+                        {c: v for c, v in atributos.items() if c > "weight"}
+                    )
+                    formateados[registro["rel"]].append((
+                        f" [label={citar(f' {etiqueta}')} "
+                        + (f"{antes} " if antes else ""),
+                        f" {despues}]\n" if despues else "]\n"
+                    ))
+            peso: str = citar(registro["peso"])
+            for (inicio, fin), lineas in zip(formateados[registro["rel"]], grafos):
+                lineas.append(f"{extremos}{inicio}weight={peso}{fin}")
+        for lineas in grafos:
+            lineas.append("}\n")
+        return ["".join(lineas) for lineas in grafos]
+
+    def _copiar(self, origen: Path, destino: Path) -> None:
+        """
+        Copia el archivo a través de uno temporal propio, que luego lo
+        reemplaza, para que quien lo abra no lo encuentre a medio escribir.
+
+        :param origen: El archivo a copiar.
+        :type origen: Path
+        :param destino: La ubicación de la copia.
+        :type destino: Path
+        """
+        temporal: Path = destino.with_name(
+            f"{destino.name}.{threading.get_ident()}.tmp"
+        )
+        shutil.copyfile(origen, temporal)
+        os.replace(temporal, destino)
+
+    def _disposicion(self, fuente: str) -> dict | None:
+        """
+        Obtiene de Graphviz la disposición del grafo, en formato json, y
+        conserva de cada nodo y vértice sólo sus operaciones de dibujo.
+        Las últimas disposiciones quedan en memoria y todas en la cache
+        de diagramas.
+
+        :param fuente: El código DOT del grafo, sin atributos de estilo.
+        :type fuente: str
+        :return: El tamaño del diagrama, y los nodos, indexados por id, y los vértices, en orden; o None si se canceló.
+        :rtype: dict | None
+        """
+        clave: str = self._cache.clave(fuente, self._motor, "json")
+        with Diagramador._cerrojo_disposiciones:
+            if clave in Diagramador._disposiciones:
+                Diagramador._disposiciones.move_to_end(clave)
+                return Diagramador._disposiciones[clave]
+        datos: bytes | None = None
+        guardado: Path | None = self._cache.obtener(clave, "json")
+        if guardado is not None:
+            try:
+                datos = guardado.read_bytes()
+            except OSError:
+                pass  # Fue descartado mientras tanto
+        if datos is None:
+            datos = self._ejecutar_graphviz(
+                [self._motor, "-Tjson"], fuente.encode("utf-8")
+            )
+            if datos is None:
+                return None
+            self._cache.guardar(clave, "json", datos)
+        res: dict = self._leer_disposicion(datos)
+        with Diagramador._cerrojo_disposiciones:
+            Diagramador._disposiciones[clave] = res
+            while len(Diagramador._disposiciones) > Diagramador._max_disposiciones:
+                Diagramador._disposiciones.popitem(last=False)
+        return res
+
+    def _ejecutar_graphviz(
+        self, argumentos: list[str], entrada: bytes | None = None
+    ) -> bytes | None:
+        """
+        Ejecuta Graphviz y espera a que termine.
+
+        :param argumentos: El comando a ejecutar.
+        :type argumentos: list[str]
+        :param entrada: La fuente del grafo, si no se lee de un archivo.
+        :type entrada: bytes | None
+        :return: Lo que Graphviz escribió en la salida estándar, o None si se canceló.
+        :rtype: bytes | None
+        """
+        opciones: dict = {}
+        if platform.system() == "Windows":
+            # Evita que se abra una consola por cada diagrama
+            opciones["creationflags"] = subprocess.CREATE_NO_WINDOW
+        with self._cerrojo:
+            if self._cancelado:
+                return None
+            self._proceso = subprocess.Popen(
+                argumentos,
+                stdin=subprocess.DEVNULL if entrada is None else subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **opciones
+            )
+        proceso: subprocess.Popen = self._proceso
+        try:
+            salida, errores = proceso.communicate(entrada)
+        except BrokenPipeError:
+            # El proceso terminó antes de leer toda la fuente
+            salida, errores = proceso.communicate()
+        with self._cerrojo:
+            self._proceso = None
+            if self._cancelado:
+                return None
+        if proceso.returncode != 0:
+            raise subprocess.CalledProcessError(
+                proceso.returncode, proceso.args, stderr=errores
+            )
+        return salida
+
+    def _fijar_posiciones(self, clave_geometria: str) -> str | None:
+        """
+        Si desde la última imagen generada sólo cambiaron atributos de estilo,
+        agrega al grafo las posiciones de esa disposición, guardada en la
+        cache al generarla, para generarlo con neato sin volver a calcularla.
+        Así es más rápido y los elementos no cambian de lugar.
+
+        :param clave_geometria: El identificador del grafo sin los atributos de estilo.
+        :type clave_geometria: str
+        :return: El código DOT con las posiciones fijas, o None si hay que calcular la disposición.
+        :rtype: str | None
+        """
+        with Diagramador._cerrojo_disposiciones:
+            if clave_geometria != Diagramador._ultima_disposicion:
+                return None
+        guardado: Path | None = self._cache.obtener(clave_geometria, "json")
+        if guardado is None:
+            return None
+        try:
+            datos: bytes = guardado.read_bytes()
+        except OSError:
+            return None  # Fue descartado mientras tanto
+        return self._construir_grafo(disposicion=self._leer_disposicion(datos))
+
+    def _leer_disposicion(self, datos: bytes) -> dict:
+        """
+        Conserva de la disposición que calculó Graphviz, en formato json,
+        el tamaño del diagrama y, de cada nodo y vértice, sus operaciones
+        de dibujo y su ubicación.
+
+        :param datos: La salida json de Graphviz.
+        :type datos: bytes
+        :return: El tamaño del diagrama, y los nodos, indexados por id, y los vértices, en orden.
+        :rtype: dict
+        """
+        salida: dict = json.loads(datos)
+        operaciones: tuple[str, ...] = (
+            "_draw_", "_ldraw_", "_hdraw_", "_tdraw_", "_hldraw_", "_tldraw_"
+        )
+        # Ubicación de los elementos, para fijarla al volver a generar
+        # el diagrama con neato
+        ubicaciones: tuple[str, ...] = (
+            "pos", "lp", "xlp", "head_lp", "tail_lp"
+        )
+        # El rectángulo que contiene al diagrama: "x0,y0,x1,y1"
+        limites: list[float] = [float(v) for v in salida["bb"].split(",")]
+        res: dict = {
+            "bb": salida["bb"],
+            "ancho": limites[2] - limites[0],
+            "alto": limites[3] - limites[1],
+            "nodos": {
+                objeto["name"]: {
+                    **{op: objeto.get(op, []) for op in operaciones[:2]},
+                    "posiciones": {
+                        u: objeto[u] for u in ubicaciones if u in objeto
+                    }
+                }
+                for objeto in salida.get("objects", []) if "nodes" not in objeto
+            },
+            "vertices": [
+                {
+                    **{op: vertice.get(op, []) for op in operaciones},
+                    "posiciones": {
+                        u: vertice[u] for u in ubicaciones if u in vertice
+                    }
+                }
+                for vertice in sorted(
+                    salida.get("edges", []), key=lambda v: v["_gvid"]
                 )
-                grafo.edge(
-                    registro["ent1"],         # Id nodo1
-                    registro["ent2"],         # Id nodo2
-                    f" {atributos[0]}",       # Texto de relación
-                    weight=registro["peso"],  # Peso de la relación
-                    **atributos[1]            # Propiedades del vértice
-                )           
-        grafo.render(directory=directorio, format=formato)
-        res: Path = (self._ruta_salida / f"{self._nombre_png}.gv.{formato}").resolve()
-        return str(res)
-
-    def _atributos(
-        self, id_elem : str, tabla_propiedades : Path
-    ) -> list[str | Any]:
-        """
-        Obtiene los atributos de estilo de nodos y vértices.
-
-        :param id_elem: El id del elemento.
-        :type id_elem: str
-        :param tabla_prop: La tabla en la que se encuentran los datos. 
-        :type tabla_prop: Path
-        :return: Los atributos del elemento.
-        :rtype: list[str | Any]
-        """
-        res: list[str | Any] = []
-        with open(
-            tabla_propiedades, "r", newline="", encoding="utf-8"
-        ) as tabla:
-            registros = csv.DictReader(tabla, delimiter="§")
-            for registro in registros:
-                if registro["id"] == id_elem:
-                    # Obtengo la etiqueta aparte para separarla del vértice
-                    if str(tabla_propiedades).endswith("v.csv"):
-                        res.append(registro["label"])
-                        del registro["id"]
-                        del registro["label"]
-                        res.append(registro)                        
-                    else:
-                        del registro["id"]
-                        res.append(registro) 
-                    break                        
+            ]
+        }
+        return res
+
+    def _lista_atributos(
+        self, atributos: dict[str, str], etiqueta: str | None = None
+    ) -> str:
+        """
+        Formatea los atributos de un elemento como lo hace graphviz.Digraph:
+        primero la etiqueta, si la tiene, y después el resto ordenados
+        por nombre.
+
+        :param atributos: Los atributos del elemento, sin la etiqueta.
+        :type atributos: dict[str, str]
+        :param etiqueta: La etiqueta del elemento.
+        :type etiqueta: str | None
+        :return: Los pares nombre=valor separados por espacios.
+        :rtype: str
+        """
+        citar: Callable[[str], str] = Diagramador._citar
+        pares: list[str] = [] if etiqueta is None else [f"label={citar(etiqueta)}"]
+        pares.extend(
+            f"{citar(clave)}={citar(valor)}"
+            for clave, valor in sorted(atributos.items()) if valor is not None
+        )
+        return " ".join(pares)
+
+    def _omitir(
+        self, atributos: dict[str, str], omitir: tuple[str, ...]
+    ) -> dict[str, str]:
+        """
+        Quita de los atributos los indicados.
+
+        :param atributos: Los atributos de un elemento o del grafo.
+        :type atributos: dict[str, str]
+        :param omitir: Los atributos a quitar.
+        :type omitir: tuple[str, ...]
+        :return: Los atributos restantes.
+        :rtype: dict[str, str]
+        """
+        return {
+            clave: valor for clave, valor in atributos.items()
+            if clave not in omitir
+        }
+
+    def _por_defecto(self, atributos: dict[str, str]) -> dict[str, str]:
+        """
+        Obtiene los atributos de estilo comunes a todos los nodos o vértices,
+        sin el id ni la etiqueta, que son propios de cada elemento.
+
+        :param atributos: El diccionario de estilo de nodos o vértices.
+        :type atributos: dict[str, str]
+        :return: Los atributos por defecto.
+        :rtype: dict[str, str]
+        """
+        return {
+            clave: str(valor) for clave, valor in atributos.items()
+            if clave not in ("id", "label")
+        }
+
+    def _propiedades(self, tabla_propiedades: str) -> dict[str, dict[str, str]]:
+        """
+        Obtiene los atributos de estilo de todos los nodos o vértices,
+        indexados por su id. Si un id está repetido, vale su primer registro.
+        Los atributos vacíos se omiten, para que tomen el valor por defecto.
+
+        :param tabla_propiedades: La tabla en la que se encuentran los datos. 
+        :type tabla_propiedades: str
+        :return: Los atributos de cada elemento.
+        :rtype: dict[str, dict[str, str]]
+        """
+        res: dict[str, dict[str, str]] = {}
+        for registro in self._tablas.registros(tabla_propiedades):
+            id_elem: str = registro.pop("id")
+            if id_elem not in res:
+                res[id_elem] = {
+                    clave: valor for clave, valor in registro.items()
+                    if valor or clave == "label"
+                }
         return res
-        
+
+    def _recordar_disposicion(self, clave_geometria: str) -> None:
+        """
+        Registra la disposición de la imagen que se acaba de generar u
+        obtener de la cache, para fijarla si la próxima edición sólo
+        cambia el estilo.
+
+        :param clave_geometria: El identificador del grafo sin los atributos de estilo.
+        :type clave_geometria: str
+        """
+        with Diagramador._cerrojo_disposiciones:
+            Diagramador._ultima_disposicion = clave_geometria
@@ -0,0 +1,131 @@
+import csv
+import json
+from pathlib import Path
+
+
+class Importador:
+    """
+    Clase encargada de obtener las proposiciones contenidas en un archivo
+    .csv, .tsv o .json, para registrarlas en bloque. Cada proposición tiene
+    las columnas ent1, rel, ent2 y, opcionalmente, peso.
+    """
+
+    def __init__(self):
+        """
+        Constructor de la clase Importador.
+        """
+        self._columnas: list[str] = ["ent1", "rel", "ent2", "peso"]
+        self._peso_por_defecto: str = "1"
+
+    def leer_proposiciones(self, ruta: str) -> tuple[list[list[str]], int]:
+        """
+        Obtiene las proposiciones del archivo que recibe como argumento.
+        Descarta las filas sin entidades o con un peso que no es un número
+        positivo.
+
+        :param ruta: Ubicación del archivo.
+        :type ruta: str
+        :return: Las proposiciones válidas y la cantidad de filas descartadas.
+        :rtype: tuple[list[list[str]], int]
+        """
+        extension: str = Path(ruta).suffix.lower()
+        if extension == ".json":
+            filas: list[list[str]] = self._leer_json(ruta)
+        elif extension in (".csv", ".tsv", ".txt"):
+            filas = self._leer_delimitado(ruta, extension)
+        else:
+            raise ValueError(f"Formato no soportado: {extension}")
+        # Omito el encabezado, si lo tiene
+        if filas and [c.strip().lower() for c in filas[0][:3]] == self._columnas[:3]:
+            filas = filas[1:]
+        proposiciones: list[list[str]] = []
+        descartadas: int = 0
+        for fila in filas:
+            proposicion: list[str] | None = self._validar(fila)
+            if proposicion is None:
+                descartadas += 1
+            else:
+                proposiciones.append(proposicion)
+        return proposiciones, descartadas
+
+    def _leer_delimitado(self, ruta: str, extension: str) -> list[list[str]]:
+        """
+        Lee un archivo de texto con una proposición por línea. Las tabulaciones
+        delimitan los campos de los .tsv; en el resto se detecta el separador.
+
+        :param ruta: Ubicación del archivo.
+        :type ruta: str
+        :param extension: La extensión del archivo.
+        :type extension: str
+        :return: Las filas leídas.
+        :rtype: list[list[str]]
+        """
+        with open(ruta, "r", newline="", encoding="utf-8-sig") as archivo:
+            if extension == ".tsv":
+                delimitador: str = "\t"
+            else:
+                muestra: str = archivo.read(8192)
+                archivo.seek(0)
+                try:
+                    delimitador = csv.Sniffer().sniff(
+                        muestra, delimiters=",;\t§|"
+                    ).delimiter
+                except csv.Error:
+                    delimitador = ","
+            try:
+                return [
+                    fila for fila in csv.reader(archivo, delimiter=delimitador)
+                    if any(campo.strip() for campo in fila)
+                ]
+            except csv.Error as e:
+                raise ValueError(str(e)) from e
+
+    def _leer_json(self, ruta: str) -> list[list[str]]:
+        """
+        Lee un .json con una lista de proposiciones, expresadas como objetos
+        con las claves ent1, rel, ent2 y peso, o como listas en ese orden.
+
+        :param ruta: Ubicación del archivo.
+        :type ruta: str
+        :return: Las filas leídas.
+        :rtype: list[list[str]]
+        """
+        with open(ruta, "r", encoding="utf-8-sig") as archivo:
+            contenido = json.load(archivo)
+        if not isinstance(contenido, list):
+            raise ValueError("Se esperaba una lista de proposiciones")
+        filas: list[list[str]] = []
+        for elemento in contenido:
+            if isinstance(elemento, dict):
+                filas.append([
+                    "" if elemento.get(c) is None else str(elemento.get(c))
+                    for c in self._columnas
+                ])
+            elif isinstance(elemento, list):
+                filas.append(["" if e is None else str(e) for e in elemento])
+            else:
+                filas.append([])
+        return filas
+
+    def _validar(self, fila: list[str]) -> list[str] | None:
+        """
+        Aplica a la fila las mismas reglas que al ingreso manual: las
+        entidades no pueden estar vacías y el peso debe ser un número
+        positivo. Si falta el peso, se usa el valor por defecto.
+
+        :param fila: Los campos de la fila.
+        :type fila: list[str]
+        :return: La proposición [ent1, rel, ent2, peso] o None si no es válida.
+        :rtype: list[str] | None
+        """
+        campos: list[str] = [c.strip() for c in fila[:4]]
+        if len(campos) < 3 or not campos[0] or not campos[2]:
+            return None
+        if len(campos) < 4 or not campos[3]:
+            campos = campos[:3] + [self._peso_por_defecto]
+        try:
+            if not float(campos[3]) > 0:
+                return None
+        except ValueError:
+            return None
+        return campos
@@ -0,0 +1,596 @@
+import bisect
+import contextlib
+import threading
+from collections import Counter
+from typing import Callable, Iterable, Iterator
+from aplicacion.documentos import almacenes
+
+
+class Tablas:
+    """
+    Clase encargada de mantener en memoria el contenido de las tablas del
+    diagrama. Se carga una única vez y es compartida por los ámbitos de
+    gestión: las lecturas se resuelven sobre las estructuras en memoria y
+    cada modificación se persiste también en el motor de almacenamiento.
+
+    :param almacen: El motor que persiste las tablas (.csv o SQLite), o la bitácora que lo antecede.
+    :type almacen: AlmacenCSV | AlmacenSQLite | Bitacora
+    :param normalizar: Quita el justificado del texto de nodos y vértices para poder compararlos.
+    :type normalizar: Callable[[str], str]
+    """
+
+    def __init__(
+        self,
+        almacen: almacenes.AlmacenCSV | almacenes.AlmacenSQLite | almacenes.Bitacora,
+        normalizar: Callable[[str], str]
+    ):
+        self._almacen: almacenes.AlmacenCSV | almacenes.AlmacenSQLite | almacenes.Bitacora = almacen
+        # Las tareas en segundo plano pueden modificar las tablas
+        # desde distintos hilos
+        self._cerrojo: threading.RLock = threading.RLock()
+        self._encabezados: dict[str, list[str]] = {}
+        # Las filas eliminadas quedan anuladas (None) en su lugar, para no
+        # correr las siguientes, hasta que la tabla se compacta
+        self._filas: dict[str, list[dict[str, str] | None]] = {}
+        self._anuladas: dict[str, list[int]] = {}
+        # Se incrementa con cada modificación de la tabla, para que quien
+        # derive datos de ella sepa cuándo recalcularlos
+        self._versiones: dict[str, int] = {
+            tabla: 0 for tabla in almacen.nombres
+        }
+        # Posiciones de cada id en la lista de filas (varias, si el id se
+        # repite). Las proposiciones no tienen id y se ubican por su vértice
+        self._posiciones: dict[str, dict[str, list[int]]] = {}
+        # Índice del texto normalizado de nodos y vértices a sus ids
+        self._normalizar: Callable[[str], str] = normalizar
+        self._columnas_texto: dict[str, str] = {
+            "nodos": "nodo", "vertices": "vertice"
+        }
+        self._indice_texto: dict[str, dict[str, list[str]]] = {}
+        # Proposiciones registradas, como tuplas (ent1, rel, ent2, peso)
+        self._claves_proposiciones: Counter[tuple[str, ...]] = Counter()
+        # Cantidad de proposiciones en las que participa cada nodo y vértice
+        self._referencias: dict[str, Counter[str]] = {
+            "nodos": Counter(), "vertices": Counter()
+        }
+        # Lotes abiertos y tablas modificadas dentro de ellos, que se
+        # persisten una sola vez al cerrar el lote
+        self._lotes: int = 0
+        self._pendientes: set[str] = set()
+        self.cargar()
+
+    def agregar(self, tabla: str, valores: Iterable) -> None:
+        """
+        Agrega una fila al final de la tabla indicada.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param valores: Los valores de la fila, en el orden del encabezado.
+        :type valores: Iterable
+        """
+        with self._cerrojo:
+            fila: dict[str, str] = dict(
+                zip(self._encabezados[tabla], [str(v) for v in valores])
+            )
+            self._filas[tabla].append(fila)
+            clave: str = self._columna_clave(tabla)
+            if clave in fila:
+                self._posiciones[tabla].setdefault(fila[clave], []).append(
+                    len(self._filas[tabla]) - 1
+                )
+            self._indexar(tabla, fila)
+            self._versiones[tabla] += 1
+            if not self._diferir(tabla):
+                self._almacen.agregar(tabla, self._filas[tabla])
+
+    def borrar(self, tabla: str, id_elem: str) -> None:
+        """
+        Elimina de la tabla la fila del elemento cuyo id recibe como argumento.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param id_elem: El id del elemento.
+        :type id_elem: str
+        """
+        with self._cerrojo:
+            posicion: int = self._posicion(tabla, id_elem)
+            if posicion != -1:
+                self._quitar(tabla, posicion)
+
+    def borrar_fila(self, tabla: str, posicion: int) -> dict[str, str]:
+        """
+        Elimina la fila que ocupa la posición indicada (sin contar el
+        encabezado) y la retorna.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila.
+        :type posicion: int
+        :return: La fila eliminada.
+        :rtype: dict[str, str]
+        """
+        with self._cerrojo:
+            if posicion < 0:
+                posicion += self.cantidad(tabla)
+            return self._quitar(tabla, self._fisica(tabla, posicion))
+
+    def buscar(self, tabla: str, texto: str) -> str:
+        """
+        Retorna el id del nodo o vértice cuyo texto, sin el justificado,
+        coincide con el recibido. Si hay varios, retorna el registrado
+        primero.
+
+        :param tabla: El nombre de la tabla (nodos o vértices).
+        :type tabla: str
+        :param texto: El texto buscado.
+        :type texto: str
+        :return: El id del elemento o una cadena vacía si no existe.
+        :rtype: str
+        """
+        with self._cerrojo:
+            ids: list[str] = self._indice_texto[tabla].get(
+                self._normalizar(texto), []
+            )
+            if not ids:
+                return ""
+            return min(ids, key=int)
+
+    def cantidad(self, tabla: str) -> int:
+        """
+        Retorna la cantidad de filas de la tabla, sin contar el encabezado.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: La cantidad de filas.
+        :rtype: int
+        """
+        with self._cerrojo:
+            return len(self._filas[tabla]) - len(self._anuladas[tabla])
+
+    def cargar(self) -> None:
+        """
+        Lee las tablas y reemplaza el contenido en memoria. Se llama al
+        iniciar y cada vez que los archivos cambian por fuera de esta clase
+        (al cargar un proyecto o recuperar un respaldo).
+        """
+        with self._cerrojo:
+            for tabla in self._almacen.nombres:
+                encabezado, filas = self._almacen.leer(tabla)
+                self._encabezados[tabla] = encabezado
+                self._filas[tabla] = filas
+                self._reindexar(tabla)
+                self._versiones[tabla] += 1
+
+    def cerrar(self) -> None:
+        """
+        Libera los archivos que el motor de almacenamiento mantiene abiertos,
+        antes de que sean reemplazados por los de un proyecto. La próxima
+        operación los vuelve a abrir.
+        """
+        with self._cerrojo:
+            self._almacen.cerrar()
+
+    def editar(self, tabla: str, id_elem: str, cambios: dict[str, str]) -> None:
+        """
+        Reemplaza en la fila del elemento indicado los valores recibidos.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param id_elem: El id del elemento.
+        :type id_elem: str
+        :param cambios: Los nuevos valores.
+        :type cambios: dict[str, str]
+        """
+        with self._cerrojo:
+            posicion: int = self._posicion(tabla, id_elem)
+            if posicion == -1:
+                return
+            # Las posiciones de los ids siempre son de filas vigentes
+            fila: dict[str, str] = self._filas[tabla][posicion]  # type: ignore
+            self._desindexar(tabla, fila)
+            for campo, valor in cambios.items():
+                fila[campo] = valor
+            self._indexar(tabla, fila)
+            self._versiones[tabla] += 1
+            if not self._diferir(tabla):
+                self._almacen.editar(tabla, posicion, self._filas[tabla])
+
+    def editar_columna(
+        self, tabla: str, campo: str, funcion: Callable[[str], str]
+    ) -> None:
+        """
+        Aplica la función recibida al campo indicado de todas las filas.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param campo: La columna a modificar.
+        :type campo: str
+        :param funcion: Recibe el valor actual y retorna el nuevo.
+        :type funcion: Callable[[str], str]
+        """
+        with self._cerrojo:
+            for fila in self._filas[tabla]:
+                if fila is not None:
+                    fila[campo] = funcion(fila[campo])
+            self._reindexar(tabla)
+            self._versiones[tabla] += 1
+            if not self._diferir(tabla):
+                self._volcar(tabla)
+
+    def editar_donde(
+        self, tabla: str, campo: str, valor: str, cambios: dict[str, str]
+    ) -> None:
+        """
+        Aplica los cambios a las filas cuyo campo coincide con el valor
+        recibido. Si el campo es vacío, los aplica a todas las filas. Si es
+        la columna por la que se ubican las filas y no se modifica, sólo
+        recorre y escribe las filas que coinciden.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param campo: La columna a comparar.
+        :type campo: str
+        :param valor: El valor buscado.
+        :type valor: str
+        :param cambios: Los nuevos valores.
+        :type cambios: dict[str, str]
+        """
+        with self._cerrojo:
+            clave: str = self._columna_clave(tabla)
+            if campo == clave and clave not in cambios:
+                posiciones: list[int] = list(
+                    self._posiciones[tabla].get(valor, [])
+                )
+                for posicion in posiciones:
+                    # Las posiciones indexadas siempre son de filas vigentes
+                    fila: dict[str, str] = self._filas[tabla][posicion]  # type: ignore
+                    self._desindexar(tabla, fila)
+                    fila.update(cambios)
+                    self._indexar(tabla, fila)
+                self._versiones[tabla] += 1
+                if not self._diferir(tabla):
+                    for posicion in posiciones:
+                        self._almacen.editar(tabla, posicion, self._filas[tabla])
+                return
+            for fila_actual in self._filas[tabla]:
+                if fila_actual is not None and (
+                    not campo or fila_actual[campo] == valor
+                ):
+                    fila_actual.update(cambios)
+            self._reindexar(tabla)
+            self._versiones[tabla] += 1
+            if not self._diferir(tabla):
+                self._volcar(tabla)
+
+    def existe_proposicion(self, proposicion: dict[str, str]) -> bool:
+        """
+        Indica si la proposición ya está registrada en la tabla.
+
+        :param proposicion: Los ids de ent1, rel, ent2 y el peso.
+        :type proposicion: dict[str, str]
+        :return: Verdadero si la proposición existe.
+        :rtype: bool
+        """
+        with self._cerrojo:
+            return self._claves_proposiciones[
+                self._clave_proposicion(proposicion)
+            ] > 0
+
+    def fila(self, tabla: str, id_elem: str) -> dict[str, str]:
+        """
+        Retorna una copia de la fila del elemento indicado o un diccionario
+        vacío si no existe.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param id_elem: El id del elemento.
+        :type id_elem: str
+        :return: La fila del elemento.
+        :rtype: dict[str, str]
+        """
+        with self._cerrojo:
+            posicion: int = self._posicion(tabla, id_elem)
+            if posicion == -1:
+                return {}
+            return dict(self._filas[tabla][posicion] or {})
+
+    @contextlib.contextmanager
+    def lote(self) -> Iterator[None]:
+        """
+        Agrupa varias modificaciones: mientras el lote está abierto los
+        cambios se aplican en memoria y ningún otro hilo accede a las tablas.
+        Al cerrarlo, cada tabla modificada se persiste una única vez. Los
+        lotes pueden anidarse; sólo el más externo persiste los cambios.
+
+        :return: Un contexto que delimita el lote.
+        :rtype: Iterator[None]
+        """
+        with self._cerrojo:
+            self._lotes += 1
+            try:
+                yield
+            finally:
+                self._lotes -= 1
+                if not self._lotes:
+                    for tabla in self._almacen.nombres:
+                        if tabla in self._pendientes:
+                            self._volcar(tabla)
+                    self._pendientes.clear()
+
+    def referencias(self, tabla: str, id_elem: str) -> int:
+        """
+        Retorna la cantidad de proposiciones en las que participa el nodo
+        o vértice indicado.
+
+        :param tabla: El nombre de la tabla (nodos o vértices).
+        :type tabla: str
+        :param id_elem: El id del elemento.
+        :type id_elem: str
+        :return: La cantidad de referencias al elemento.
+        :rtype: int
+        """
+        with self._cerrojo:
+            return self._referencias[tabla][id_elem]
+
+    def registros(self, tabla: str) -> list[dict[str, str]]:
+        """
+        Retorna una copia de las filas de la tabla, en el orden en que
+        fueron registradas.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: Las filas de la tabla.
+        :rtype: list[dict[str, str]]
+        """
+        with self._cerrojo:
+            return [dict(fila) for fila in self._filas[tabla] if fila is not None]
+
+    def sincronizar(self) -> None:
+        """
+        Deja los archivos del motor de almacenamiento listos para ser
+        copiados, al guardar un proyecto o crear un respaldo.
+        """
+        with self._cerrojo:
+            self._almacen.sincronizar()
+
+    def siguiente_id(self, tabla: str) -> int:
+        """
+        Retorna el id que le corresponde al próximo elemento de la tabla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: El último id registrado más uno, o cero si está vacía.
+        :rtype: int
+        """
+        with self._cerrojo:
+            for fila in reversed(self._filas[tabla]):
+                if fila is not None:
+                    return int(fila["id"]) + 1
+            return 0
+
+    def vaciar(self, encabezados: dict[str, list[str]]) -> None:
+        """
+        Deja las tablas sólo con su encabezado.
+
+        :param encabezados: Los encabezados de cada tabla.
+        :type encabezados: dict[str, list[str]]
+        """
+        with self._cerrojo:
+            for tabla, encabezado in encabezados.items():
+                self._encabezados[tabla] = list(encabezado)
+                self._filas[tabla] = []
+                self._reindexar(tabla)
+                self._versiones[tabla] += 1
+                if not self._diferir(tabla):
+                    self._volcar(tabla)
+
+    def version(self, tabla: str) -> int:
+        """
+        Retorna la versión actual de la tabla, que cambia con cada
+        modificación.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: La versión de la tabla.
+        :rtype: int
+        """
+        with self._cerrojo:
+            return self._versiones[tabla]
+
+    def _clave_proposicion(self, fila: dict[str, str]) -> tuple[str, ...]:
+        """
+        Retorna la clave con la que se indexa una proposición.
+
+        :param fila: La fila de la proposición.
+        :type fila: dict[str, str]
+        :return: La tupla (ent1, rel, ent2, peso).
+        :rtype: tuple[str, ...]
+        """
+        return (fila["ent1"], fila["rel"], fila["ent2"], fila["peso"])
+
+    def _columna_clave(self, tabla: str) -> str:
+        """
+        Retorna la columna por la que se indexan las posiciones de las
+        filas de la tabla.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :return: El nombre de la columna.
+        :rtype: str
+        """
+        return "rel" if tabla == "proposiciones" else "id"
+
+    def _compactar(self, tabla: str) -> None:
+        """
+        Descarta las filas anuladas y recalcula la posición de cada id.
+        Las posiciones cambian, por lo que la tabla debe volcarse luego
+        en el motor de almacenamiento.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        """
+        self._filas[tabla] = [
+            fila for fila in self._filas[tabla] if fila is not None
+        ]
+        self._anuladas[tabla] = []
+        self._posiciones[tabla] = {}
+        clave: str = self._columna_clave(tabla)
+        if clave in self._encabezados[tabla]:
+            for posicion, fila in enumerate(self._filas[tabla]):
+                self._posiciones[tabla].setdefault(fila[clave], []).append(
+                    posicion
+                )
+
+    def _desindexar(self, tabla: str, fila: dict[str, str]) -> None:
+        """
+        Quita la fila de los índices, si la tabla está indexada.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param fila: La fila a quitar.
+        :type fila: dict[str, str]
+        """
+        if tabla in self._columnas_texto:
+            clave: str = self._normalizar(fila[self._columnas_texto[tabla]])
+            ids: list[str] = self._indice_texto[tabla].get(clave, [])
+            if fila["id"] in ids:
+                ids.remove(fila["id"])
+            if not ids:
+                self._indice_texto[tabla].pop(clave, None)
+        elif tabla == "proposiciones":
+            self._claves_proposiciones[self._clave_proposicion(fila)] -= 1
+            self._referencias["nodos"][fila["ent1"]] -= 1
+            self._referencias["nodos"][fila["ent2"]] -= 1
+            self._referencias["vertices"][fila["rel"]] -= 1
+
+    def _diferir(self, tabla: str) -> bool:
+        """
+        Si hay un lote abierto, marca la tabla para persistirla al cerrarlo.
+
+        :param tabla: El nombre de la tabla modificada.
+        :type tabla: str
+        :return: Verdadero si la escritura queda pendiente.
+        :rtype: bool
+        """
+        if self._lotes:
+            self._pendientes.add(tabla)
+            return True
+        return False
+
+    def _fisica(self, tabla: str, posicion: int) -> int:
+        """
+        Convierte la posición de una fila entre las vigentes en su
+        posición en la lista, que incluye a las anuladas.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición entre las filas vigentes.
+        :type posicion: int
+        :return: La posición en la lista de filas.
+        :rtype: int
+        """
+        anuladas: list[int] = self._anuladas[tabla]
+        fisica: int = posicion
+        # Cada fila anulada hasta la posición la corre un lugar
+        while True:
+            siguiente: int = posicion + bisect.bisect_right(anuladas, fisica)
+            if siguiente == fisica:
+                return fisica
+            fisica = siguiente
+
+    def _indexar(self, tabla: str, fila: dict[str, str]) -> None:
+        """
+        Agrega la fila a los índices, si la tabla está indexada.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param fila: La fila a agregar.
+        :type fila: dict[str, str]
+        """
+        if tabla in self._columnas_texto:
+            clave: str = self._normalizar(fila[self._columnas_texto[tabla]])
+            self._indice_texto[tabla].setdefault(clave, []).append(fila["id"])
+        elif tabla == "proposiciones":
+            self._claves_proposiciones[self._clave_proposicion(fila)] += 1
+            self._referencias["nodos"][fila["ent1"]] += 1
+            self._referencias["nodos"][fila["ent2"]] += 1
+            self._referencias["vertices"][fila["rel"]] += 1
+
+    def _posicion(self, tabla: str, id_elem: str) -> int:
+        """
+        Retorna la posición de la fila del elemento o -1 si no existe.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param id_elem: El id del elemento.
+        :type id_elem: str
+        :return: La posición de la fila.
+        :rtype: int
+        """
+        posiciones: list[int] = self._posiciones[tabla].get(id_elem, [])
+        return posiciones[0] if posiciones else -1
+
+    def _quitar(self, tabla: str, posicion: int) -> dict[str, str]:
+        """
+        Anula la fila de la posición indicada, actualiza los índices y
+        la quita del almacenamiento. Las demás filas no cambian de lugar.
+        Cuando las anuladas superan la cuarta parte de la tabla, la
+        compacta y la vuelca completa.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        :param posicion: La posición de la fila en la lista.
+        :type posicion: int
+        :return: La fila eliminada.
+        :rtype: dict[str, str]
+        """
+        fila: dict[str, str] | None = self._filas[tabla][posicion]
+        if fila is None:
+            raise IndexError(f"La fila {posicion} de {tabla} ya fue eliminada")
+        self._filas[tabla][posicion] = None
+        bisect.insort(self._anuladas[tabla], posicion)
+        self._desindexar(tabla, fila)
+        self._versiones[tabla] += 1
+        clave: str = self._columna_clave(tabla)
+        if clave in fila:
+            posiciones: list[int] = self._posiciones[tabla][fila[clave]]
+            posiciones.remove(posicion)
+            if not posiciones:
+                del self._posiciones[tabla][fila[clave]]
+        if not self._diferir(tabla):
+            anuladas: int = len(self._anuladas[tabla])
+            if anuladas > max(64, len(self._filas[tabla]) // 4):
+                self._volcar(tabla)
+            else:
+                self._almacen.quitar(tabla, posicion, self._filas[tabla])
+        return fila
+
+    def _reindexar(self, tabla: str) -> None:
+        """
+        Reconstruye los índices de la tabla a partir de sus filas.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        """
+        self._compactar(tabla)
+        if tabla in self._columnas_texto:
+            self._indice_texto[tabla] = {}
+        elif tabla == "proposiciones":
+            self._claves_proposiciones = Counter()
+            self._referencias = {"nodos": Counter(), "vertices": Counter()}
+        for fila in self._filas[tabla]:
+            self._indexar(tabla, fila)
+
+    def _volcar(self, tabla: str) -> None:
+        """
+        Compacta la tabla y la escribe completa en el motor de
+        almacenamiento.
+
+        :param tabla: El nombre de la tabla.
+        :type tabla: str
+        """
+        if self._anuladas[tabla]:
+            self._compactar(tabla)
+        self._almacen.volcar(
+            tabla, self._encabezados[tabla], self._filas[tabla]
+        )
@@ -1,8 +1,10 @@
+import io
+import threading
 import tkinter as tk
 from tkinter import PhotoImage
 from PIL import Image, ImageTk
 from aplicacion.interfaz import comunes
-from aplicacion.interfaz.componentes.elementos import emergente
+from aplicacion.interfaz.componentes.elementos import emergente, piramide
 
 
 class AreaDeGrafico:
@@ -22,6 +24,26 @@ class AreaDeGrafico:
         """
         self._gestor = gestor
         self._factor_zoom: float = 1.0  # Permite redimensionar el diagrama
+        # La imagen se muestra en mosaicos, y sólo se cargan los visibles
+        self._piramide: piramide.Piramide | None = None
+        self._mosaicos: dict[
+            tuple[int, int], tuple[ImageTk.PhotoImage, int, bool]
+        ] = {}
+        self._id_mosaicos: str | None = None
+        # Con cada zoom se muestra una vista previa de los mosaicos, que se
+        # reemplaza cuando se terminan de redimensionar en segundo plano
+        self._version_mosaicos: int = 0
+        self._refinados: list[
+            tuple[int, tuple[int, int] | None, Image.Image | None]
+        ] = []
+        self._refinando: int = 0
+        # La pirámide de cada diagrama se prepara en segundo plano
+        self._generacion: int = 0
+        self._piramide_nueva: tuple[int, piramide.Piramide | None] | None = None
+        # Con comunes.diagrama_en_lienzo, el diagrama se dibuja a partir
+        # de una escena, en lugar de mostrar una imagen
+        self._escena: dict = {}
+        self._puntos_a_px: float = 96 / 72  # Resolución de Graphviz
         self._contenedor_cuadro: tk.Frame = tk.Frame(  # Marco principal
             ancestro,  width=200, height=200, **comunes.atrb_contenedor_artf
         )        
@@ -34,12 +56,12 @@ class AreaDeGrafico:
             self._contenedor_cuadro, orient=tk.HORIZONTAL
         )
         self._bh.pack(side=tk.BOTTOM, fill=tk.X)
-        self._bh.config(command=self._cuadro.xview)
+        self._bh.config(command=lambda *args: self._mover_vista("x", *args))
         self._bv: tk.Scrollbar = tk.Scrollbar(
             self._contenedor_cuadro, orient=tk.VERTICAL
         )
         self._bv.pack(side = tk.RIGHT, fill=tk.Y)
-        self._bv.config(command=self._cuadro.yview)
+        self._bv.config(command=lambda *args: self._mover_vista("y", *args))
         self._cuadro.config(
             xscrollcommand=self._bh.set, yscrollcommand=self._bv.set
         )
@@ -55,23 +77,32 @@ class AreaDeGrafico:
         """
         return self._contenedor_cuadro
 
-    def cargar_imagen(self, ruta_img: str) -> None:
+    def cargar_imagen(self, ruta_img: str | bytes | dict) -> None:
         """
         La llama el Gestor para actualizar la imagen del canvas al agregar
         una proposición, al borrar la última o al editar algún atributo del
         diagrama.      
 
-        :param ruta_img: La ubicación del archivo png con el grafo generado por el Diagramador.
-        :type ruta_img: str
+        :param ruta_img: La ubicación del archivo png con el grafo generado por el Diagramador, su contenido o la escena a dibujar.
+        :type ruta_img: str | bytes | dict
         """
-        self._imagen: Image.Image = Image.open(ruta_img)      
-        self._imagen_tk: ImageTk.PhotoImage = ImageTk.PhotoImage(self._imagen)
-        ancho_img, alto_img = self._imagen.size
-        self._cuadro.config(scrollregion=(0, 0, ancho_img, alto_img))
-        self._img_id: int = self._cuadro.create_image(
-            0, 0, anchor=tk.NW, image=self._imagen_tk
-        )
-        self._redimensionar_img(1.0)
+        self._generacion += 1
+        if isinstance(ruta_img, dict):
+            self._escena = ruta_img
+            self._piramide = None
+            self._borrar_mosaicos()
+            self._dibujar_escena()
+            self._cuadro.pack(fill="both", expand=True)
+            return
+        self._escena = {}
+        self._cuadro.delete("escena")
+        # Mientras se decodifica la imagen, sigue visible la anterior
+        threading.Thread(
+            target=self._preparar_piramide,
+            args=(ruta_img, self._generacion),
+            daemon=True
+        ).start()
+        self._esperar_piramide(self._generacion)
         self._cuadro.pack(fill="both", expand=True)
 
     def actualizar_cuadro(self) -> None:
@@ -102,23 +133,117 @@ class AreaDeGrafico:
         :param factor: El factor de zoom.
         :type factor: float 
         """
-        if self._imagen is None:
+        if self._escena:
+            # El lienzo se vuelve a dibujar a la nueva escala
+            self._factor_zoom *= factor
+            self._dibujar_escena()
+            self._contenedor_cuadro.focus()
+            return
+        if self._piramide is None:
             return
         if self._factor_zoom == 1.0 and factor == 1.0:
             return        
         else:
+            # Sólo se generan los mosaicos visibles con el nuevo zoom
             self._factor_zoom *= factor
-            nueva_imagen: Image.Image = self._imagen.resize(
-                (int(self._imagen.width * self._factor_zoom),
-                 int(self._imagen.height * self._factor_zoom)),
-                Image.Resampling.LANCZOS
-            )
-            self._imagen_tk = ImageTk.PhotoImage(nueva_imagen)
-            ancho_img, alto_img = nueva_imagen.size
-            self._cuadro.config(scrollregion=(0, 0, ancho_img, alto_img))            
-            self._cuadro.itemconfig(self._img_id, image=self._imagen_tk)
+            self._borrar_mosaicos()
+            self._mostrar_mosaicos()
             self._contenedor_cuadro.focus()     
         
+    def _bezier(self, puntos: list[list[float]]) -> list[list[float]]:
+        """
+        Aproxima con segmentos una sucesión de curvas de Bézier cúbicas,
+        en la que cada curva comparte su primer punto con la anterior.
+
+        :param puntos: El punto inicial y tres puntos por cada curva.
+        :type puntos: list[list[float]]
+        :return: Los puntos de la línea poligonal.
+        :rtype: list[list[float]]
+        """
+        res: list[list[float]] = [puntos[0]]
+        for i in range(0, len(puntos) - 3, 3):
+            p0, p1, p2, p3 = puntos[i:i + 4]
+            for paso in range(1, 9):
+                t: float = paso / 8
+                u: float = 1 - t
+                res.append([
+                    u**3 * p0[j] + 3 * u**2 * t * p1[j]
+                    + 3 * u * t**2 * p2[j] + t**3 * p3[j]
+                    for j in (0, 1)
+                ])
+        return res
+
+    def _borrar_mosaicos(self) -> None:
+        """
+        Quita del canvas todos los mosaicos de la imagen.
+        """
+        self._cuadro.delete("mosaico")
+        self._mosaicos.clear()
+        # Los mosaicos que se estén redimensionando ya no sirven
+        self._version_mosaicos += 1
+
+    def _colocar_refinados(self) -> None:
+        """
+        Verifica periódicamente si hay mosaicos redimensionados en segundo
+        plano y reemplaza con ellos las vistas previas. Descarta los que
+        corresponden a un zoom o a un diagrama anterior.
+        """
+        while self._refinados:
+            version, posicion, mosaico = self._refinados.pop(0)
+            if posicion is None:  # Terminó uno de los hilos
+                self._refinando -= 1
+                continue
+            if version != self._version_mosaicos:
+                continue
+            actual = self._mosaicos.get(posicion)
+            if actual is None or actual[2]:
+                continue
+            imagen_tk: ImageTk.PhotoImage = ImageTk.PhotoImage(mosaico)
+            self._cuadro.itemconfig(actual[1], image=imagen_tk)
+            self._mosaicos[posicion] = (imagen_tk, actual[1], True)
+        if self._refinando > 0:
+            self._cuadro.after(30, self._colocar_refinados)
+
+    def _color(self, valor: str, alternativo: str) -> str:
+        """
+        Adapta un color de Graphviz al formato de Tk, que no admite
+        transparencias.
+
+        :param valor: El color del atributo.
+        :type valor: str
+        :param alternativo: El color a usar si Tk no reconoce el valor.
+        :type alternativo: str
+        :return: El color.
+        :rtype: str
+        """
+        if valor.startswith("#") and len(valor) == 9:
+            valor = valor[:7]
+        try:
+            self._cuadro.winfo_rgb(valor)
+        except tk.TclError:
+            return alternativo
+        return valor
+
+    def _coordenadas(
+        self, puntos: list[list[float]], escala: float, alto: float
+    ) -> list[float]:
+        """
+        Convierte puntos de Graphviz en coordenadas del canvas.
+
+        :param puntos: Los puntos, con el origen abajo a la izquierda.
+        :type puntos: list[list[float]]
+        :param escala: Los píxeles por punto de Graphviz.
+        :type escala: float
+        :param alto: El alto del diagrama, en puntos.
+        :type alto: float
+        :return: Las coordenadas x, y sucesivas.
+        :rtype: list[float]
+        """
+        res: list[float] = []
+        for x, y in puntos:
+            res.extend((x * escala, (alto - y) * escala))
+        return res
+
     def _desplazar(self, señal: str) -> None:
         """
         Método asociado a atajos de teclado para explorar el canvas usando
@@ -136,6 +261,110 @@ class AreaDeGrafico:
             self._cuadro.yview_scroll(-1, "units")
         elif señal == "b":
             self._cuadro.yview_scroll(1, "units")
+        self._programar_mosaicos()
+
+    def _dibujar(
+        self,
+        operaciones: list[dict],
+        color: str,
+        relleno: str,
+        estilo: str,
+        escala: float,
+        alto: float
+    ) -> None:
+        """
+        Ejecuta sobre el canvas las operaciones de dibujo de un elemento,
+        en el formato xdot de la salida json de Graphviz. Los colores de
+        las operaciones se reemplazan por los del elemento, y se invierte
+        el eje vertical.
+
+        :param operaciones: Las operaciones de dibujo.
+        :type operaciones: list[dict]
+        :param color: El color de líneas y textos.
+        :type color: str
+        :param relleno: El color de relleno de todas las figuras. Si es vacío, sólo se rellenan las que Graphviz indica, con el color de líneas.
+        :type relleno: str
+        :param estilo: El atributo style del elemento.
+        :type estilo: str
+        :param escala: Los píxeles por punto de Graphviz.
+        :type escala: float
+        :param alto: El alto del diagrama, en puntos.
+        :type alto: float
+        """
+        trazo: tuple[int, ...] = ()
+        if "dashed" in estilo:
+            trazo = (6, 4)
+        elif "dotted" in estilo:
+            trazo = (1, 3)
+        fuente: tuple[str, int] = ("Sans", -12)
+        for op in operaciones:
+            tipo: str = op["op"]
+            if tipo in ("e", "E"):
+                x, y, rx, ry = op["rect"]
+                self._cuadro.create_oval(
+                    (x - rx) * escala, (alto - y - ry) * escala,
+                    (x + rx) * escala, (alto - y + ry) * escala,
+                    outline=color, dash=trazo, tags="escena",
+                    fill=relleno or (color if tipo == "E" else "")
+                )
+            elif tipo in ("p", "P"):
+                self._cuadro.create_polygon(
+                    self._coordenadas(op["points"], escala, alto),
+                    outline=color, dash=trazo, tags="escena",
+                    fill=relleno or (color if tipo == "P" else "")
+                )
+            elif tipo == "L":
+                self._cuadro.create_line(
+                    self._coordenadas(op["points"], escala, alto),
+                    fill=color, dash=trazo, tags="escena"
+                )
+            elif tipo in ("b", "B"):
+                self._cuadro.create_line(
+                    self._coordenadas(self._bezier(op["points"]), escala, alto),
+                    fill=color, dash=trazo, tags="escena"
+                )
+            elif tipo == "F":
+                fuente = (op["face"], -max(1, round(op["size"] * escala)))
+            elif tipo == "T":
+                x, y = op["pt"]
+                # Graphviz ubica el texto sobre la línea de base
+                self._cuadro.create_text(
+                    x * escala, (alto - y) * escala - fuente[1] * 0.2,
+                    text=op["text"], fill=color, font=fuente, tags="escena",
+                    anchor={"l": tk.SW, "r": tk.SE}.get(op["align"], tk.S)
+                )
+
+    def _dibujar_escena(self) -> None:
+        """
+        Dibuja en el canvas los nodos y vértices de la escena, con las
+        operaciones que calculó Graphviz y los atributos de estilo propios
+        de cada elemento.
+        """
+        self._cuadro.delete("escena")
+        escala: float = self._puntos_a_px * self._factor_zoom
+        alto: float = self._escena["alto"]
+        self._cuadro.config(scrollregion=(
+            0, 0, self._escena["ancho"] * escala, alto * escala
+        ))
+        for nodo in self._escena["nodos"]:
+            estilo: dict[str, str] = nodo["estilo"]
+            borde: str = self._color(estilo["color"], "black")
+            relleno: str = (
+                self._color(estilo["fillcolor"] or estilo["color"], "lightgrey")
+                if "filled" in estilo["style"] else ""
+            )
+            self._dibujar(nodo.get("_draw_", []), borde, relleno, estilo["style"], escala, alto)
+            texto: str = self._color(estilo["fontcolor"], "black")
+            self._dibujar(nodo.get("_ldraw_", []), texto, "", "", escala, alto)
+        for vertice in self._escena["vertices"]:
+            estilo = vertice["estilo"]
+            linea: str = self._color(estilo["color"], "black")
+            self._dibujar(vertice.get("_draw_", []), linea, "", estilo["style"], escala, alto)
+            for flecha in ("_hdraw_", "_tdraw_"):
+                self._dibujar(vertice.get(flecha, []), linea, "", "", escala, alto)
+            texto = self._color(estilo["fontcolor"], "black")
+            for etiqueta in ("_ldraw_", "_hldraw_", "_tldraw_"):
+                self._dibujar(vertice.get(etiqueta, []), texto, "", "", escala, alto)
 
     def _enfocar(self) -> None:
         """
@@ -145,11 +374,34 @@ class AreaDeGrafico:
         """
         self._contenedor_cuadro.focus()
 
+    def _esperar_piramide(self, generacion: int) -> None:
+        """
+        Verifica periódicamente si terminó de prepararse la pirámide de la
+        imagen y, en ese caso, la muestra. Si llegó otro diagrama mientras
+        tanto, deja de esperarla.
+
+        :param generacion: El número de diagrama cargado.
+        :type generacion: int
+        """
+        if generacion != self._generacion:
+            return
+        nueva = self._piramide_nueva
+        if nueva is None or nueva[0] != generacion:
+            self._cuadro.after(30, self._esperar_piramide, generacion)
+            return
+        self._piramide_nueva = None
+        if nueva[1] is None:
+            return
+        self._piramide = nueva[1]
+        self._borrar_mosaicos()
+        self._mostrar_mosaicos()
+
     def _establecer_atajos(self) -> None:
         """
         Vincula los artefactos con los atajos de teclado.
         """
         self._contenedor_cuadro.bind("<Enter>", lambda e : self._enfocar())
+        self._cuadro.bind("<Configure>", lambda e: self._programar_mosaicos())
         
         self._contenedor_cuadro.bind_all(
             "<Control-KP_Subtract>", lambda e: self._redimensionar_img(0.9)
@@ -184,6 +436,151 @@ class AreaDeGrafico:
         self._contenedor_cuadro.bind("<Control-g>",lambda e: self._volver(8))
         self._contenedor_cuadro.bind("<Control-G>",lambda e: self._volver(8))
        
+    def _mostrar_mosaicos(self) -> None:
+        """
+        Carga en el canvas los mosaicos de la imagen que quedan a la vista,
+        y uno más alrededor, con el zoom actual. Quita los que ya no se ven.
+        """
+        self._id_mosaicos = None
+        if self._piramide is None:
+            return
+        ancho, alto = self._piramide.tamaño(self._factor_zoom)
+        self._cuadro.config(scrollregion=(0, 0, ancho, alto))
+        lado: int = self._piramide.lado
+        # Si el diagrama nuevo es más chico, la vista puede quedar fuera
+        x0: int = min(
+            int(self._cuadro.canvasx(0)),
+            max(0, ancho - self._cuadro.winfo_width())
+        )
+        y0: int = min(
+            int(self._cuadro.canvasy(0)),
+            max(0, alto - self._cuadro.winfo_height())
+        )
+        columnas: range = range(
+            max(0, x0 // lado - 1),
+            min((ancho - 1) // lado, (x0 + self._cuadro.winfo_width()) // lado + 1) + 1
+        )
+        filas: range = range(
+            max(0, y0 // lado - 1),
+            min((alto - 1) // lado, (y0 + self._cuadro.winfo_height()) // lado + 1) + 1
+        )
+        for posicion in list(self._mosaicos):
+            if posicion[0] not in columnas or posicion[1] not in filas:
+                self._cuadro.delete(self._mosaicos.pop(posicion)[1])
+        pendientes: list[tuple[int, int]] = []
+        for fila in filas:
+            for columna in columnas:
+                if (columna, fila) in self._mosaicos:
+                    continue
+                # Si el mosaico no está listo, se muestra una vista previa
+                definitivo: bool = True
+                mosaico: Image.Image | None = self._piramide.disponible(
+                    columna, fila, self._factor_zoom
+                )
+                if mosaico is None:
+                    definitivo = False
+                    mosaico = self._piramide.mosaico(
+                        columna, fila, self._factor_zoom, rapido=True
+                    )
+                if mosaico is None:
+                    continue
+                imagen_tk: ImageTk.PhotoImage = ImageTk.PhotoImage(mosaico)
+                id_item: int = self._cuadro.create_image(
+                    columna * lado, fila * lado,
+                    anchor=tk.NW, image=imagen_tk, tags="mosaico"
+                )
+                self._mosaicos[(columna, fila)] = (imagen_tk, id_item, definitivo)
+                if not definitivo:
+                    pendientes.append((columna, fila))
+        if not pendientes:
+            return
+        threading.Thread(
+            target=self._refinar_mosaicos,
+            args=(
+                self._piramide, self._factor_zoom,
+                pendientes, self._version_mosaicos
+            ),
+            daemon=True
+        ).start()
+        self._refinando += 1
+        if self._refinando == 1:
+            self._cuadro.after(30, self._colocar_refinados)
+
+    def _mover_vista(self, eje: str, *args) -> None:
+        """
+        Desplaza el canvas desde las barras y carga los mosaicos que
+        quedan a la vista.
+
+        :param eje: "x" o "y", según la barra.
+        :type eje: str
+        :param args: Los argumentos que envía la barra de desplazamiento.
+        """
+        if eje == "x":
+            self._cuadro.xview(*args)
+        else:
+            self._cuadro.yview(*args)
+        self._programar_mosaicos()
+
+    def _preparar_piramide(self, origen: str | bytes, generacion: int) -> None:
+        """
+        Decodifica la imagen y genera sus resoluciones, en segundo plano.
+
+        :param origen: La ubicación del archivo png o su contenido.
+        :type origen: str | bytes
+        :param generacion: El número de diagrama cargado.
+        :type generacion: int
+        """
+        try:
+            imagen: Image.Image = Image.open(
+                io.BytesIO(origen) if isinstance(origen, bytes) else origen
+            )
+            imagen.load()
+            self._piramide_nueva = (generacion, piramide.Piramide(imagen))
+        except Exception as e:
+            print(f"Error al cargar el diagrama: {e}")
+            self._piramide_nueva = (generacion, None)
+
+    def _programar_mosaicos(self) -> None:
+        """
+        Actualiza los mosaicos visibles cuando el canvas queda libre, una
+        sola vez aunque se desplace varias veces seguidas.
+        """
+        if self._id_mosaicos is None:
+            self._id_mosaicos = self._cuadro.after_idle(self._mostrar_mosaicos)
+
+    def _refinar_mosaicos(
+        self,
+        origen: piramide.Piramide,
+        factor: float,
+        pendientes: list[tuple[int, int]],
+        version: int
+    ) -> None:
+        """
+        Redimensiona con el filtro de calidad los mosaicos que se muestran
+        como vista previa, en segundo plano. Se detiene si cambia el zoom
+        o el diagrama.
+
+        :param origen: La pirámide del diagrama.
+        :type origen: piramide.Piramide
+        :param factor: El factor de zoom.
+        :type factor: float
+        :param pendientes: La columna y la fila de cada mosaico.
+        :type pendientes: list[tuple[int, int]]
+        :param version: El número de zoom al que corresponden los mosaicos.
+        :type version: int
+        """
+        try:
+            for posicion in pendientes:
+                if version != self._version_mosaicos:
+                    break
+                mosaico: Image.Image | None = origen.mosaico(
+                    posicion[0], posicion[1], factor
+                )
+                if mosaico is not None:
+                    self._refinados.append((version, posicion, mosaico))
+        finally:
+            self._refinados.append((version, None, None))
+
     def _volver(self, señal: int) -> None:
         """
         Método asociado a atajos de teclado. Reenvía al Gestor la señal que
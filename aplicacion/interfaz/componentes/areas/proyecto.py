@@ -183,6 +183,16 @@ class AreaProyecto:
             row=6, column=0, sticky="ew", padx=(15,15), pady=(15,15)
         )
         self._btn_cargar_proyecto.focus_set()
+        # Importar proposiciones
+        self._btn_importar: tk.Button = tk.Button(
+            self._marco_botonera,
+            text="Importar proposiciones",
+            command=self._importar_proposiciones,
+            **comunes.atrb_btn_proyecto_ap
+        )
+        self._btn_importar.grid(
+            row=7, column=0, sticky="ew", padx=(15,15), pady=(0,15)
+        )
         # Atajos
         self._btn_atajos: tk.Button = tk.Button(
             self._marco_botonera,
@@ -191,13 +201,13 @@ class AreaProyecto:
             **comunes.atrb_btn_proyecto_at
         )
         self._btn_atajos.grid(
-            row=7, column=0, sticky="ew", padx=(15,15), pady=(15,0)
+            row=8, column=0, sticky="ew", padx=(15,15), pady=(15,0)
         )
         self._sep2: ttk.Separator = ttk.Separator(
             self._marco_botonera, orient="horizontal"
         )
         self._sep2.grid(
-            row=8, column=0, columnspan=1, sticky="ew", padx=(15,15), pady=(15,0)
+            row=9, column=0, columnspan=1, sticky="ew", padx=(15,15), pady=(15,0)
         )
 
 
@@ -228,6 +238,18 @@ class AreaProyecto:
         self._btn_cargar_proyecto.bind(
             "<Leave>", self._ne_btn_cargar_proyecto.ocultar
         )
+        # Importar proposiciones
+        tex_ne3: str = "Agrega las proposiciones de un .csv, .tsv o .json "
+        tex_ne3 = tex_ne3 + "con las columnas ent1, rel, ent2 y peso"
+        self._ne_btn_importar: emergente.NotaEmergente = emergente.NotaEmergente(
+            self._btn_importar, tex_ne3
+        )
+        self._btn_importar.bind(
+            "<Enter>", self._ne_btn_importar.mostrar
+        )
+        self._btn_importar.bind(
+            "<Leave>", self._ne_btn_importar.ocultar
+        )
 
     def _crear_seccion_atajos(self) -> None:
         """
@@ -348,6 +370,24 @@ class AreaProyecto:
         else:
             self.mostrar_aviso("Seleccione un directorio")          
 
+    def _importar_proposiciones(self) -> None:
+        """
+        Abre una ventana de diálogo que permite elegir el archivo con las
+        proposiciones a importar y lo envía al gestor.
+        """
+        titulo: str = "Seleccione el archivo con las proposiciones"
+        ruta: str = filedialog.askopenfilename(
+            title=titulo,
+            filetypes=[
+                ("Proposiciones", "*.csv *.tsv *.json"),
+                ("Todos los archivos", "*.*")
+            ]
+        )
+        if ruta:
+            self._gestor.importar_proposiciones(ruta)
+        else:
+            self.mostrar_aviso("Seleccione un archivo")
+
     def _cargar_proyecto(self) -> None:
         """
         Abre un proyecto guardado. Si la operación falla, restaura los datos
@@ -114,14 +114,20 @@ class AreaDeTexto:
             self._gestor.guardar_proyecto_desde_atajo()
         return "break"
 
-    def cargar_texto_retornado(self, texto: str) -> None:
+    def cargar_texto_retornado(self, texto: str, agregar: bool = False) -> None:
         """
         Recibe desde el Gestor la indicación para actualizar el área de texto,
-        cuando el contenido se terminó de extraer.
+        con cada parte del contenido que se extrae.
 
         :param texto: El contenido a cargar.
         :type texto: str
+        :param agregar: Si es verdadero, se agrega al final del contenido previo.
+        :type agregar: bool
         """
+        if agregar:
+            # Sólo se da formato a lo agregado, sin mover la vista
+            self._area_texto.insert(tk.END, texto, "formato")
+            return
         self._area_texto.delete(1.0, tk.END)
         self._area_texto.insert(tk.END, texto)
         self._area_texto.tag_add("formato", "1.0", "end")
@@ -0,0 +1,185 @@
+import collections
+import math
+import threading
+from PIL import Image
+
+
+class Piramide:
+    """
+    Clase encargada de conservar el diagrama en varias resoluciones, cada
+    una la mitad de la anterior, para obtener de la más cercana los
+    mosaicos que se muestran con cada nivel de zoom. Su constructor genera
+    las resoluciones, por lo que conviene crearla en segundo plano. Los
+    mosaicos redimensionados con el filtro de calidad se recuerdan, hasta
+    un límite de memoria, para que volver a un zoom anterior no cueste nada.
+
+    :param imagen: La imagen del diagrama en su resolución original.
+    :type imagen: Image.Image
+    :param lado: El lado, en píxeles, de cada mosaico.
+    :type lado: int
+    :param limite_memoria: El tamaño máximo, en bytes, de los mosaicos recordados.
+    :type limite_memoria: int
+    """
+
+    def __init__(
+        self,
+        imagen: Image.Image,
+        lado: int = 512,
+        limite_memoria: int = 256 * 1024 * 1024
+    ):
+        """
+        Constructor de la clase Piramide.
+        """
+        if imagen.mode not in ("RGB", "RGBA"):
+            imagen = imagen.convert("RGBA")
+        self.lado: int = lado
+        self._niveles: list[Image.Image] = [imagen]
+        while max(self._niveles[-1].size) > lado:
+            self._niveles.append(self._niveles[-1].reduce(2))
+        self._limite_memoria: int = limite_memoria
+        self._ocupado: int = 0
+        self._recordados: collections.OrderedDict[
+            tuple[float, int, int], Image.Image
+        ] = collections.OrderedDict()
+        self._cerrojo: threading.Lock = threading.Lock()
+
+    def disponible(
+        self, columna: int, fila: int, factor: float
+    ) -> Image.Image | None:
+        """
+        Obtiene un mosaico con el filtro de calidad sólo si no hace falta
+        redimensionarlo: si coincide con una resolución o ya fue calculado.
+
+        :param columna: La columna del mosaico.
+        :type columna: int
+        :param fila: La fila del mosaico.
+        :type fila: int
+        :param factor: El factor de zoom respecto de la imagen original.
+        :type factor: float
+        :return: El mosaico, o None si hay que calcularlo.
+        :rtype: Image.Image | None
+        """
+        imagen: Image.Image = self._niveles[self._nivel(factor)]
+        if imagen.size == self.tamaño(factor):
+            return self.mosaico(columna, fila, factor)
+        with self._cerrojo:
+            clave: tuple[float, int, int] = (round(factor, 6), columna, fila)
+            if clave in self._recordados:
+                self._recordados.move_to_end(clave)
+                return self._recordados[clave]
+        return None
+
+    def mosaico(
+        self, columna: int, fila: int, factor: float, rapido: bool = False
+    ) -> Image.Image | None:
+        """
+        Obtiene un mosaico del diagrama con el zoom indicado, a partir de la
+        menor resolución que no sea inferior a la requerida.
+
+        :param columna: La columna del mosaico.
+        :type columna: int
+        :param fila: La fila del mosaico.
+        :type fila: int
+        :param factor: El factor de zoom respecto de la imagen original.
+        :type factor: float
+        :param rapido: Si es verdadero, usa un filtro de menor calidad, para una vista previa.
+        :type rapido: bool
+        :return: El mosaico, o None si queda fuera del diagrama.
+        :rtype: Image.Image | None
+        """
+        ancho, alto = self.tamaño(factor)
+        x0: int = columna * self.lado
+        y0: int = fila * self.lado
+        x1: int = min(x0 + self.lado, ancho)
+        y1: int = min(y0 + self.lado, alto)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        imagen: Image.Image = self._niveles[self._nivel(factor)]
+        if imagen.size == (ancho, alto):
+            return imagen.crop((x0, y0, x1, y1))
+        clave: tuple[float, int, int] = (round(factor, 6), columna, fila)
+        if not rapido:
+            with self._cerrojo:
+                if clave in self._recordados:
+                    self._recordados.move_to_end(clave)
+                    return self._recordados[clave]
+        escala_x: float = imagen.width / ancho
+        escala_y: float = imagen.height / alto
+        # Recorto la región con un margen para el filtro, que toma en cuenta
+        # los píxeles vecinos, así no se notan las uniones entre mosaicos.
+        # Redimensionar sólo el recorte evita procesar la imagen completa
+        margen: int = math.ceil(3 * max(escala_x, escala_y, 1.0)) + 1
+        izquierda: int = max(0, math.floor(x0 * escala_x) - margen)
+        arriba: int = max(0, math.floor(y0 * escala_y) - margen)
+        recorte: Image.Image = imagen.crop((
+            izquierda,
+            arriba,
+            min(imagen.width, math.ceil(x1 * escala_x) + margen),
+            min(imagen.height, math.ceil(y1 * escala_y) + margen)
+        ))
+        res: Image.Image = recorte.resize(
+            (x1 - x0, y1 - y0),
+            Image.Resampling.BILINEAR if rapido else Image.Resampling.LANCZOS,
+            box=(
+                x0 * escala_x - izquierda, y0 * escala_y - arriba,
+                x1 * escala_x - izquierda, y1 * escala_y - arriba
+            )
+        )
+        if not rapido:
+            self._recordar(clave, res)
+        return res
+
+    def tamaño(self, factor: float) -> tuple[int, int]:
+        """
+        Calcula el tamaño del diagrama con el zoom indicado.
+
+        :param factor: El factor de zoom respecto de la imagen original.
+        :type factor: float
+        :return: El ancho y el alto, en píxeles.
+        :rtype: tuple[int, int]
+        """
+        original: Image.Image = self._niveles[0]
+        return (
+            max(1, int(original.width * factor)),
+            max(1, int(original.height * factor))
+        )
+
+    def _nivel(self, factor: float) -> int:
+        """
+        Elige la menor resolución que no sea inferior a la requerida.
+
+        :param factor: El factor de zoom respecto de la imagen original.
+        :type factor: float
+        :return: El índice de la resolución.
+        :rtype: int
+        """
+        nivel: int = 0
+        while (
+            nivel + 1 < len(self._niveles)
+            and 2 ** -(nivel + 1) >= factor
+        ):
+            nivel += 1
+        return nivel
+
+    def _recordar(self, clave: tuple[float, int, int], mosaico: Image.Image) -> None:
+        """
+        Guarda un mosaico calculado y descarta los usados hace más tiempo
+        si se supera el límite de memoria.
+
+        :param clave: El zoom, la columna y la fila del mosaico.
+        :type clave: tuple[float, int, int]
+        :param mosaico: El mosaico.
+        :type mosaico: Image.Image
+        """
+        tamaño: int = mosaico.width * mosaico.height * len(mosaico.getbands())
+        with self._cerrojo:
+            if clave in self._recordados:
+                return
+            self._recordados[clave] = mosaico
+            self._ocupado += tamaño
+            while self._ocupado > self._limite_memoria and len(self._recordados) > 1:
+                _, descartado = self._recordados.popitem(last=False)
+                self._ocupado -= (
+                    descartado.width * descartado.height
+                    * len(descartado.getbands())
+                )
@@ -147,15 +147,19 @@ class EdicionNodo:
         """
         self._nodo_individual.reiniciar_cambios()
 
-    def _apilar_atributos_nodo(self, id_nodo: str) -> None:
+    def _apilar_atributos_nodo(self, ids_nodos: list[str]) -> None:
         """
-        Obtiene los atributos del nodo a partir del id y los almacena.
+        Obtiene los atributos de los nodos a partir de sus ids y los almacena
+        juntos, para deshacer la edición en un solo paso.
 
-        :param id_nodo: El id del nodo del cual se obtienen los atributos.
-        :type id_nodo: str
-        """
-        nodo_editado: tuple[str, dict[str, str]] = self._gestor.obtener_atributos("nodo", id_nodo)
-        self._pila_atributos_nodo.put(nodo_editado)
+        :param ids_nodos: Los ids de los nodos de los cuales se obtienen los atributos.
+        :type ids_nodos: list[str]
+        """
+        nodos_editados: list[tuple[str, dict[str, str]]] = [
+            self._gestor.obtener_atributos("nodo", id_nodo)
+            for id_nodo in ids_nodos
+        ]
+        self._pila_atributos_nodo.put(nodos_editados)
         
     def _aplicar_cambios_nodo(self, instancia: nodo.EditorNodo) -> None: 
         """
@@ -165,13 +169,16 @@ class EdicionNodo:
         :type instancia: nodo.EditorNodo
         """
         operacion: bool = False
-        id_nodo: str = self._id_nodo_editar.get()
-        id_ok: bool = self._comprobar_id_nodo(id_nodo)
+        ids_nodos: list[str] = self._gestor.separar_ids(
+            self._id_nodo_editar.get(), self._nodos_existentes
+        )
+        id_ok: bool = self._comprobar_id_nodo(ids_nodos)
         valores_ingresados_ok: bool = instancia.actualizar_dict_nodo()
         if id_ok and valores_ingresados_ok:
-            self._apilar_atributos_nodo(id_nodo)
-            operacion = self._gestor.actualizar_elemento(
-                "nodo", id_nodo , instancia.obtener_cambios()
+            self._apilar_atributos_nodo(ids_nodos)
+            cambios: dict[str, str] = instancia.obtener_cambios()
+            operacion = self._gestor.actualizar_elementos(
+                "nodo", [(id_nodo, cambios) for id_nodo in ids_nodos]
             )
         if operacion:
             self.reiniciar_opciones() 
@@ -215,15 +222,19 @@ class EdicionNodo:
             self._nodos_ubicados[id_nodo] = marco
             fila += 1
         
-    def _comprobar_id_nodo(self, id_nodo: str) -> bool:
+    def _comprobar_id_nodo(self, ids_nodos: list[str]) -> bool:
         """
-        Verifica que el id ingresado sea válido.
+        Verifica que los ids ingresados sean válidos.
 
+        :param ids_nodos: Los ids ingresados.
+        :type ids_nodos: list[str]
         :return: El resultado de la verificación.
         :rtype: bool
         """
         res: bool = False
-        if id_nodo in self._nodos_existentes.keys():
+        if ids_nodos and all(
+            id_nodo in self._nodos_existentes.keys() for id_nodo in ids_nodos
+        ):
             res = True
         else:
             self._ingr_id_nodo_editar.focus_set()
@@ -245,7 +256,8 @@ class EdicionNodo:
         self._etq_ne_id_n: tk.Label = tk.Label( 
             ancestro, text="( ? )", **comunes.atrb_etq_ayuda
         )
-        tex_ne: str = "Ingresar un ID de los disponibles en la lista de nodos"
+        tex_ne: str = "Ingresar uno o más IDs de los disponibles en la lista "
+        tex_ne = tex_ne + "de nodos (por ejemplo: 1, 3, 5-8)"
         self.ne_id_n: emergente.NotaEmergente = emergente.NotaEmergente( 
             self._etq_ne_id_n, tex_ne           
         ) 
@@ -261,7 +273,7 @@ class EdicionNodo:
         self._ingr_id_nodo_editar: tk.Entry = tk.Entry( 
             ancestro,
             textvariable=self._id_nodo_editar,
-            width=3,
+            width=8,
             **comunes.atrb_entrada
         )
         self._ingr_id_nodo_editar.grid(row=0, column=2, padx=(0,10))
@@ -351,30 +363,32 @@ class EdicionNodo:
         self._cv_nodos.grid(row=0, column=0, sticky="ew", padx=(5,5))
         self._cv_nodos.configure(yscrollcommand=self._barra_n.set)
 
-    def _desapilar_atributos_nodo(self) -> tuple[str, dict[str, str]] | tuple[()]:
+    def _desapilar_atributos_nodo(self) -> list[tuple[str, dict[str, str]]]:
         """
-        Desapila la última tupla ingresada con los atributos del nodo antes
-        de realizar los cambios.
+        Desapila los últimos atributos ingresados de los nodos antes de
+        realizar los cambios.
 
-        :return: La tupla con los atributos anteriores.
-        :rtype: tuple[str, dict[str, str]] | tuple[()]
+        :return: Los ids y atributos anteriores, o una lista vacía.
+        :rtype: list[tuple[str, dict[str, str]]]
         """
         try:
-            res: tuple[str, dict[str, str]] = self._pila_atributos_nodo.get_nowait()
+            res: list[tuple[str, dict[str, str]]] = self._pila_atributos_nodo.get_nowait()
             return res
         except queue.Empty:
-            return ()
+            return []
         
     def _deshacer_ed_nodo(self) -> None:
         """
         Obtiene los atributos anteriores y los restablece.
         """
-        cambios: tuple[str, dict[str, str]] | tuple[()] = self._desapilar_atributos_nodo()
+        ids_existentes: list[str] = self._gestor.lista_ids("nodo")
+        cambios: list[tuple[str, dict[str, str]]] = [
+            c for c in self._desapilar_atributos_nodo() if c[0] in ids_existentes
+        ]
         if cambios:
-            if cambios[0] in self._gestor.lista_ids("nodo"):
-                self._gestor.actualizar_elemento("nodo", cambios[0], cambios[1])
-                self.reiniciar_opciones() 
-                self.vaciar_atributos()
+            self._gestor.actualizar_elementos("nodo", cambios)
+            self.reiniciar_opciones() 
+            self.vaciar_atributos()
 
     def _eliminar_nodos_existentes(self) -> None:
         """
@@ -114,21 +114,22 @@ class EdicionRelacion:
         else:
             self._barra_r.grid_forget()
             
-    def _comprobar_id(self, id_rel:str) -> bool:
+    def _comprobar_id(self, ids_rel: list[str]) -> bool:
         """
-        Verifica que el id ingresado sea válido.
+        Verifica que los ids ingresados sean válidos.
 
+        :param ids_rel: Los ids ingresados.
+        :type ids_rel: list[str]
         :return: El resultado de la verificación.
         :rtype: bool
         """
         res: bool = False
         self._obtener_relaciones()
-        if self._relaciones_existentes:
-            try:
-                if int(id_rel) in self._relaciones_existentes.keys():
-                    res = True
-            except:
-                pass
+        if self._relaciones_existentes and ids_rel:
+            res = all(
+                int(id_rel) in self._relaciones_existentes.keys()
+                for id_rel in ids_rel
+            )
         return res
 
     def _construir_encabezado(self, ancestro: tk.Frame) -> None:
@@ -155,7 +156,7 @@ class EdicionRelacion:
         self._ingr_id_borrar: tk.Entry = tk.Entry( 
             self._contenedor_encabezado,
             textvariable=self._id_borrar,
-            width=3,
+            width=8,
             **comunes.atrb_entrada
         )
         self._ingr_id_borrar.grid(
@@ -262,12 +263,15 @@ class EdicionRelacion:
 
     def _eliminar_relacion(self) -> None:
         """
-        Elimina la relación cuyo id fue ingresado.
+        Elimina las relaciones cuyos ids fueron ingresados (uno o más,
+        separados por comas, o rangos como "3-7").
         """
-        id_borrar: str = self._id_borrar.get()
-        id_ok: bool = self._comprobar_id(id_borrar)
+        ids_borrar: list[str] = self._gestor.separar_ids(
+            self._id_borrar.get(), self._relaciones_existentes
+        )
+        id_ok: bool = self._comprobar_id(ids_borrar)
         if id_ok:
-            self._gestor.eliminar_relacion(id_borrar)
+            self._gestor.eliminar_relaciones(ids_borrar)
             self._ingr_id_borrar.delete(0, tk.END)
         else:
             self._ingr_id_borrar.focus_set()
@@ -166,17 +166,19 @@ class EdicionVertice:
         """
         self._vertice_individual.reiniciar_cambios()
 
-    def _apilar_atributos_vertice(self, id_vertice: str) -> None:
+    def _apilar_atributos_vertice(self, ids_vertices: list[str]) -> None:
         """
-        Obtiene los atributos del vértice a partir del id y los almacena.
+        Obtiene los atributos de los vértices a partir de sus ids y los
+        almacena juntos, para deshacer la edición en un solo paso.
 
-        :param id_vertice: El id del vértice del cual se obtienen los atributos.
-        :type id_vertice: str
-        """
-        vertice_editado: tuple[str, dict[str, str]] = self._gestor.obtener_atributos(
-            "vertice", id_vertice
-        )
-        self._pila_atributos_vertice.put(vertice_editado)
+        :param ids_vertices: Los ids de los vértices de los cuales se obtienen los atributos.
+        :type ids_vertices: list[str]
+        """
+        vertices_editados: list[tuple[str, dict[str, str]]] = [
+            self._gestor.obtener_atributos("vertice", id_vertice)
+            for id_vertice in ids_vertices
+        ]
+        self._pila_atributos_vertice.put(vertices_editados)
 
     def _aplicar_cambios_vertice(self, instancia: vertice.EditorVertice) -> None:
         """
@@ -186,13 +188,16 @@ class EdicionVertice:
         :type instancia: vertice.EditorVertice
         """
         operacion: bool = False
-        id_vertice: str = self._id_vertice_editar.get()
-        id_ok: bool = self._comprobar_id_vertice(id_vertice)
+        ids_vertices: list[str] = self._gestor.separar_ids(
+            self._id_vertice_editar.get(), self._vertices_existentes
+        )
+        id_ok: bool = self._comprobar_id_vertice(ids_vertices)
         valores_ingresados_ok: bool = instancia.actualizar_dict_vertice()
         if id_ok and valores_ingresados_ok:
-            self._apilar_atributos_vertice(id_vertice)
-            operacion = self._gestor.actualizar_elemento(
-                "vertice", id_vertice, instancia.obtener_cambios()
+            self._apilar_atributos_vertice(ids_vertices)
+            cambios: dict[str, str] = instancia.obtener_cambios()
+            operacion = self._gestor.actualizar_elementos(
+                "vertice", [(id_vertice, cambios) for id_vertice in ids_vertices]
             )
         if operacion:
             self.reiniciar_opciones() 
@@ -252,15 +257,20 @@ class EdicionVertice:
             self._vertices_ubicados[id_vertice] = marco
             fila += 1
 
-    def _comprobar_id_vertice(self, id_vertice:str) -> bool:
+    def _comprobar_id_vertice(self, ids_vertices: list[str]) -> bool:
         """
-        Verifica que el id ingresado sea válido.
+        Verifica que los ids ingresados sean válidos.
 
+        :param ids_vertices: Los ids ingresados.
+        :type ids_vertices: list[str]
         :return: El resultado de la verificación.
         :rtype: bool
         """
         res: bool = False
-        if id_vertice in self._vertices_existentes.keys():
+        if ids_vertices and all(
+            id_vertice in self._vertices_existentes.keys()
+            for id_vertice in ids_vertices
+        ):
             res = True
         else:
             self._ingr_id_vertice_editar.focus_set()
@@ -282,7 +292,8 @@ class EdicionVertice:
         self._etq_ne_id_v: tk.Label = tk.Label( 
             ancestro, text ="( ? )", **comunes.atrb_etq_ayuda
         )
-        tex_ne: str = "Ingresar un ID de los disponibles en la lista de relaciones"
+        tex_ne: str = "Ingresar uno o más IDs de los disponibles en la lista "
+        tex_ne = tex_ne + "de relaciones (por ejemplo: 1, 3, 5-8)"
         self.ne_id_v: emergente.NotaEmergente = emergente.NotaEmergente( 
             self._etq_ne_id_v, tex_ne
         )  
@@ -298,7 +309,7 @@ class EdicionVertice:
         self._ingr_id_vertice_editar: tk.Entry = tk.Entry( 
             ancestro,
             textvariable=self._id_vertice_editar,
-            width=3,
+            width=8,
             **comunes.atrb_entrada
         )
         self._ingr_id_vertice_editar.grid(row=0, column=2, padx=(0,10))     
@@ -390,30 +401,33 @@ class EdicionVertice:
         self._cv_vertices.grid(row=0, column=0, sticky="ew", padx=(5,5))
         self._cv_vertices.configure(yscrollcommand=self._barra_v.set)
 
-    def _desapilar_atributos_vertice(self) -> tuple[str, dict[str, str]] | tuple[()]:
+    def _desapilar_atributos_vertice(self) -> list[tuple[str, dict[str, str]]]:
         """
-        Desapila la última tupla ingresada con los atributos del vértice antes
-        de realizar los cambios.
+        Desapila los últimos atributos ingresados de los vértices antes de
+        realizar los cambios.
 
-        :return: La tupla con los atributos anteriores.
-        :rtype: tuple[str, dict[str, str]] | tuple[()]
+        :return: Los ids y atributos anteriores, o una lista vacía.
+        :rtype: list[tuple[str, dict[str, str]]]
         """
         try:
-            res: tuple[str, dict[str, str]] = self._pila_atributos_vertice.get_nowait()
+            res: list[tuple[str, dict[str, str]]] = self._pila_atributos_vertice.get_nowait()
             return res
         except queue.Empty:
-            return ()        
+            return []        
  
     def _deshacer_ed_vertice(self) -> None:
         """
         Obtiene los atributos anteriores y los restablece.
         """
-        cambios: tuple[str, dict[str, str]] | tuple[()] = self._desapilar_atributos_vertice()
+        ids_existentes: list[str] = self._gestor.lista_ids("vértice")
+        cambios: list[tuple[str, dict[str, str]]] = [
+            c for c in self._desapilar_atributos_vertice()
+            if c[0] in ids_existentes
+        ]
         if cambios:
-            if cambios[0] in self._gestor.lista_ids("vértice"):
-                self._gestor.actualizar_elemento("vertice", cambios[0], cambios[1])
-                self.reiniciar_opciones() 
-                self.vaciar_atributos()
+            self._gestor.actualizar_elementos("vertice", cambios)
+            self.reiniciar_opciones() 
+            self.vaciar_atributos()
             
     def _eliminar_vertices_existentes(self) -> None:
         """
@@ -36,6 +36,23 @@ necesarios: list = [
     "estado_n_v.txt"
 ]
 
+# Motor de almacenamiento de las tablas: "csv" o "sqlite"
+motor_tablas: str = "csv"
+
+# Con el motor SQLite, reemplaza a las tablas .csv en los proyectos guardados
+base_de_datos: str = "tablas.db"
+
+# Registro de las modificaciones de las tablas .csv, no forma parte del proyecto
+bitacora: str = "bitacora.jsonl"
+
+# Si es verdadero, el diagrama que se muestra se recibe en memoria desde
+# Graphviz; sólo se escribe en resultados/ al exportarlo
+diagrama_en_memoria: bool = True
+
+# Si es verdadero, el diagrama se dibuja directamente en el lienzo a partir
+# de la disposición calculada por Graphviz, en lugar de mostrar una imagen
+diagrama_en_lienzo: bool = False
+
 formas_nodo: list = [
     "box", "circle", "component", "cylinder", "diamond", "doublecircle",
     "egg", "ellipse", "folder", "house", "invhouse", "invtrapezium",
@@ -0,0 +1,278 @@
+"""
+Comprueba que Diagramador._construir_grafo escriba el mismo código DOT que
+armaba graphviz.Digraph, y mide cuánto tarda en escribirlo a medida que
+crece la cantidad de vértices. Como el código DOT es la clave de la cache
+de diagramas y de disposiciones, cualquier diferencia las invalida.
+
+Se ejecuta desde la raíz del proyecto, con el paquete graphviz instalado
+(no forma parte de dependencias.txt porque la aplicación no lo usa):
+
+    python herramientas/medir_grafo.py [cantidad de tablas a comparar]
+"""
+
+import csv
+import random
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+try:
+    import graphviz  # type: ignore
+except ImportError:
+    sys.exit(
+        "Este script compara el código DOT con el de graphviz.Digraph y "
+        "necesita el paquete graphviz: pip install graphviz"
+    )
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aplicacion.documentos import almacenes, diagrama, tablas  # noqa: E402
+from aplicacion.interfaz import comunes  # noqa: E402
+
+# Textos que obligan a citar o escapar los identificadores
+RAROS: list[str] = [
+    "a b", '"q"', 'x\\"y', "barra\\\\", "<b>h</b>", "<>", "node", "Graph",
+    "-4.2", ".5", "1.", "ñandú", "tab\taquí", "a:b", "a:b:c", "€", "fin\\"
+]
+ESTILOS_N: dict[str, list[str]] = {
+    "color": ["", "#00ff00", "red"],
+    "fillcolor": ["", "#ffffff"],
+    "fontsize": ["", "12"],
+    "fontname": ["", "Times"],
+    "nojustify": ["", "true"],
+    "shape": ["", "box", "ellipse"],
+    "style": ["", "filled", "rounded,filled"]
+}
+ESTILOS_V: dict[str, list[str]] = {
+    "arrowhead": ["", "dot", "none"],
+    "color": ["", "#ff0000"],
+    "dir": ["", "both"],
+    "fontsize": ["", "9"],
+    "nojustify": ["", "true"]
+}
+
+
+def crear_tablas(
+    directorio: Path, vertices: int, azar: random.Random, raros: bool
+) -> tablas.Tablas:
+    """
+    Crea tablas con proposiciones al azar, sobre archivos .csv en el
+    directorio indicado.
+
+    :param directorio: El directorio de los archivos .csv.
+    :type directorio: Path
+    :param vertices: La cantidad de proposiciones.
+    :type vertices: int
+    :param azar: El generador de números al azar.
+    :type azar: random.Random
+    :param raros: Si es verdadero, usa textos que hay que citar y estilos por elemento.
+    :type raros: bool
+    :return: Las tablas cargadas.
+    :rtype: tablas.Tablas
+    """
+    encabezados: dict[str, list[str]] = {
+        "proposiciones": ["ent1", "rel", "ent2", "peso"],
+        "nodos": ["id", "nodo"],
+        "vertices": ["id", "vertice"],
+        "propiedades_n": list(comunes.atrb_nodos.keys()),
+        "propiedades_v": list(comunes.atrb_vertices.keys())
+    }
+    rutas: dict[str, Path] = {}
+    for tabla, encabezado in encabezados.items():
+        rutas[tabla] = directorio / f"{tabla}.csv"
+        with open(rutas[tabla], "w", newline="", encoding="utf-8") as archivo:
+            csv.writer(archivo, delimiter="§").writerow(encabezado)
+    res: tablas.Tablas = tablas.Tablas(
+        almacenes.AlmacenCSV(rutas, directorio / "tablas.db"), lambda t: t
+    )
+
+    def texto(prefijo: str, i: int) -> str:
+        if raros and azar.random() < 0.3:
+            return azar.choice(RAROS)
+        return f"{prefijo} {i}"
+
+    nodos: int = max(2, vertices // 2)
+    relaciones: int = max(1, min(200, vertices // 4))
+    with res.lote():
+        for i in range(nodos):
+            res.agregar("nodos", [str(i), texto("concepto", i)])
+            fila: dict[str, str] = dict.fromkeys(comunes.atrb_nodos, "")
+            fila.update(id=str(i), label=texto("concepto", i))
+            if raros:
+                for clave, valores in ESTILOS_N.items():
+                    fila[clave] = azar.choice(valores)
+            res.agregar("propiedades_n", fila.values())
+        for i in range(relaciones):
+            id_rel: str = str(nodos + i)
+            res.agregar("vertices", [id_rel, texto("relación", i)])
+            fila = dict.fromkeys(comunes.atrb_vertices, "")
+            fila.update(id=id_rel, label=texto("relación", i))
+            if raros:
+                for clave, valores in ESTILOS_V.items():
+                    fila[clave] = azar.choice(valores)
+            res.agregar("propiedades_v", fila.values())
+        for _ in range(vertices):
+            extremos: list[str] = [str(azar.randrange(nodos)) for _ in range(2)]
+            if raros and azar.random() < 0.1:
+                extremos[0] += ":p" + azar.choice(["", ":n", ":sw"])
+            res.agregar("proposiciones", [
+                extremos[0],
+                str(nodos + azar.randrange(relaciones)),
+                extremos[1],
+                azar.choice(["1", "2.5", "10"])
+            ])
+    return res
+
+
+def con_digraph(
+    diagramador: diagrama.Diagramador,
+    omitir: tuple[str, ...] = (),
+    disposicion: dict | None = None
+) -> str:
+    """
+    Arma el código DOT con graphviz.Digraph, como lo hacía el
+    Diagramador antes de escribirlo directamente.
+
+    :param diagramador: El diagramador con las tablas a usar.
+    :type diagramador: diagrama.Diagramador
+    :param omitir: Los atributos que no se incluyen en el grafo.
+    :type omitir: tuple[str, ...]
+    :param disposicion: Las posiciones a fijar.
+    :type disposicion: dict | None
+    :return: El código DOT del grafo.
+    :rtype: str
+    """
+    posiciones_n: dict[str, dict] = {}
+    posiciones_v: list[dict[str, str]] = []
+    atributos_grafo: dict[str, str] = diagramador._omitir(comunes.atrb_grafo, omitir)
+    if disposicion is not None:
+        posiciones_n = disposicion["nodos"]
+        posiciones_v = [v["posiciones"] for v in disposicion["vertices"]]
+        atributos_grafo["bb"] = disposicion["bb"]
+    grafo = graphviz.Digraph(
+        diagramador._nombre_png,
+        graph_attr=atributos_grafo,
+        node_attr=diagramador._omitir(
+            diagramador._por_defecto(comunes.atrb_nodos), omitir
+        ),
+        edge_attr=diagramador._omitir(
+            diagramador._por_defecto(comunes.atrb_vertices), omitir
+        )
+    )
+    propiedades_n: dict[str, dict[str, str]] = {
+        id_elem: diagramador._omitir(atributos, omitir) for id_elem, atributos
+        in diagramador._propiedades("propiedades_n").items()
+    }
+    propiedades_v: dict[str, dict[str, str]] = {
+        id_elem: diagramador._omitir(atributos, omitir) for id_elem, atributos
+        in diagramador._propiedades("propiedades_v").items()
+    }
+    for registro in diagramador._tablas.registros("nodos"):
+        grafo.node(
+            registro["id"],
+            **propiedades_n[registro["id"]],
+            **posiciones_n.get(registro["id"], {}).get("posiciones", {})
+        )
+    for i, registro in enumerate(diagramador._tablas.registros("proposiciones")):
+        atributos: dict[str, str] = dict(propiedades_v[registro["rel"]])
+        if i < len(posiciones_v):
+            atributos.update(posiciones_v[i])
+        etiqueta: str = atributos.pop("label")
+        grafo.edge(
+            registro["ent1"],
+            registro["ent2"],
+            f" {etiqueta}",
+            weight=registro["peso"],
+            **atributos
+        )
+    return grafo.source
+
+
+def comparar(cantidad: int) -> int:
+    """
+    Compara ambos códigos DOT en tablas al azar, con y sin atributos de
+    estilo y con posiciones fijas.
+
+    :param cantidad: La cantidad de tablas a comparar.
+    :type cantidad: int
+    :return: La cantidad de comparaciones con diferencias.
+    :rtype: int
+    """
+    azar: random.Random = random.Random(7)
+    distintos: int = 0
+    for _ in range(cantidad):
+        with tempfile.TemporaryDirectory() as directorio:
+            tablas_azar: tablas.Tablas = crear_tablas(
+                Path(directorio), azar.randint(1, 40), azar, True
+            )
+            diagramador = diagrama.Diagramador(tablas_azar)
+            disposicion: dict = {
+                "bb": "0,0,10,10",
+                "nodos": {
+                    registro["id"]: {"posiciones": {"pos": "1,2"}}
+                    for registro in tablas_azar.registros("nodos")
+                },
+                "vertices": [
+                    {"posiciones": {"pos": "e,1,1 0,0 1,1", "lp": "3,3"}}
+                    for _ in tablas_azar.registros("proposiciones")
+                ]
+            }
+            for argumentos in (
+                ((), None),
+                (diagrama.Diagramador._estilo, None),
+                (diagrama.Diagramador._estilo_fijo, None),
+                ((), disposicion)
+            ):
+                if diagramador._construir_grafo(*argumentos) != con_digraph(
+                    diagramador, *argumentos
+                ):
+                    distintos += 1
+            tablas_azar.cerrar()
+    return distintos
+
+
+def medir(tamaños: tuple[int, ...]) -> None:
+    """
+    Muestra el tiempo de escritura del código DOT, el menor de tres, para
+    cada cantidad de vértices.
+
+    :param tamaños: Las cantidades de vértices a medir.
+    :type tamaños: tuple[int, ...]
+    """
+    azar: random.Random = random.Random(1)
+    print(f"{'vértices':>9} {'Digraph (s)':>12} {'directo (s)':>12} {'µs/vértice':>11}")
+    for tamaño in tamaños:
+        with tempfile.TemporaryDirectory() as directorio:
+            tablas_azar: tablas.Tablas = crear_tablas(
+                Path(directorio), tamaño, azar, False
+            )
+            diagramador = diagrama.Diagramador(tablas_azar)
+            tiempos: dict[str, float] = {}
+            for nombre, funcion in (
+                ("digraph", lambda: con_digraph(diagramador)),
+                ("directo", diagramador._construir_grafo)
+            ):
+                diagrama.Diagramador._citar.cache_clear()
+                vueltas: list[float] = []
+                for _ in range(3):
+                    inicio: float = time.perf_counter()
+                    funcion()
+                    vueltas.append(time.perf_counter() - inicio)
+                tiempos[nombre] = min(vueltas)
+            tablas_azar.cerrar()
+        print(
+            f"{tamaño:>9} {tiempos['digraph']:>12.3f} {tiempos['directo']:>12.3f}"
+            f" {tiempos['directo'] / tamaño * 1e6:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    # Algunos textos raros son, a propósito, identificadores inválidos
+    warnings.simplefilter("ignore", graphviz.DotSyntaxWarning)
+    cantidad: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    distintos: int = comparar(cantidad)
+    print(f"Códigos DOT distintos de graphviz.Digraph: {distintos} de {cantidad * 4}")
+    medir((1000, 5000, 10000, 25000, 50000))
+    sys.exit(1 if distintos else 0)
@@ -1,3 +1,4 @@
+from aplicacion.documentos import contenido
 from aplicacion.interfaz import ventana
 
 """
@@ -6,4 +7,8 @@ Módulo de arranque del programa. Construye la ventana principal.
 
 if __name__ == "__main__":
     bucle: ventana.Bucle = ventana.Bucle()
-    bucle.empezar()
+    try:
+        bucle.empezar()
+    finally:
+        # Termino los procesos de extracción que quedaron en espera
+        contenido.Extractor.cerrar_procesos()